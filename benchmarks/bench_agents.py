@@ -0,0 +1,75 @@
+# End-to-end agent time with simulated data-source latencies: sequential calls
+# (what the page did) versus the concurrent Orchestrator.
+#
+#   python -m benchmarks.bench_agents [--rooms 1000] [--timeout 1.0]
+
+import argparse
+import asyncio
+import time
+
+from gcres.agents import Agent, Orchestrator
+
+# Seconds each agent spends waiting on its (simulated) data source
+latencies = {
+    "environment": 0.20,
+    "analytics": 0.35,
+    "alerts": 0.10,
+    "learning": 0.25,
+    "assets": 0.15,
+    "calendar": 0.40,
+}
+
+
+class SimulatedAgent(Agent):
+    inputs = ("source_data",)  # Bumped in the knowledge base to force a recompute
+
+    def __init__(self, key, latency, timeout):
+        self.name = key.title() + " Agent"
+        self.key = key
+        self.latency = latency
+        self.timeout = timeout
+
+    def compute(self, ctx):
+        time.sleep(self.latency)  # Blocking I/O stand-in, runs in a worker thread
+        return {room: self.key for room in ctx["rooms"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=1.0, help="per-agent timeout in seconds")
+    args = parser.parse_args(argv)
+
+    ctx = {"rooms": [f"Room {i}" for i in range(args.rooms)]}
+    agents = [SimulatedAgent(key, latency, args.timeout) for key, latency in latencies.items()]
+
+    start = time.perf_counter()
+    for agent in agents:
+        asyncio.run(agent.run(ctx))
+    sequential = time.perf_counter() - start
+
+    orchestrator = Orchestrator(agents)
+    orchestrator.kb.update("source_data", 1)
+    concurrent = orchestrator.run(ctx).elapsed
+
+    # Inputs unchanged: every agent is served from the knowledge base
+    cached = orchestrator.run(ctx).elapsed
+
+    print(f"sum of latencies:   {sum(latencies.values()) * 1000:7.0f} ms")
+    print(f"slowest agent:      {max(latencies.values()) * 1000:7.0f} ms")
+    print(f"sequential:         {sequential * 1000:7.0f} ms")
+    print(f"orchestrator:       {concurrent * 1000:7.0f} ms")
+    print(f"unchanged inputs:   {cached * 1000:7.1f} ms")
+
+    # One agent hangs: the rest still finish and the late one is reported
+    agents[-1].latency = args.timeout * 3
+    orchestrator.kb.update("source_data", 2)
+    start = time.perf_counter()
+    results = orchestrator.run(ctx)
+    wall = time.perf_counter() - start
+    late = [f"{r.name} ({r.status}{', stale value' if r.stale else ''})" for r in results.values() if not r.ok]
+    print(f"with a hung agent:  {wall * 1000:7.0f} ms, not ok: {', '.join(late)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Alert engine throughput on one core: readings checked per second for
+# different ingestion batch sizes, and how many raise / resolve events reach
+# the UI during an alert storm (many rooms flapping over capacity).
+#
+#   python -m benchmarks.bench_alerts [--rooms 10000] [--seconds 120]
+
+import argparse
+import time
+
+import numpy as np
+
+from gcres.alerts import AlertEngine
+from gcres.synthetic import sensor_stream
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=10_000)
+    parser.add_argument("--seconds", type=float, default=120.0, help="simulated seconds of readings")
+    args = parser.parse_args(argv)
+
+    rooms = [f"Room {i}" for i in range(args.rooms)]
+    rng = np.random.default_rng(0)
+    capacity = rng.choice([4, 6, 8, 10, 12], args.rooms)
+
+    print(f"{args.rooms} rooms")
+    print(f"{'batch':>8} {'readings':>10} {'readings/s':>12} {'us/reading':>11}")
+    for batch_seconds in (0.01, 0.1, 1.0):
+        batches = list(sensor_stream(rooms, rate=0.5, seconds=args.seconds, batch_seconds=batch_seconds))
+        total = sum(len(b) for b in batches)
+        engine = AlertEngine(rooms, capacity)
+        start = time.perf_counter()
+        for batch in batches:
+            engine.process(batch)
+        elapsed = time.perf_counter() - start
+        per_batch = total // len(batches)
+        print(f"{per_batch:>8} {total:>10} {total / elapsed:>12,.0f} {elapsed / total * 1e6:>11.2f}")
+
+    # Storm: occupancy hovering around capacity in 10% of rooms, i.e. flapping
+    # over and under it on every reading
+    engine = AlertEngine(rooms, capacity)
+    storm = rng.choice(args.rooms, args.rooms // 10, replace=False)
+    over_limit = 0
+    for t in range(int(args.seconds)):
+        values = capacity[storm] + rng.integers(-1, 2, len(storm))
+        over_limit += int(np.count_nonzero(values > capacity[storm]))
+        engine.process([(rooms[i], "occupancy", float(t), float(v)) for i, v in zip(storm, values)])
+    print(f"storm: {len(storm)} flapping rooms for {int(args.seconds)} s, {over_limit} over-capacity readings -> "
+          f"{engine.raised} raised, {engine.resolved} resolved, "
+          f"{engine.suppressed} suppressed by the {engine.cooldown:.0f} s cooldown")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Calendar Agent over iCalendar exports: the first sync of a directory of .ics
+# files, a re-sync with nothing changed and with one file edited, building a
+# day's free/busy bitmap and answering a slot query. The same window expanded
+# occurrence by occurrence with dateutil is the baseline.
+#
+#   python -m benchmarks.bench_calendar [--rooms 20000] [--events 50000] [--files 200]
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from dateutil.rrule import rrulestr
+
+from gcres.calendars import CalendarStore, parse_event, read_events
+from gcres.synthetic import write_calendars
+
+
+def dateutil_busy(directory, start, end):
+    # Naive baseline: every rule expanded with dateutil (wall times, time zones ignored)
+    busy = set()
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            text = f.read()
+        for _, block in read_events(text):
+            event = parse_event(block)
+            if "RRULE" not in event or "RECURRENCE-ID" in event:
+                continue
+            first = datetime(1970, 1, 1) + timedelta(seconds=event["DTSTART"][0])
+            length = timedelta(seconds=event["DTEND"][0] - event["DTSTART"][0])
+            rule = ";".join(f"{k}={v}" for k, v in event["RRULE"].items() if k != "UNTIL")
+            if any(s < end for s in rrulestr(rule, dtstart=first).between(start - length, end)):
+                busy.add(event.get("LOCATION", ""))
+    return busy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=20_000)
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--files", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="gcres-calendars-")
+    try:
+        rooms = [f"Room {i}" for i in range(args.rooms)]
+        paths = write_calendars(rooms, directory, events=args.events, files=args.files)
+        store = CalendarStore(rooms, directory)
+        stats = store.sync()
+        print(f"{args.events:,} events in {args.files} files for {args.rooms:,} rooms")
+        print(f"first sync: {stats['seconds']:.2f} s ({store.events:,} events)")
+
+        stats = store.sync()
+        print(f"re-sync, nothing changed: {stats['seconds'] * 1000:.1f} ms, {stats['files_read']} files read")
+        with open(paths[0], "a", encoding="utf-8") as f:
+            f.write("\r\n")  # A touched file with the same events
+        stats = store.sync()
+        print(f"re-sync, one file touched: {stats['seconds'] * 1000:.1f} ms, {stats['files_read']} file read, "
+              f"{stats['changed']} events changed")
+
+        day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        t = time.perf_counter()
+        store.bitmap(day)
+        print(f"day bitmap: {(time.perf_counter() - t) * 1000:.1f} ms")
+        start = day.replace(hour=10)
+        end = start + timedelta(hours=1)
+        t = time.perf_counter()
+        for _ in range(100):
+            busy = store.busy(start, end)
+        print(f"slot query from the bitmap: {(time.perf_counter() - t) * 10:.2f} ms, {int(busy.sum()):,} rooms busy")
+
+        t = time.perf_counter()
+        dateutil_busy(directory, start, end)
+        print(f"dateutil expansion of the same slot: {time.perf_counter() - t:.2f} s")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
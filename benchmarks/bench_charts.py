@@ -0,0 +1,85 @@
+# Memory over simulated reruns: the old plt.subplots-per-rerun charts versus
+# gcres.charts (reused figures + PNG cache). Each rerun draws the two bar
+# charts of the IoT pages; readings change on a fraction of reruns.
+#
+#   python -m benchmarks.bench_charts [--reruns 3000] [--old-reruns 600] [--rooms 3]
+#
+# The old path is capped separately: it gains ~1.5 MB and gets slower with
+# every rerun, so a few thousand reruns take gigabytes and many minutes.
+
+import argparse
+import gc
+import io
+import os
+import time
+
+import numpy as np
+
+from gcres import charts
+
+
+def rss_mb():
+    # Resident set size from /proc (Linux); falls back to peak RSS elsewhere
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def old_rerun(plt, rooms, temps, occupancy):
+    # What the pages did: new figures every rerun, never closed
+    for values, color in ((temps, 'skyblue'), (occupancy, 'salmon')):
+        fig, ax = plt.subplots(figsize=(4, 3))
+        ax.bar(rooms, values, color=color)
+        ax.set_ylabel("value")
+        ax.set_title("chart")
+        fig.savefig(io.BytesIO(), format="png")  # st.pyplot renders to PNG
+
+
+def new_rerun(plt, rooms, temps, occupancy):
+    charts.render_bar(rooms, temps, "Temperature (°C)", "HVAC Temperature", 'skyblue')
+    charts.render_bar(rooms, occupancy, "Number of People", "Current Occupancy", 'salmon')
+
+
+def run(name, rerun, plt, args, reruns):
+    rng = np.random.default_rng(0)
+    rooms = [f"Room {i}" for i in range(args.rooms)]
+    gc.collect()
+    base = rss_mb()
+    start = time.perf_counter()
+    samples = []
+    for i in range(reruns):
+        if i % args.change_every == 0:
+            temps = np.round(rng.uniform(20, 25.5, args.rooms), 1)
+            occupancy = rng.integers(1, 9, args.rooms)
+        rerun(plt, rooms, temps, occupancy)
+        if (i + 1) % max(reruns // 6, 1) == 0:
+            samples.append(f"{rss_mb() - base:+.0f}")
+    elapsed = time.perf_counter() - start
+    print(f"{name:<16} {reruns:>7} {elapsed / reruns * 1e3:>10.2f} {len(plt.get_fignums()):>12}  "
+          f"RSS delta (MB) over time: {' '.join(samples)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reruns", type=int, default=3000)
+    parser.add_argument("--old-reruns", type=int, default=600)
+    parser.add_argument("--rooms", type=int, default=3)
+    parser.add_argument("--change-every", type=int, default=5, help="new readings every N reruns")
+    args = parser.parse_args(argv)
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    plt.rcParams["figure.max_open_warning"] = 0
+
+    print(f"{'':<16} {'reruns':>7} {'ms/rerun':>10} {'open figures':>12}")
+    run("gcres.charts", new_rerun, plt, args, args.reruns)
+    run("plt per rerun", old_rerun, plt, args, args.old_reruns)
+    print(f"chart cache: {charts.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Memory and build time of the per-rerun sensor table: the old nested readings
+# dict joined with df["Room"].apply(lambda) versus the columnar RoomTable /
+# SensorSnapshot path, at 100k rooms.
+#
+#   python -m benchmarks.bench_columnar [--rooms 100000] [--repeat 5]
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.bench_search import make_catalog
+from gcres.columnar import RoomTable, SensorSnapshot
+from gcres.scoring import default_weights, static_criteria
+
+
+def old_frame(catalog, temps, occupancy):
+    # SensorStore.readings() followed by the pages' lambda join
+    names = catalog["Room"].tolist()
+    iot_data = {room: {"temp": round(float(t), 1), "occupancy": int(round(float(o)))}
+                for room, t, o in zip(names, temps, occupancy) if not (np.isnan(t) or np.isnan(o))}
+    df = catalog[["Room", *static_criteria(default_weights)]].copy()
+    df = df[df["Room"].isin(iot_data.keys())]
+    df["HVAC Temp"] = df["Room"].apply(lambda x: iot_data[x]["temp"])
+    df["Current Occupancy"] = df["Room"].apply(lambda x: iot_data[x]["occupancy"])
+    return df, iot_data
+
+
+def new_frame(table, temps, occupancy):
+    snapshot = SensorSnapshot(temps, occupancy)
+    return snapshot.frame(table, static_criteria(default_weights), names=("HVAC Temp", "Current Occupancy")), snapshot
+
+
+def measure(fn, repeat):
+    # Best wall time over `repeat` runs, and the peak traced allocation of one run
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(2)
+    catalog = make_catalog(args.rooms)
+    temps = np.round(rng.uniform(20, 26, args.rooms), 1).astype(np.float32)
+    occupancy = rng.integers(0, 12, args.rooms).astype(np.float32)
+    temps[rng.random(args.rooms) < 0.05] = np.nan  # A few rooms have not reported yet
+
+    start = time.perf_counter()
+    table = RoomTable(catalog)
+    build = time.perf_counter() - start
+
+    old_time, old_peak, (old_df, iot_data) = measure(lambda: old_frame(catalog, temps, occupancy), args.repeat)
+    new_time, new_peak, (new_df, snapshot) = measure(lambda: new_frame(table, temps, occupancy), args.repeat)
+
+    # Same rooms and the same readings either way
+    assert old_df["Room"].tolist() == new_df["Room"].tolist()
+    assert np.allclose(old_df["HVAC Temp"].to_numpy(), new_df["HVAC Temp"].to_numpy(), atol=1e-4)
+    assert (old_df["Current Occupancy"].to_numpy() == new_df["Current Occupancy"].to_numpy()).all()
+
+    old_bytes = old_df.memory_usage(deep=True).sum()
+    new_bytes = new_df.memory_usage(deep=True).sum()
+    print(f"{args.rooms} rooms, {len(new_df)} reporting, RoomTable build {build * 1e3:.1f} ms "
+          f"({table.nbytes / 1e6:.1f} MB for {len(table.columns)} columns)")
+    print(f"{'':34}{'time':>10}{'peak alloc':>13}{'frame':>10}{'readings':>11}")
+    print(f"{'old dict + apply(lambda) join':34}{old_time * 1e3:8.1f}ms{old_peak / 1e6:11.1f}MB"
+          f"{old_bytes / 1e6:8.1f}MB{'(dict)':>11}")
+    print(f"{'RoomTable + SensorSnapshot':34}{new_time * 1e3:8.1f}ms{new_peak / 1e6:11.1f}MB"
+          f"{new_bytes / 1e6:8.1f}MB{snapshot.nbytes / 1e6:9.2f}MB")
+
+
+if __name__ == "__main__":
+    main()
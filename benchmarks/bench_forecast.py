@@ -0,0 +1,71 @@
+# Demand forecast cost at facility scale: folding a day of occupancy and
+# bookings into the (rooms x 96 slots) model, applying an ingestion batch, and
+# forecasting / labelling every room for a meeting window.
+#
+#   python -m benchmarks.bench_forecast [--rooms 50000] [--days 7]
+
+import argparse
+import time
+
+import numpy as np
+
+from gcres.bookings import BookingStore, seed_demo_bookings
+from gcres.forecast import DemandModel, day_seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=50_000)
+    parser.add_argument("--days", type=int, default=7, help="days of history to fit")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    n = args.rooms
+    rooms = [f"Room {i}" for i in range(n)]
+    capacity = rng.choice([4, 6, 8, 10, 12, 16, 20, 40], n)
+    today = int(time.time() // day_seconds)
+
+    bookings = BookingStore(rooms)
+    seed_demo_bookings(bookings, days=1)
+    model = DemandModel(rooms, capacity, bookings, utc_offset=0)
+    print(f"{n} rooms x {model.slots} slots, model {model.nbytes / 1e6:.0f} MB")
+
+    # One occupancy reading per room and slot for each day, as the ingestor would deliver them
+    slots = np.arange(model.slots)
+    ids = np.repeat(np.arange(n), model.slots)
+    observe = fold = 0.0
+    for day in range(today - args.days, today + 1):
+        times = day * day_seconds + np.tile(slots, n) * model.slot_seconds + 1.0
+        busy = (np.tile(slots, n) >= 32) & (np.tile(slots, n) < 72)  # 8:00-18:00
+        values = np.where(busy, rng.poisson(capacity[ids] * 0.4), 0)
+        start = time.perf_counter()
+        model.observe(ids, times, values)  # Folds the previous day first
+        observe += time.perf_counter() - start
+    start = time.perf_counter()
+    model._fold()
+    fold = time.perf_counter() - start
+    print(f"fit {args.days} days ({n * model.slots * (args.days + 1):,} readings): {observe:.2f} s, "
+          f"{observe / (args.days + 1) * 1e3:.0f} ms per day")
+    print(f"fold one day into the levels: {fold * 1e3:.1f} ms")
+
+    batch = (rng.integers(0, n, 10_000), np.full(10_000, today * day_seconds + 43200.0), rng.integers(0, 10, 10_000))
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        model.observe(*batch)
+    print(f"observe a 10k-reading batch: {(time.perf_counter() - start) / args.repeat * 1e3:.2f} ms")
+
+    window = today * day_seconds + 14 * 3600.0
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        labels = model.labels(window, window + 3600)
+    print(f"forecast + label all rooms for a 1-hour window: {(time.perf_counter() - start) / args.repeat * 1e3:.2f} ms")
+    kinds, counts = np.unique(labels, return_counts=True)
+    print("  " + ", ".join(f"{k}: {c}" for k, c in zip(kinds, counts)))
+    start = time.perf_counter()
+    peak = model.peak()
+    print(f"facility peak window: {model.slot_time(peak)} ({(time.perf_counter() - start) * 1e3:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
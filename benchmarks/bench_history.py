@@ -0,0 +1,89 @@
+# Sensor history store: append throughput, compaction, and range scans of one
+# room over a month of readings from the memory-mapped segments versus reading
+# every file into memory and filtering.
+#
+#   python -m benchmarks.bench_history [--rooms 1000] [--days 30] [--interval 600] [--scans 50]
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from gcres.history import HistoryStore, day_seconds, record
+
+
+def synthetic_day(n_rooms, n_metrics, day, interval, rng):
+    # Records for one day in arrival order: every room reports each metric every `interval` seconds
+    steps = np.arange(day * day_seconds, (day + 1) * day_seconds, interval, dtype=np.float64)
+    rows = np.empty((len(steps), n_rooms, n_metrics), dtype=record)
+    rows["ts"] = steps[:, None, None] + rng.random((len(steps), n_rooms, 1))
+    rows["room"] = np.arange(n_rooms, dtype=np.uint32)[None, :, None]
+    rows["metric"] = np.arange(n_metrics, dtype=np.uint8)[None, None, :]
+    rows["value"] = rng.uniform(18, 27, rows.shape)
+    return rows.ravel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=1_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--interval", type=int, default=600, help="seconds between readings of one sensor")
+    parser.add_argument("--scans", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    rooms = [f"Room {i}" for i in range(args.rooms)]
+    today = int(time.time() // day_seconds)
+    first = today - args.days
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(directory, rooms)
+
+        # Append through the listener interface, one ingestion batch per call
+        now = time.time()
+        batches = [[(room, metric, now + i, 21.5) for room in rooms for metric in store.metrics] for i in range(20)]
+        batch = batches[0]
+        start = time.perf_counter()
+        for batch in batches:
+            store.append(batch)
+        elapsed = time.perf_counter() - start
+        print(f"append: {20 * len(batch) / elapsed:,.0f} readings/s ({len(batch)} per batch)")
+
+        # A month of logs, written directly
+        for day in range(first, today):
+            with open(store._path(day, "log"), "ab") as f:
+                f.write(synthetic_day(args.rooms, len(store.metrics), day, args.interval, rng).tobytes())
+        total = sum(os.path.getsize(p) for p in glob.glob(os.path.join(directory, "*.log"))) // record.itemsize
+        print(f"{args.days} days x {args.rooms} rooms: {total:,} readings, {store.disk_bytes / 1e6:.0f} MB")
+
+        def scan_times(label):
+            lo, hi = first * day_seconds, today * day_seconds
+            picks = rng.choice(args.rooms, args.scans)
+            start = time.perf_counter()
+            for i in picks:
+                ts, values = store.series(rooms[i], "temp", lo, hi)
+            per = (time.perf_counter() - start) / args.scans
+            print(f"  {label:<32} {per * 1e3:8.2f} ms per room-month scan ({len(ts)} readings)")
+
+        print("range scan, one room and metric over the whole month:")
+        # Baseline: read every file into memory and filter
+        start = time.perf_counter()
+        for i in rng.choice(args.rooms, min(args.scans, 5)):
+            rows = np.concatenate([np.fromfile(p, dtype=record) for p in sorted(glob.glob(os.path.join(directory, "*.log")))])
+            rows = rows[(rows["room"] == i) & (rows["metric"] == 0)]
+        per = (time.perf_counter() - start) / min(args.scans, 5)
+        print(f"  {'load all files + filter':<32} {per * 1e3:8.2f} ms")
+        scan_times("memory-mapped logs")
+
+        start = time.perf_counter()
+        days = store.compact()
+        print(f"compact: {days} days in {time.perf_counter() - start:.2f} s")
+        scan_times("compacted segments (indexed)")
+
+        print(f"on disk after compaction: {store.disk_bytes / 1e6:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Cost of keeping the top-k current as sensor readings arrive: a full re-rank
+# (snapshot frame + rank_rooms over every room) versus IncrementalScorer
+# (re-score only the changed rooms, read the top-k off the heap). Before
+# timing, the maintained top-k is checked against top_k over random batches.
+#
+#   python -m benchmarks.bench_incremental [--rooms 100000] [--changed 1 10 100 1000 10000] [--repeat 50]
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_search import make_catalog
+from gcres.columnar import RoomTable, SensorSnapshot
+from gcres.incremental import IncrementalScorer
+from gcres.scoring import DYNAMIC_CRITERIA, default_weights, rank_rooms, static_criteria, top_k
+
+
+def full_rank(table, temps, occupancy, availability, k):
+    snapshot = SensorSnapshot(temps, occupancy)
+    df = snapshot.frame(table, static_criteria(default_weights), names=DYNAMIC_CRITERIA)
+    df["HVAC Temp"] = df["HVAC Temp"].astype(np.float64).round(1)
+    df["Availability"] = availability[np.flatnonzero(snapshot.reported)]
+    return rank_rooms(df, default_weights, k=k)
+
+
+def check(table, rng, k=5, batches=2000):
+    # The maintained top-k against a full top_k pass after every random batch,
+    # including batches that improve heap members and promote outsiders at once
+    n = len(table)
+    scorer = IncrementalScorer(table, default_weights, k=k)
+    scorer.set_readings(np.arange(n), temp=rng.uniform(20, 26, n), occupancy=rng.integers(0, 12, n))
+    for _ in range(batches):
+        # Half the batches touch a room in the current top-k
+        ids = rng.choice(n, int(rng.integers(1, 6)), replace=False)
+        if rng.random() < 0.5:
+            ids[0] = scorer.top(k)[0][rng.integers(0, k)]
+            ids = np.unique(ids)
+        scorer.set_readings(ids, temp=rng.uniform(20, 26, len(ids)), occupancy=rng.integers(0, 12, len(ids)))
+        got, scores = scorer.top(k)
+        # Equal scores may come in either order
+        assert scores.tolist() == scorer.scores[top_k(scorer.scores, k)].tolist() == scorer.scores[got].tolist()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=100_000)
+    parser.add_argument("--changed", type=int, nargs="+", default=[1, 10, 100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--k", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(3)
+    n = args.rooms
+    table = RoomTable(make_catalog(n))
+    check(RoomTable(make_catalog(300)), rng)
+    temps = np.round(rng.uniform(20, 26, n), 1).astype(np.float32)
+    occupancy = rng.integers(0, 12, n).astype(np.float32)
+    availability = 1 + 4 * rng.random(n)
+
+    start = time.perf_counter()
+    scorer = IncrementalScorer(table, default_weights, availability)
+    scorer.load_snapshot(SensorSnapshot(temps, occupancy))
+    build = time.perf_counter() - start
+    print(f"{n} rooms, top-{args.k}; scorer built in {build * 1e3:.1f} ms")
+    # Incremental = applying the reading batch (parsing included) + building the top-k frame
+    print(f"{'changed':>8} {'full re-rank (ms)':>18} {'apply batch (ms)':>17} {'top-k frame (ms)':>17} {'speedup':>8}")
+
+    for m in args.changed:
+        batches = []
+        for _ in range(args.repeat):
+            ids = rng.choice(n, m, replace=False)
+            new_temp = np.round(rng.uniform(20, 26, m), 1)
+            new_occ = rng.integers(0, 12, m)
+            readings = [(table.names[i], "temp", 0.0, float(t)) for i, t in zip(ids, new_temp)]
+            readings += [(table.names[i], "occupancy", 0.0, float(o)) for i, o in zip(ids, new_occ)]
+            batches.append((ids, new_temp, new_occ, readings))
+
+        full = apply = read = 0.0
+        for ids, new_temp, new_occ, readings in batches:
+            temps[ids] = new_temp
+            occupancy[ids] = new_occ
+            t = time.perf_counter()
+            expected = full_rank(table, temps, occupancy, availability, args.k)
+            full += time.perf_counter() - t
+            t = time.perf_counter()
+            scorer.apply_readings(readings)
+            t2 = time.perf_counter()
+            got = scorer.frame(args.k)
+            apply += t2 - t
+            read += time.perf_counter() - t2
+        # Same top-k, same scores
+        assert (expected["Weighted Score"].to_numpy() == got["Weighted Score"].to_numpy()).all()
+        full, apply, read = full / args.repeat, apply / args.repeat, read / args.repeat
+        print(f"{m:>8} {full * 1e3:>18.3f} {apply * 1e3:>17.3f} {read * 1e3:>17.3f} {full / (apply + read):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Ingestion ceiling of the dashboard: the sensor simulator (gcres.simulator)
+# drives an Engine's feed at increasing rates, and the readings its ingestor
+# keeps up with are measured per step. Every listener the dashboard runs
+# (rollups, history, alerts) is attached, so this is the end-to-end ceiling.
+#
+#   python -m benchmarks.bench_ingest [--rooms 20000] [--seconds 5] [--workers 4] [--feed tcp|file]
+
+import argparse
+import os
+import socket
+import tempfile
+import time
+
+from gcres.catalog import write_catalog
+from gcres.engine import Engine
+from gcres.simulator import simulate
+from gcres.synthetic import generate_facility
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=20_000)
+    parser.add_argument("--seconds", type=float, default=5.0, help="emission time per step")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--feed", choices=("tcp", "file"), default="tcp")
+    parser.add_argument("--rates", default="10000,25000,50000,100000,200000,400000",
+                        help="target events/s per step (one event = temp + occupancy)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="gcres-ingest-") as tmp:
+        run(args, tmp)
+
+
+def run(args, tmp):
+    rooms, buildings = generate_facility(buildings=5, floors=10, rooms=args.rooms)
+    catalog = os.path.join(tmp, "rooms.sqlite")
+    write_catalog(rooms, catalog, buildings)
+    feed = f"tcp://127.0.0.1:{free_port()}" if args.feed == "tcp" else os.path.join(tmp, "feed.jsonl")
+    engine = Engine(catalog, sensor_feed=feed, history_dir=os.path.join(tmp, "history"))
+    ingestor = engine.ingestor
+    names = engine.catalog.names
+
+    print(f"{args.rooms} rooms, {args.workers} simulator processes, feed {feed}")
+
+    def dropped():
+        # Events a full SocketSource queue dropped (the file feed never drops)
+        return getattr(ingestor.source, "dropped", 0) / 2
+
+    print(f"{'target/s':>10} {'emitted/s':>11} {'ingested/s':>11} {'dropped':>9} {'backlog':>9} {'drained (s)':>12}")
+    ceiling = 0
+    for target in (int(r) for r in args.rates.split(",")):
+        before, dropped_before = ingestor.ingested, dropped()
+        stats = simulate(names, rate=target / len(names), seconds=args.seconds, workers=args.workers, out=feed,
+                         report=None)
+        ingested = (ingestor.ingested - before) / 2
+        backlog = stats["emitted"] - ingested
+        # Let the ingestor catch up before the next step
+        start = time.perf_counter()
+        while ((ingestor.ingested - before) / 2 + dropped() - dropped_before < stats["emitted"]
+               and time.perf_counter() - start < 60):
+            time.sleep(0.1)
+        drained = time.perf_counter() - start
+        lost = dropped() - dropped_before
+        rate = ingested / stats["seconds"]
+        print(f"{target:>10,} {stats['events_per_s']:>11,.0f} {rate:>11,.0f} {lost:>9,.0f} {backlog:>9,.0f} "
+              f"{drained:>12.1f}")
+        if backlog <= 0.05 * stats["emitted"] and not lost:
+            ceiling = max(ceiling, rate)
+    print(f"ingestion ceiling: ~{ceiling:,.0f} events/s ({2 * ceiling:,.0f} readings/s) kept up with")
+    engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Learning Agent preference model at scale: booking / feedback events per
+# second, a user's top rooms, memory against a dense users x rooms matrix,
+# and saving / loading the state. Each user books mostly among a few favourite
+# rooms, with occasional one-offs anywhere.
+#
+#   python -m benchmarks.bench_preferences [--users 100000] [--rooms 50000] [--events 2000000]
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from gcres.preferences import PreferenceModel
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--rooms", type=int, default=50_000)
+    parser.add_argument("--events", type=int, default=2_000_000)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    rooms = [f"Room {i}" for i in range(args.rooms)]
+    users = [f"user{i}" for i in range(args.users)]
+    favourites = rng.integers(0, args.rooms, (args.users, 8))
+    who = rng.integers(0, args.users, args.events)
+    pick = np.where(rng.random(args.events) < 0.9, favourites[who, rng.integers(0, 8, args.events)],
+                    rng.integers(0, args.rooms, args.events))
+    weight = rng.choice([1.0, 2.0, -2.0], args.events, p=[0.9, 0.07, 0.03])
+    # Events spread over 90 days, so decay and rebasing are exercised
+    start = time.time() - 90 * 86400
+    ts = start + np.sort(rng.uniform(0, 90 * 86400, args.events))
+
+    path = os.path.join(tempfile.mkdtemp(prefix="gcres-preferences-"), "preferences.npz")
+    model = PreferenceModel(rooms, path=path, save_interval=float("inf"))
+    t = time.perf_counter()
+    for u, r, w, s in zip(who.tolist(), pick.tolist(), weight.tolist(), ts.tolist()):
+        model.observe(users[u], rooms[r], w, s)
+    elapsed = time.perf_counter() - t
+    dense = args.users * args.rooms * 8
+    print(f"{args.users:,} users x {args.rooms:,} rooms, {args.events:,} events")
+    print(f"updates: {args.events / elapsed:,.0f} events/s ({elapsed / args.events * 1e6:.1f} us/event)")
+    print(f"memory: {model.nbytes / 2**20:.1f} MB (dense float64 matrix: {dense / 2**30:.1f} GB)")
+
+    sample = [users[u] for u in rng.integers(0, args.users, 10_000)]
+    t = time.perf_counter()
+    for user in sample:
+        model.top(user, 5)
+    top_us = (time.perf_counter() - t) / len(sample) * 1e6
+    t = time.perf_counter()
+    for user in sample[:1000]:
+        model.scores(user)
+    scores_us = (time.perf_counter() - t) / 1000 * 1e6
+    print(f"top 5 rooms: {top_us:.1f} us/user, learning scores for determine_optimal_room: {scores_us:.1f} us/user")
+
+    # How often a user's best learned room is one of their favourites
+    hits = sum(model.index[model.top(user, 1)[0][0]] in favourites[int(user[4:])]
+               for user in sample if model.top(user, 1))
+    print(f"top room is a favourite for {hits / len(sample):.1%} of sampled users")
+
+    t = time.perf_counter()
+    model.save()
+    save_s = time.perf_counter() - t
+    t = time.perf_counter()
+    loaded = PreferenceModel(rooms, path=path)
+    load_s = time.perf_counter() - t
+    assert all([r for r, _ in loaded.top(u, 5)] == [r for r, _ in model.top(u, 5)] for u in sample[:100])
+    print(f"save: {save_s:.2f} s, load: {load_s:.2f} s, file {os.path.getsize(path) / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
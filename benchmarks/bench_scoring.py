@@ -0,0 +1,81 @@
+# Per-rerun scoring latency: old df.apply(calculate_score) + sort_values versus
+# the vectorized gcres.scoring path, at 1k / 10k / 100k rooms.
+#
+#   python -m benchmarks.bench_scoring [--sizes 1000 10000 100000] [--repeat 5]
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from gcres.scoring import rank_rooms
+
+weights = {
+    "Occupancy Suitability": 0.20,
+    "Natural Lighting": 0.10,
+    "Energy Efficiency": 0.15,
+    "AV/Tech Availability": 0.10,
+    "Noise Isolation": 0.05,
+    "Proximity to Team Zone": 0.05,
+    "Availability": 0.25,
+    "HVAC Temp": 0.05,
+    "Current Occupancy": 0.05
+}
+
+
+def make_rooms(n, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {"Room": [f"Room {i}" for i in range(n)]}
+    for crit in weights:
+        data[crit] = rng.integers(1, 6, n)
+    data["HVAC Temp"] = np.round(rng.uniform(20, 25.5, n), 1)
+    data["Current Occupancy"] = rng.integers(1, 9, n)
+    return pd.DataFrame(data)
+
+
+# The row-wise implementation the pages used before
+def calculate_score(row):
+    base_score = sum(row[crit] * weights[crit] for crit in weights if crit not in ["HVAC Temp", "Current Occupancy"])
+    temp_penalty = abs(row["HVAC Temp"] - 22.0) * 0.1
+    occupancy_bonus = 5 - abs(row["Current Occupancy"] - 4)
+    return base_score - temp_penalty + (occupancy_bonus * weights["Current Occupancy"])
+
+
+def rowwise(df):
+    df = df.copy()
+    df["Weighted Score"] = df.apply(calculate_score, axis=1)
+    return df.sort_values("Weighted Score", ascending=False).head(50)
+
+
+def vectorized(df):
+    return rank_rooms(df, weights, k=50)
+
+
+def best_of(fn, df, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(df)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'rooms':>8} {'df.apply (ms)':>14} {'vectorized (ms)':>16} {'speedup':>8}")
+    for n in args.sizes:
+        df = make_rooms(n)
+        # Both paths must produce the same top scores (tied rooms may swap places)
+        assert (rowwise(df)["Weighted Score"].to_numpy() == vectorized(df)["Weighted Score"].to_numpy()).all()
+        slow = best_of(rowwise, df, 1 if n >= 100_000 else args.repeat)
+        fast = best_of(vectorized, df, args.repeat)
+        print(f"{n:>8} {slow * 1e3:>14.2f} {fast * 1e3:>16.2f} {slow / fast:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
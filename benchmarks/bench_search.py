@@ -0,0 +1,112 @@
+# Room search latency over a large catalog: the old BookingAgent.find_room
+# linear scan versus the indexed RoomIndex.query (top-5, all constraints).
+#
+#   python -m benchmarks.bench_search [--rooms 50000] [--queries 200]
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from gcres.scoring import default_weights, static_criteria
+from gcres.search import RoomIndex
+
+
+def make_catalog(n, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {"Room": [f"Room {i}" for i in range(n)]}
+    for crit in static_criteria(default_weights):
+        data[crit] = rng.integers(1, 6, n)
+    data["Capacity"] = rng.choice([4, 6, 8, 10, 12, 16, 20, 40], n)
+    data["Floor"] = rng.integers(0, 30, n)
+    data["Quiet"] = rng.random(n) < 0.4
+    data["Projector"] = rng.random(n) < 0.6
+    return pd.DataFrame(data)
+
+
+def linear_first_match(rooms, sensor_data, preferences):
+    # The old find_room: first room under max_temp, in catalog order
+    for room in rooms:
+        if sensor_data[room]["temp"] < preferences["max_temp"]:
+            return room
+    return None
+
+
+def linear_best_match(records, sensor_data, busy, preferences, weights):
+    # Same constraints as the index, evaluated room by room in Python;
+    # (room, score) of the best match, or (None, -inf)
+    best, best_score = None, float("-inf")
+    for row in records:
+        room = row["Room"]
+        reading = sensor_data[room]
+        if (reading["temp"] >= preferences["max_temp"] or (preferences["quiet"] and not row["Quiet"])
+                or (preferences["projector"] and not row["Projector"]) or row["Capacity"] < preferences["min_capacity"]
+                or row["Floor"] != preferences["floor"] or room in busy):
+            continue
+        score = sum(row[c] * weights[c] for c in static_criteria(weights))
+        score -= abs(reading["temp"] - 22.0) * 0.1
+        score += (5 - abs(reading["occupancy"] - 4)) * weights["Current Occupancy"]
+        if score > best_score:
+            best, best_score = room, score
+    return best, best_score
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(1)
+    catalog = make_catalog(args.rooms)
+    temps = np.round(rng.uniform(20, 26, args.rooms), 1).astype(np.float32)
+    occupancy = rng.integers(0, 12, args.rooms).astype(np.float32)
+    busy = rng.choice(args.rooms, args.rooms // 3, replace=False)
+    names = catalog["Room"].tolist()
+    sensor_data = {room: {"temp": float(t), "occupancy": int(o)} for room, t, o in zip(names, temps, occupancy)}
+    records = catalog.to_dict("records")
+    busy_names = {names[i] for i in busy}
+
+    queries = [{"max_temp": float(rng.uniform(21, 24)), "quiet": bool(rng.random() < 0.5),
+                "projector": bool(rng.random() < 0.5), "min_capacity": int(rng.choice([4, 8, 12])),
+                "floor": int(rng.integers(0, 30))} for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index = RoomIndex(catalog)
+    build = time.perf_counter() - start
+
+    def indexed(q):
+        return index.query(max_temp=q["max_temp"], quiet=q["quiet"], projector=q["projector"],
+                           min_capacity=q["min_capacity"], floor=q["floor"], temps=temps,
+                           occupancy=occupancy, busy=busy, k=5)
+
+    # Same best room from both, or an equally scored one on a tie
+    for q in queries[:20]:
+        expected, expected_score = linear_best_match(records, sensor_data, busy_names, q, default_weights)
+        got = indexed(q)
+        assert (expected is None) == (not got)
+        if got:
+            assert got[0][0] == expected or np.isclose(got[0][1], expected_score), (got[0], expected, expected_score)
+
+    first = timed(lambda q: linear_first_match(names, sensor_data, q), queries)
+    slow_queries = queries[:max(len(queries) // 10, 1)]
+    full = timed(lambda q: linear_best_match(records, sensor_data, busy_names, q, default_weights), slow_queries)
+    fast = timed(indexed, queries)
+    temp_only = timed(lambda q: index.query(max_temp=q["max_temp"], temps=temps, occupancy=occupancy, k=5), queries)
+    print(f"{args.rooms} rooms, index build {build * 1e3:.1f} ms")
+    print(f"old find_room (first match, not the best): {first * 1e3:9.3f} ms/query")
+    print(f"linear scan, all constraints, best match:  {full * 1e3:9.3f} ms/query")
+    print(f"RoomIndex.query, all constraints, top-5:   {fast * 1e3:9.3f} ms/query")
+    print(f"RoomIndex.query, max_temp only, top-5:     {temp_only * 1e3:9.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Throughput of the HTTP service (gcres.service): concurrent clients sending
+# /recommend, /score and /availability requests, one per round trip and in
+# batches. Starts a service on a free local port unless --url is given.
+#
+#   python -m benchmarks.bench_service [--url http://127.0.0.1:8765] [--clients 8] [--seconds 5]
+
+import argparse
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from gcres.client import ServiceClient
+
+
+def start_service(catalog=None, workers=None):
+    import uvicorn
+
+    from gcres.engine import Engine
+    from gcres.service import create_app
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(create_app(Engine(catalog), workers), host="127.0.0.1", port=port,
+                                           log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    url = f"http://127.0.0.1:{port}"
+    client = ServiceClient(url)
+    for _ in range(300):
+        try:
+            client.health()
+            return url, server
+        except Exception:
+            time.sleep(0.1)
+    raise RuntimeError("service did not start")
+
+
+def requests_for(endpoint, rng):
+    if endpoint == "recommend":
+        return {"preferences": {"max_temp": float(rng.uniform(21, 25)), "quiet": bool(rng.random() < 0.5),
+                                "min_capacity": int(rng.choice([4, 8, 12]))}, "k": 5}
+    hour = int(rng.integers(8, 18))
+    start, end = f"2026-01-05T{hour:02d}:00", f"2026-01-05T{hour + 1:02d}:00"
+    if endpoint == "score":
+        return {"start": start, "end": end, "k": 10}
+    return {"start": start, "end": end, "free_only": True}
+
+
+def load(url, endpoint, clients, seconds, batch):
+    # Returns (requests per second, latencies of each round trip in ms)
+    latencies = []
+    done = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(seed):
+        client = ServiceClient(url, timeout=60)
+        rng = np.random.default_rng(seed)
+        while time.perf_counter() < deadline:
+            payloads = [requests_for(endpoint, rng) for _ in range(batch)]
+            start = time.perf_counter()
+            if batch == 1:
+                getattr(client, endpoint)(**payloads[0])
+            else:
+                client.batch(endpoint, payloads)
+            elapsed = (time.perf_counter() - start) * 1e3
+            with lock:
+                latencies.append(elapsed)
+                done[0] += batch
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(worker, range(clients)))
+    return done[0] / (time.perf_counter() - start), np.array(latencies)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="running service (default: start one in-process)")
+    parser.add_argument("--catalog", help="catalog file for the in-process service")
+    parser.add_argument("--workers", type=int, help="worker threads of the in-process service")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--batch", type=int, default=20, help="requests per round trip in the batched runs")
+    args = parser.parse_args(argv)
+
+    url = args.url or start_service(args.catalog, args.workers)[0]
+    print(f"{url}: {ServiceClient(url).health()['rooms']} rooms, {args.clients} clients, {args.seconds:g} s per run")
+    print(f"{'endpoint':<14}{'batch':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for endpoint in ("recommend", "score", "availability"):
+        for batch in (1, args.batch):
+            rate, latencies = load(url, endpoint, args.clients, args.seconds, batch)
+            print(f"{endpoint:<14}{batch:>6}{rate:>10.0f}{np.percentile(latencies, 50):>10.2f}"
+                  f"{np.percentile(latencies, 95):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
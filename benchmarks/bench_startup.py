@@ -0,0 +1,77 @@
+# Cold start of every page in home.py's navigation: each page runs in a fresh
+# Python process (Streamlit's AppTest, no browser) and reports the time spent
+# importing modules the page pulls in, its first render (imports included, so
+# the engine's catalog load and ingestion start count here), a warm rerun,
+# and whether pandas / matplotlib got loaded at all.
+#
+#   python -m benchmarks.bench_startup [page.py ...]
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+marker = "gcres-startup-marker"
+
+# Runs in the child process: argv[1] is the page
+runner = f"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+print("{marker}", file=sys.stderr, flush=True)
+start = time.perf_counter()
+at.run()
+first = time.perf_counter() - start
+start = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - start
+print(json.dumps({{"first": first, "rerun": rerun, "errors": len(at.exception),
+                  "pandas": "pandas" in sys.modules, "matplotlib": "matplotlib" in sys.modules}}))
+"""
+
+
+def page_imports(stderr):
+    # Seconds of -X importtime output after the marker: cumulative time of the
+    # outermost imports, i.e. everything the page's script imported
+    total, seen = 0, False
+    for line in stderr.splitlines():
+        if line.strip() == marker:
+            seen = True
+        elif seen and line.startswith("import time:"):
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if not name[1:].startswith(" "):  # Depth 0
+                total += int(cumulative)
+    return total / 1e6
+
+
+def measure(page):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", runner, page], cwd=root,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{page}: {proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["imports"] = page_imports(proc.stderr)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pages", nargs="*", help="page scripts (default: every page next to home.py)")
+    args = parser.parse_args(argv)
+    pages = args.pages or sorted(os.path.basename(p) for p in glob.glob(os.path.join(root, "*.py"))
+                                 if os.path.basename(p) != "home.py")
+
+    print(f"{'page':<42} {'imports (ms)':>13} {'first render (ms)':>18} {'rerun (ms)':>11} {'pandas':>7} "
+          f"{'matplotlib':>11}")
+    for page in pages:
+        r = measure(page)
+        errors = f"  {r['errors']} exception(s)" if r["errors"] else ""
+        print(f"{page:<42} {r['imports'] * 1e3:>13.0f} {r['first'] * 1e3:>18.0f} {r['rerun'] * 1e3:>11.0f} "
+              f"{'yes' if r['pandas'] else 'no':>7} {'yes' if r['matplotlib'] else 'no':>11}{errors}")
+
+
+if __name__ == "__main__":
+    main()
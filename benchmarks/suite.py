@@ -0,0 +1,223 @@
+# Reproducible benchmark suite over synthetic facilities, no browser needed.
+#
+# For each facility size it generates rooms, bookings and a sensor stream with
+# gcres.synthetic, then times the hot paths the pages run: scoring (the old
+# row-wise calculate_score and the vectorized path), determine_optimal_room,
+# the selector matrix, availability lookup, map filtering and chart
+# preparation. Results go to a JSON file (or CSV by extension) together with
+# the environment they were measured in; --compare prints the change against an
+# earlier results file.
+#
+#   python -m benchmarks.suite [--sizes 10 1000 100000] [--out benchmarks/results/run.json]
+#                              [--compare benchmarks/results/baseline.json]
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_scoring import calculate_score, weights
+from gcres import charts
+from gcres.agents import determine_optimal_room
+from gcres.bookings import BookingStore
+from gcres.cache import results as result_cache
+from gcres.columnar import RoomTable, SensorSnapshot
+from gcres.ingest import SensorStore
+from gcres.knowledge import KnowledgeBase
+from gcres.scoring import calculate_scores, encode_ratings, rank_rooms, rating_scores
+from gcres.spatial import GridIndex, cluster, viewport_bounds
+from gcres.synthetic import generate_bookings, generate_facility, sensor_stream
+from gcres.timeseries import downsample
+
+results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Selector page criteria and rating labels
+selector_criteria = {
+    "Occupancy Level": 5,
+    "Noise Level": 4,
+    "Natural Light Availability": 2,
+    "Shared HVAC Zone": 3,
+    "Energy Efficiency Features": 3,
+    "Proximity to Team": 3,
+    "Availability at Required Time": 5,
+    "Security Level": 4,
+    "Crowd Level on Floor": 3,
+}
+rating_map = {"High": 1, "Medium": 2, "Low": 3, "Yes": 3, "Partial": 2, "No": 1, "Quiet": 3, "Moderate": 2,
+              "Noisy": 1, "Near": 3, "Far": 1}
+
+
+class Facility:
+    # Everything the cases need for one size, built once
+    def __init__(self, rooms, buildings=10, floors=20, seed=0, sensor_rate=0.5):
+        self.rooms, self.buildings = generate_facility(buildings, floors, rooms, seed=seed)
+        self.names = self.rooms["Room"].tolist()
+        self.day = datetime.datetime(2026, 1, 5)
+        self.bookings = BookingStore(self.names)
+        generate_bookings(self.bookings, days=7, seed=seed)
+        self.store = SensorStore(self.names, capacity=16)
+        for batch in sensor_stream(self.names, rate=sensor_rate, seconds=10, start=self.day.timestamp(), seed=seed):
+            self.store.extend(batch)
+        self.table = RoomTable(self.rooms)
+        self.snapshot = SensorSnapshot.from_store(self.store)
+        self.scored = self.snapshot.frame(self.table, [c for c in weights if c not in ("HVAC Temp", "Current Occupancy")],
+                                          reported_only=False, names=("HVAC Temp", "Current Occupancy"))
+        self.scored["HVAC Temp"] = np.nan_to_num(self.scored["HVAC Temp"].to_numpy(), nan=22.0)
+        self.scored["Current Occupancy"] = np.maximum(self.scored["Current Occupancy"].to_numpy(), 0)
+        rng = np.random.default_rng(seed)
+        labels = np.array(list(rating_map))
+        self.ratings = pd.DataFrame({"Room": self.names,
+                                     **{crit: labels[rng.integers(0, len(labels), rooms)] for crit in selector_criteria}})
+        self.kb = KnowledgeBase()
+        self.kb.update("calendar", dict(zip(self.names, rng.choice(["Free", "Booked"], rooms))))
+        self.kb.update("assets", dict(zip(self.names, rng.choice(["OK", "Needs Maintenance"], rooms))))
+        self.kb.update("environment", dict(zip(self.names, self.scored["HVAC Temp"].tolist())))
+        self.kb.update("learning", dict(zip(self.names, rng.uniform(0, 1, rooms).tolist())))
+        self.kb.update("analytics", dict(zip(self.names, rng.choice(["Low Demand", "High Demand"], rooms))))
+        self.kb.update("alerts", {})
+        self.grid = GridIndex(self.rooms["lat"].to_numpy(), self.rooms["lon"].to_numpy())
+        self.center = (float(self.rooms["lat"].mean()), float(self.rooms["lon"].mean()))
+        self.trend = np.cumsum(rng.normal(0, 0.05, max(rooms * 10, 1000))) + 22.0
+
+
+def _old_rank(f):
+    # What the pages did before gcres.scoring
+    df = f.scored.copy()
+    df["Weighted Score"] = df.apply(calculate_score, axis=1)
+    return df.sort_values("Weighted Score", ascending=False).head(50)
+
+
+def _chart(f):
+    # Top-50 bar chart as the IoT page draws it, rendered fresh each time
+    top = rank_rooms(f.scored, weights, k=50)
+    result_cache.clear("chart")
+    return charts.render_bar(top["Room"], top["HVAC Temp"], "Temperature (°C)", "HVAC Temperature", "skyblue")
+
+
+def _map(f):
+    south, west, north, east = viewport_bounds(*f.center, zoom=15)
+    visible = f.grid.viewport(south, west, north, east)
+    return cluster(f.rooms["lat"].to_numpy()[visible], f.rooms["lon"].to_numpy()[visible], 15)
+
+
+def _optimal(f):
+    return determine_optimal_room(f.kb, f.names, {"max_temp": 23.0})
+
+
+# name -> (function of a Facility, largest size it is run at or None)
+cases = {
+    "scoring: calculate_score row-wise": (_old_rank, 10_000),
+    "scoring: calculate_scores vectorized": (lambda f: calculate_scores(f.scored, weights), None),
+    "scoring: rank_rooms top-50": (lambda f: rank_rooms(f.scored, weights, k=50), None),
+    "agents: determine_optimal_room": (_optimal, None),
+    "selector: encode + score matrix": (lambda f: rating_scores(encode_ratings(f.ratings, rating_map, list(selector_criteria)),
+                                                                selector_criteria), None),
+    "availability: availability_scores 1h": (lambda f: f.bookings.availability_scores(
+        f.names, f.day.replace(hour=10), f.day.replace(hour=11)), None),
+    "availability: free_rooms 1h": (lambda f: f.bookings.free_rooms(f.day.replace(hour=10), f.day.replace(hour=11)), None),
+    "map: viewport + cluster (zoom 15)": (_map, None),
+    "map: rooms within 500 m": (lambda f: f.grid.within(*f.center, 500.0), None),
+    "charts: sensor snapshot frame": (lambda f: SensorSnapshot.from_store(f.store).frame(f.table, ["Capacity"]), None),
+    "charts: downsample trend to 2000 points": (lambda f: downsample(np.arange(len(f.trend), dtype=np.float64), f.trend,
+                                                                     max_points=2000), None),
+    "charts: render top-50 bar chart": (_chart, None),
+}
+
+
+def measure(fn, min_runs=5, min_time=0.2, max_runs=1000):
+    # Runs fn until both min_runs and min_time are reached; returns timings in ms
+    fn()  # Warm-up
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < max_runs and (len(samples) < min_runs or time.perf_counter() - start < min_time):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1e3)
+    samples = np.array(samples)
+    return {"runs": len(samples), "min_ms": float(samples.min()), "median_ms": float(np.median(samples)),
+            "mean_ms": float(samples.mean()), "p95_ms": float(np.percentile(samples, 95))}
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(results_dir), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {"timestamp": datetime.datetime.now().isoformat(timespec="seconds"), "commit": commit,
+            "python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+            "platform": platform.platform(), "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count()}
+
+
+def write_results(path, meta, rows):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".csv"):
+        pd.DataFrame(rows).assign(**{k: v for k, v in meta.items() if k != "args"}).to_csv(path, index=False)
+    else:
+        with open(path, "w") as f:
+            json.dump({"meta": meta, "results": rows}, f, indent=2)
+
+
+def read_results(path):
+    if path.endswith(".csv"):
+        return pd.read_csv(path).to_dict("records")
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(rows, baseline_path):
+    base = {(r["case"], r["rooms"]): r for r in read_results(baseline_path)}
+    print(f"\nvs {baseline_path} (median, >1 = faster now)")
+    for row in rows:
+        old = base.get((row["case"], row["rooms"]))
+        if old and row.get("median_ms") and old.get("median_ms"):
+            print(f"{row['case']:<42}{row['rooms']:>8}{old['median_ms']:>11.3f} ->{row['median_ms']:>10.3f} ms"
+                  f"{old['median_ms'] / row['median_ms']:>8.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 100_000])
+    parser.add_argument("--cases", nargs="+", help="only cases whose name contains one of these")
+    parser.add_argument("--buildings", type=int, default=10)
+    parser.add_argument("--floors", type=int, default=20)
+    parser.add_argument("--sensor-rate", type=float, default=0.5, help="readings per room and second")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds spent per case at least")
+    parser.add_argument("--out", help="results file, .json or .csv (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    meta = {**environment(), "args": vars(args)}
+    out = args.out or os.path.join(results_dir, f"{meta['timestamp'].replace(':', '')}.json")
+    selected = {name: case for name, case in cases.items()
+                if not args.cases or any(part in name for part in args.cases)}
+    rows = []
+    for n in args.sizes:
+        start = time.perf_counter()
+        facility = Facility(n, args.buildings, args.floors, args.seed, args.sensor_rate)
+        print(f"\n{n} rooms (generated in {time.perf_counter() - start:.1f} s)")
+        for name, (fn, max_rooms) in selected.items():
+            row = {"case": name, "rooms": n}
+            if max_rooms is not None and n > max_rooms:
+                row["skipped"] = f"only run up to {max_rooms} rooms"
+            else:
+                row.update(measure(lambda: fn(facility), min_time=args.min_time))
+            rows.append(row)
+            timing = f"{row['median_ms']:>10.3f} ms  (p95 {row['p95_ms']:.3f}, {row['runs']} runs)" if "median_ms" in row else "skipped"
+            print(f"  {name:<42}{timing}")
+    write_results(out, meta, rows)
+    print(f"\nwrote {out}")
+    if args.compare:
+        compare(rows, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Shared room-selection engine used by the Streamlit pages.
@@ -0,0 +1,220 @@
+# Agent runtime for the autonomous multi-agent page.
+#
+# Each agent is a class with an async run(ctx) returning its per-room output.
+# The Orchestrator runs all agents concurrently with a timeout per agent, so a
+# rerun costs about as much as the slowest agent instead of the sum of all of
+# them. Outputs go to the shared KnowledgeBase together with the versions of
+# the agent's inputs; an agent whose inputs did not change and whose output is
+# within its TTL is not run again. Agents that time out or fail fall back to
+# their last output, marked stale, and determine_optimal_room() scores
+# whatever is available.
+
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from gcres.knowledge import KnowledgeBase
+from gcres.profiling import timed
+
+
+# Worker threads for blocking agent work. Shared by the process and never shut
+# down per run: asyncio.run() joins its default executor on exit, which would
+# make a rerun wait for an agent that already timed out.
+agent_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="gcres-agent")
+
+
+def next_slot():
+    # The meeting window the Analytics and Calendar agents report on: the
+    # hour from now. Not taken from a run's ctx, since outputs are shared by
+    # every session through the knowledge base for as long as they are fresh.
+    start = datetime.now()
+    return start, start + timedelta(hours=1)
+
+
+class Agent:
+    name = "Agent"
+    key = None  # Knowledge base key the output is stored under
+    inputs = ()  # Knowledge base keys that invalidate the output when they change
+    ttl = 60.0  # Seconds the output stays valid without input changes
+    timeout = 2.0  # Seconds
+
+    async def run(self, ctx):
+        # Blocking data sources run in a worker thread so agents overlap
+        return await asyncio.get_running_loop().run_in_executor(agent_pool, self.compute, ctx)
+
+    def compute(self, ctx):
+        raise NotImplementedError
+
+
+class EnvironmentAgent(Agent):
+    name = "Environment Agent"
+    key = "environment"
+    inputs = ("available_rooms", "sensor_version")
+    ttl = 30.0
+
+    def compute(self, ctx):
+        readings = ctx["sensor_store"].readings(ctx["rooms"])
+        return {room: readings[room]["temp"] if room in readings else float("inf") for room in ctx["rooms"]}
+
+
+class AnalyticsAgent(Agent):
+    name = "Analytics Agent"
+    key = "analytics"
+    inputs = ("available_rooms", "demand_version")
+
+    def compute(self, ctx):
+        # Forecast demand for the next meeting slot from the DemandModel
+        model = ctx.get("demand_model")
+        if model is None:
+            return {}
+        start, end = next_slot()
+        labels = model.labels(start, end)
+        return {room: str(labels[model.index[room]]) for room in ctx["rooms"] if room in model.index}
+
+
+class AlertAgent(Agent):
+    name = "Alert Agent"
+    key = "alerts"
+    inputs = ("alerts_version",)
+    ttl = 30.0
+
+    def compute(self, ctx):
+        # Active alerts per room from the streaming AlertEngine
+        engine = ctx.get("alert_engine")
+        return {} if engine is None else engine.by_room()
+
+
+class LearningAgent(Agent):
+    name = "Learning Agent"
+    key = "learning"
+    inputs = ("available_rooms", "preferences_version")
+    ttl = 300.0
+
+    def compute(self, ctx):
+        # Room popularity over all users from the PreferenceModel; a user's own
+        # preferences are passed to determine_optimal_room() per request
+        model = ctx.get("preference_model")
+        return {} if model is None else model.popular(ctx["rooms"])
+
+
+class AssetAgent(Agent):
+    name = "Asset Agent"
+    key = "assets"
+    inputs = ("available_rooms",)
+    ttl = 300.0
+
+    def compute(self, ctx):
+        return {room: random.choice(["OK", "Needs Cleaning"]) for room in ctx["rooms"]}
+
+
+class CalendarAgent(Agent):
+    name = "Calendar Agent"
+    key = "calendar"
+    inputs = ("available_rooms", "bookings_version", "calendar_version")
+
+    def compute(self, ctx):
+        # Free/busy for the next meeting slot from the booking store and the
+        # rooms' iCalendar exports
+        start, end = next_slot()
+        busy = set(ctx["booking_store"].busy_rooms(start, end))
+        calendars = ctx.get("calendar_store")
+        if calendars is not None:
+            busy.update(calendars.busy_rooms(start, end))
+        return {room: "Busy" if room in busy else "Free" for room in ctx["rooms"]}
+
+
+def default_agents():
+    return [EnvironmentAgent(), AnalyticsAgent(), AlertAgent(), LearningAgent(), AssetAgent(), CalendarAgent()]
+
+
+class AgentResult:
+    def __init__(self, agent, status, value=None, elapsed=0.0, error=None, stale=False):
+        self.name = agent.name
+        self.key = agent.key
+        self.status = status  # "ok", "cached", "timeout" or "error"
+        self.value = value
+        self.elapsed = elapsed
+        self.error = error
+        self.stale = stale  # value is an earlier run's output
+
+    @property
+    def ok(self):
+        return self.status in ("ok", "cached")
+
+
+class RunResults(dict):
+    # AgentResults by agent key, with the wall time of the whole run. Per run,
+    # not on the Orchestrator, which concurrent sessions share.
+    def __init__(self, results, elapsed):
+        super().__init__(results)
+        self.elapsed = elapsed
+
+
+class Orchestrator:
+    def __init__(self, agents=None, kb=None):
+        self.agents = default_agents() if agents is None else list(agents)
+        self.kb = KnowledgeBase() if kb is None else kb
+
+    async def _run_one(self, agent, ctx):
+        if self.kb.is_fresh(agent.key, agent.inputs):
+            return AgentResult(agent, "cached", self.kb.get(agent.key))
+        signature = self.kb.versions(agent.inputs)
+        start = time.perf_counter()
+        try:
+            value = await asyncio.wait_for(agent.run(ctx), agent.timeout)
+        except asyncio.TimeoutError:
+            return self._fallback(agent, "timeout", time.perf_counter() - start)
+        except Exception as e:  # An agent failing must not take the page down
+            return self._fallback(agent, "error", time.perf_counter() - start, error=e)
+        self.kb.update(agent.key, value, ttl=agent.ttl, inputs=signature)
+        return AgentResult(agent, "ok", value, time.perf_counter() - start)
+
+    def _fallback(self, agent, status, elapsed, error=None):
+        value = self.kb.get(agent.key, stale_ok=True)
+        return AgentResult(agent, status, value, elapsed, error, stale=value is not None)
+
+    async def run_async(self, ctx):
+        start = time.perf_counter()
+        results = await asyncio.gather(*(self._run_one(agent, ctx) for agent in self.agents))
+        return RunResults({result.key: result for result in results}, time.perf_counter() - start)
+
+    @timed("agents")
+    def run(self, ctx):
+        # Streamlit script threads have no running event loop, so a fresh one is fine
+        return asyncio.run(self.run_async(ctx))
+
+
+@timed("agent decision")
+def determine_optimal_room(kb, rooms, preferences, learning=None):
+    # Decision logic over whichever agent outputs are in the knowledge base
+    # (the last output if an agent is late); a missing agent contributes nothing.
+    # Preferences are per user, so they are passed in rather than shared, as
+    # are the user's learned room preferences (PreferenceModel.scores), which
+    # take precedence over the Learning Agent's popularity.
+    calendar = kb.get("calendar", stale_ok=True) or {}
+    assets = kb.get("assets", stale_ok=True) or {}
+    alerts = kb.get("alerts", stale_ok=True)
+    environment = kb.get("environment", stale_ok=True) or {}
+    popularity = kb.get("learning", stale_ok=True) or {}
+    learning = learning or {}
+    analytics = kb.get("analytics", stale_ok=True) or {}
+    final_scores = {}
+    for room in rooms:
+        score = 0
+        if calendar.get(room) == "Free":
+            score += 2
+        if assets.get(room) == "OK":
+            score += 1
+        if alerts is not None and room not in alerts:
+            score += 1
+        if room in environment and "max_temp" in preferences and environment[room] <= preferences["max_temp"]:
+            score += 2
+        score += learning[room] if room in learning else popularity.get(room, 0)
+        if analytics.get(room) == "Low Demand":
+            score += 1
+        final_scores[room] = round(score, 2)
+    if not final_scores:
+        return None, {}  # No rooms in the catalog
+    return max(final_scores, key=final_scores.get), final_scores
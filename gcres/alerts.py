@@ -0,0 +1,196 @@
+# Streaming alerts on sensor readings for the Alert Agent.
+#
+# Each ingested batch is checked against rules and rolling detectors, with
+# per-room state in NumPy arrays so every reading costs O(1):
+#
+#   Over Occupied          occupancy above the room's capacity
+#   Temperature Drift      smoothed temperature outside the comfort band
+#   <Metric> Anomaly       reading more than z_threshold standard deviations
+#                          from the room's EWMA mean (after a warm-up)
+#   Sensor Flatline        a sensor repeating the exact same value for
+#                          flatline_seconds
+#
+# An alert is raised once when its condition starts and resolved when a later
+# reading clears it; readings in between only bump its hit count
+# (deduplication). After an alert resolves, the same alert for the same room
+# can't be raised again for `cooldown` seconds, so a flapping sensor shows up as
+# one alert instead of a storm. Raise / resolve events go to a bounded log and
+# bump `version`, which the engine publishes as alerts_version.
+
+import threading
+from collections import deque
+
+import numpy as np
+
+over_capacity = "Over Occupied"
+temp_drift = "Temperature Drift"
+flatline = "Sensor Flatline"
+metric_labels = {"temp": "Temperature", "occupancy": "Occupancy"}
+# Smallest standard deviation used for z-scores: sensor resolution, so a very
+# steady room doesn't alert on the first 0.1 °C change
+min_std = {"temp": 0.2, "occupancy": 1.0}
+
+
+def anomaly(metric):
+    return f"{metric_labels.get(metric, metric.title())} Anomaly"
+
+
+class AlertEngine:
+    def __init__(self, rooms, capacity=None, metrics=("temp", "occupancy"), comfort=(18.0, 27.0), alpha=0.05,
+                 z_threshold=4.0, warmup=30, flatline_seconds=1800.0, flatline_metrics=("temp",), cooldown=300.0,
+                 max_events=500):
+        self.rooms = list(rooms)
+        self.index = {room: i for i, room in enumerate(self.rooms)}
+        n = len(self.rooms)
+        self.metrics = tuple(metrics)
+        self.capacity = np.full(n, np.inf) if capacity is None else np.asarray(capacity, dtype=np.float64)
+        self.comfort = comfort
+        self.alpha = alpha  # EWMA weight of a new reading
+        self.z_threshold = z_threshold
+        self.warmup = warmup  # Readings before drift / anomaly checks start
+        self.flatline_seconds = flatline_seconds
+        self.flatline_metrics = tuple(flatline_metrics)
+        self.cooldown = cooldown
+        # Rolling state per metric and room
+        self._mean = {m: np.zeros(n) for m in self.metrics}
+        self._var = {m: np.zeros(n) for m in self.metrics}
+        self._count = {m: np.zeros(n, dtype=np.int64) for m in self.metrics}
+        self._last = {m: np.full(n, np.nan) for m in self.metrics}
+        self._changed = {m: np.zeros(n) for m in self.metrics}  # When the value last changed
+        # Alert state per kind and room
+        self.kinds = [over_capacity, temp_drift, *(anomaly(m) for m in self.metrics), flatline]
+        self._active = {k: np.zeros(n, dtype=bool) for k in self.kinds}
+        self._since = {k: np.zeros(n) for k in self.kinds}
+        self._hits = {k: np.zeros(n, dtype=np.int64) for k in self.kinds}
+        self._value = {k: np.zeros(n) for k in self.kinds}
+        self._cleared = {k: np.full(n, -np.inf) for k in self.kinds}
+        self.events = deque(maxlen=max_events)  # Raise / resolve events, newest last
+        self.processed = 0
+        self.raised = 0
+        self.resolved = 0
+        self.suppressed = 0  # Alerts held back by the cooldown
+        self.version = 0  # Bumped whenever alerts are raised or resolved
+        self._lock = threading.Lock()
+
+    # --- Ingestion ---
+
+    def process(self, readings):
+        # Check a batch of (room, metric, ts, value) readings; usable as a
+        # SensorStore listener
+        grouped = {m: ([], [], []) for m in self.metrics}
+        for room, metric, ts, value in readings:
+            i = self.index.get(room)
+            if i is None or metric not in grouped:
+                continue
+            ids, times, values = grouped[metric]
+            ids.append(i)
+            times.append(ts)
+            values.append(value)
+        with self._lock:
+            for metric, (ids, times, values) in grouped.items():
+                if not ids:
+                    continue
+                ids = np.asarray(ids, dtype=np.int64)
+                times = np.asarray(times, dtype=np.float64)
+                values = np.asarray(values, dtype=np.float64)
+                # A room reporting twice in one batch is processed in arrival
+                # order: one round per repeat, each round vectorized
+                rounds = _occurrence(ids)
+                for r in range(int(rounds.max()) + 1):
+                    sel = rounds == r
+                    self._check(metric, ids[sel], times[sel], values[sel])
+                self.processed += len(ids)
+
+    def _check(self, metric, ids, ts, values):
+        # ids are unique here
+        mean, var, count = self._mean[metric][ids], self._var[metric][ids], self._count[metric][ids]
+        warm = count >= self.warmup
+        # z-score against the state before this reading
+        std = np.maximum(np.sqrt(var), min_std.get(metric, 1e-6))
+        conditions = {anomaly(metric): warm & (np.abs(values - mean) > self.z_threshold * std)}
+        # Exponentially weighted mean and variance, the first reading initialises them
+        delta = values - mean
+        first = count == 0
+        mean = np.where(first, values, mean + self.alpha * delta)
+        var = np.where(first, 0.0, (1 - self.alpha) * (var + self.alpha * delta ** 2))
+        self._mean[metric][ids], self._var[metric][ids], self._count[metric][ids] = mean, var, count + 1
+
+        if metric == "occupancy":
+            conditions[over_capacity] = values > self.capacity[ids]
+        if metric == "temp":
+            conditions[temp_drift] = warm & ((mean < self.comfort[0]) | (mean > self.comfort[1]))
+        if metric in self.flatline_metrics:
+            changed = values != self._last[metric][ids]
+            since = np.where(changed, ts, self._changed[metric][ids])
+            self._changed[metric][ids] = since
+            conditions[flatline] = ~changed & (ts - since >= self.flatline_seconds)
+        self._last[metric][ids] = values
+
+        for kind, condition in conditions.items():
+            self._transition(kind, ids, ts, values, condition)
+
+    def _transition(self, kind, ids, ts, values, condition):
+        active = self._active[kind]
+        was = active[ids]
+        ongoing = condition & was
+        self._hits[kind][ids[ongoing]] += 1
+        self._value[kind][ids[ongoing]] = values[ongoing]
+        start = condition & ~was
+        if start.any():
+            ready = ts - self._cleared[kind][ids] >= self.cooldown
+            self.suppressed += int(np.count_nonzero(start & ~ready))
+            start &= ready
+        stop = ~condition & was
+        if not start.any() and not stop.any():
+            return
+        for i, t, v in zip(ids[start].tolist(), ts[start].tolist(), values[start].tolist()):
+            active[i] = True
+            self._since[kind][i], self._hits[kind][i], self._value[kind][i] = t, 1, v
+            self.events.append({"event": "raised", "room": self.rooms[i], "alert": kind, "ts": t, "value": v})
+            self.raised += 1
+        for i, t in zip(ids[stop].tolist(), ts[stop].tolist()):
+            active[i] = False
+            self._cleared[kind][i] = t
+            self.events.append({"event": "resolved", "room": self.rooms[i], "alert": kind, "ts": t,
+                                "since": float(self._since[kind][i]), "hits": int(self._hits[kind][i])})
+            self.resolved += 1
+        self.version += 1
+
+    # --- Queries ---
+
+    def active(self):
+        # Active alerts, oldest first
+        with self._lock:
+            alerts = [{"room": self.rooms[i], "alert": kind, "since": float(self._since[kind][i]),
+                       "hits": int(self._hits[kind][i]), "value": float(self._value[kind][i])}
+                      for kind in self.kinds for i in np.flatnonzero(self._active[kind])]
+        return sorted(alerts, key=lambda a: a["since"])
+
+    def by_room(self):
+        # {"Room B": "Over Occupied"}: active alerts per room, the Alert Agent's output
+        rooms = {}
+        for alert in self.active():
+            rooms[alert["room"]] = f"{rooms[alert['room']]}, {alert['alert']}" if alert["room"] in rooms else alert["alert"]
+        return rooms
+
+    def recent(self, n=50):
+        with self._lock:
+            return list(self.events)[-n:][::-1]
+
+    @property
+    def nbytes(self):
+        arrays = [*self._mean.values(), *self._var.values(), *self._count.values(), *self._last.values(),
+                  *self._changed.values(), *self._active.values(), *self._since.values(), *self._hits.values(),
+                  *self._value.values(), *self._cleared.values()]
+        return sum(a.nbytes for a in arrays)
+
+
+def _occurrence(ids):
+    # For each position, how many times its id occurred before it
+    order = np.argsort(ids, kind="stable")
+    sorted_ids = ids[order]
+    starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+    counts = np.diff(np.r_[starts, len(ids)])
+    rank = np.empty(len(ids), dtype=np.int64)
+    rank[order] = np.arange(len(ids)) - np.repeat(starts, counts)
+    return rank
@@ -0,0 +1,34 @@
+# Static files the pages show (logo, diagrams), bundled with the app.
+#
+# Pages used to open logo.png with PIL on every rerun, and the overview page
+# fetched its diagram from GitHub on every render, which is slow and fails
+# without internet access. Here each file is read from disk once per process
+# and the bytes are reused by every rerun and session; a file replaced on disk
+# is read again (its mtime is part of the key).
+
+import os
+import threading
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_files = {}  # path -> (mtime_ns, bytes)
+_lock = threading.Lock()
+
+
+def asset(name):
+    # Contents of a file under the app directory, e.g. asset("logo.png")
+    path = os.path.join(root, name)
+    mtime = os.stat(path).st_mtime_ns
+    hit = _files.get(path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+    with open(path, "rb") as f:
+        data = f.read()
+    with _lock:
+        _files[path] = (mtime, data)
+    return data
+
+
+def svg(name):
+    # SVG markup as text, which st.image renders as vector graphics
+    return asset(name).decode()
@@ -0,0 +1,249 @@
+# Batch room assignment for many meeting requests at once.
+#
+# Picking the best-scoring free room for each request in turn (what the pages
+# do for a single request) lets early requests take rooms later ones fit much
+# better, and leaves big groups without a big enough room. Here a whole batch
+# is assigned together:
+#
+#   utility(request, room) = room score - waste_weight * empty seat share
+#
+# over the rooms that meet the request's constraints (capacity >= headcount,
+# quiet / projector / floor / max_temp, not booked in its interval). Requests
+# whose intervals overlap, directly or through a chain, form a cluster and get
+# distinct rooms; separate clusters may reuse rooms. Each cluster is solved as
+# an assignment problem, first maximizing how many requests get a room, then
+# their total utility (Hungarian / Jonker-Volgenant shortest
+# augmenting paths; scipy's when installed). Only each request's n best rooms
+# can matter in a cluster of n requests, so columns are pruned to those without
+# losing optimality. Clusters too large for a dense matrix fall back to a
+# global greedy match over the same (request, room) pairs, best pairs first.
+
+import numpy as np
+
+from gcres.profiling import timed
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # Optional: the NumPy solver below is used instead
+    linear_sum_assignment = None
+
+waste_weight = 1.0
+# Largest cluster matrix (requests x candidate rooms) solved exactly
+max_cells = 4_000_000
+# Cost of leaving a request unassigned in the exact solver, above any real cost
+_unassigned = 1e9
+
+
+def _ts(value):
+    return value.timestamp() if hasattr(value, "timestamp") else float(value)
+
+
+def clusters(starts, ends):
+    # Cluster id per request: requests whose intervals overlap, directly or
+    # through a chain of overlaps, share a cluster
+    order = np.argsort(starts, kind="stable")
+    reach = np.maximum.accumulate(ends[order])
+    new = np.r_[True, starts[order][1:] >= reach[:-1]]
+    ids = np.empty(len(starts), dtype=np.int64)
+    ids[order] = np.cumsum(new) - 1
+    return ids
+
+
+def solve_lsap(cost):
+    # Minimum-cost assignment of every row of an (n, m) cost matrix, n <= m,
+    # to a distinct column (inf = not allowed). Shortest augmenting paths with
+    # dual variables (Jonker-Volgenant, as in scipy), each Dijkstra step
+    # vectorized over the columns. Returns the column of each row.
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(cost)
+        col4row = np.empty(cost.shape[0], dtype=np.int64)
+        col4row[rows] = cols
+        return col4row
+    n, m = cost.shape
+    u = np.zeros(n)
+    v = np.zeros(m)
+    col4row = np.full(n, -1, dtype=np.int64)
+    row4col = np.full(m, -1, dtype=np.int64)
+    for cur in range(n):
+        # Tentative distance of each unvisited column; visited columns are
+        # masked by v_open = -inf so they never improve again
+        shortest = np.full(m, np.inf)
+        path = np.full(m, -1, dtype=np.int64)
+        v_open = v.copy()
+        rows, cols, dist = [], [], []  # Visited rows (after cur), columns and their final distance
+        i, min_val = cur, 0.0
+        while True:
+            reduced = cost[i] - v_open
+            reduced += min_val - u[i]
+            better = reduced < shortest
+            np.copyto(shortest, reduced, where=better)
+            np.copyto(path, i, where=better)
+            j = int(shortest.argmin())
+            min_val = shortest[j]
+            if min_val == np.inf:
+                raise ValueError("no feasible assignment")
+            shortest[j] = np.inf
+            v_open[j] = -np.inf
+            cols.append(j)
+            dist.append(min_val)
+            if row4col[j] < 0:
+                break
+            i = int(row4col[j])
+            rows.append(i)
+        # Dual update, then flip the augmenting path back to cur
+        dist = np.array(dist)
+        u[cur] += min_val
+        if rows:
+            # Row k was reached through column cols[k]
+            u[rows] += min_val - dist[:-1]
+        v[cols] -= min_val - dist
+        while True:
+            i = int(path[j])
+            row4col[j] = i
+            col4row[i], j = j, col4row[i]
+            if i == cur:
+                break
+    return col4row
+
+
+class BatchAssigner:
+    def __init__(self, index, temps=None, occupancy=None, bookings=None):
+        # index: a RoomIndex; temps / occupancy: latest readings aligned with it;
+        # bookings: a BookingStore over the same rooms, or None to ignore bookings
+        self.index = index
+        self.temps = temps
+        self.base = index.scores(None, temps, occupancy)
+        self.capacity = index.capacity.astype(np.float64)
+        self.bookings = bookings
+
+    def options(self, request, limit=None):
+        # (room positions, utilities) of the rooms a request may get, best
+        # first, at most `limit`
+        preferences = request.get("preferences") or {}
+        headcount = int(request.get("headcount") or 1)
+        busy = None
+        if self.bookings is not None:
+            busy = self.bookings.overlapping(_ts(request["start"]), _ts(request["end"]))[0]
+        cand = self.index.matches(
+            max_temp=preferences.get("max_temp"),
+            quiet=preferences.get("quiet", False),
+            projector=preferences.get("projector", preferences.get("need_projector", False)),
+            min_capacity=max(headcount, preferences.get("min_capacity") or 0),
+            floor=preferences.get("floor"),
+            temps=self.temps,
+            busy=busy,
+        )
+        utility = self.base[cand] - waste_weight * (self.capacity[cand] - headcount) / self.capacity[cand]
+        if limit is not None and limit < len(cand):
+            best = np.argpartition(-utility, limit - 1)[:limit]
+            cand, utility = cand[best], utility[best]
+        order = np.argsort(-utility, kind="stable")
+        return cand[order], utility[order]
+
+    @timed("batch assignment")
+    def assign(self, requests, method="auto"):
+        # Room position per request (-1 = nothing suitable left) and its
+        # utility. method: "auto", "exact" or "greedy".
+        n = len(requests)
+        starts = np.array([_ts(r["start"]) for r in requests], dtype=np.float64)
+        ends = np.array([_ts(r["end"]) for r in requests], dtype=np.float64)
+        rooms = np.full(n, -1, dtype=np.int64)
+        utility = np.full(n, np.nan)
+        ids = clusters(starts, ends) if n else np.empty(0, dtype=np.int64)
+        for c in np.unique(ids):
+            members = np.flatnonzero(ids == c)
+            # Exact pruning: each request needs at most len(members) options
+            opts = [self.options(requests[i], limit=len(members)) for i in members]
+            columns = np.unique(np.concatenate([cand for cand, _ in opts])) if opts else np.empty(0, dtype=np.int64)
+            exact = method == "exact" or (method == "auto" and len(members) * (len(columns) + len(members)) <= max_cells)
+            if exact:
+                picks = _solve_exact(opts, columns)
+            else:
+                picks = _solve_greedy(opts)
+                used = [room for room, _ in picks if room >= 0]
+                for k, i in enumerate(members):
+                    if picks[k][0] < 0:
+                        # Its n best rooms went to others: take its best remaining one
+                        cand, value = self.options(requests[i])
+                        free = np.flatnonzero(~np.isin(cand, used))
+                        if len(free):
+                            picks[k] = (int(cand[free[0]]), float(value[free[0]]))
+                            used.append(picks[k][0])
+            for i, (room, value) in zip(members, picks):
+                rooms[i], utility[i] = room, value
+        return rooms, utility
+
+    def greedy_max(self, requests):
+        # Baseline: requests in arrival order, each taking the highest-scoring
+        # room that meets its constraints and is not taken by an overlapping
+        # earlier request (what the pages do for one request)
+        starts = np.array([_ts(r["start"]) for r in requests], dtype=np.float64)
+        ends = np.array([_ts(r["end"]) for r in requests], dtype=np.float64)
+        rooms = np.full(len(requests), -1, dtype=np.int64)
+        utility = np.full(len(requests), np.nan)
+        for i, request in enumerate(requests):
+            cand, value = self.options(request)
+            taken = rooms[:i][(starts[:i] < ends[i]) & (ends[:i] > starts[i])]
+            free = ~np.isin(cand, taken)
+            if not free.any():
+                continue
+            score = self.base[cand]
+            j = np.flatnonzero(free)[np.argmax(score[free])]
+            rooms[i], utility[i] = cand[j], value[j]
+        return rooms, utility
+
+
+def _solve_exact(opts, columns):
+    n = len(opts)
+    col = np.full(columns.max() + 1 if len(columns) else 0, -1, dtype=np.int64)
+    col[columns] = np.arange(len(columns))
+    # Dummy columns stand for "unassigned". A request with at least n options
+    # always gets a room, so only the others may need one.
+    dummies = sum(len(cand) < n for cand, _ in opts)
+    cost = np.full((n, len(columns) + dummies), np.inf)
+    cost[:, len(columns):] = _unassigned
+    for r, (cand, utility) in enumerate(opts):
+        cost[r, col[cand]] = -utility
+    picks = []
+    for r, c in enumerate(solve_lsap(cost)):
+        picks.append((int(columns[c]), -cost[r, c]) if c < len(columns) else (-1, np.nan))
+    return picks
+
+
+def _solve_greedy(opts):
+    # Best (request, room) pairs first, each request and room used once
+    rows = np.concatenate([np.full(len(cand), r) for r, (cand, _) in enumerate(opts)])
+    cand = np.concatenate([cand for cand, _ in opts])
+    utility = np.concatenate([utility for _, utility in opts])
+    picks = [(-1, np.nan)] * len(opts)
+    used = set()
+    for k in np.argsort(-utility, kind="stable"):
+        r, room = int(rows[k]), int(cand[k])
+        if picks[r][0] < 0 and room not in used:
+            picks[r] = (room, float(utility[k]))
+            used.add(room)
+    return picks
+
+
+def summarize(assigner, requests, rooms, utility):
+    # Quality of an assignment: how many requests got a room, total and mean
+    # utility, mean share of empty seats, and overlapping requests sharing a
+    # room (must be 0)
+    done = rooms >= 0
+    headcount = np.array([int(r.get("headcount") or 1) for r in requests])
+    capacity = assigner.capacity[rooms[done]]
+    starts = np.array([_ts(r["start"]) for r in requests])
+    ends = np.array([_ts(r["end"]) for r in requests])
+    conflicts = 0
+    for room in np.unique(rooms[done]):
+        same = np.flatnonzero(rooms == room)
+        order = same[np.argsort(starts[same])]
+        conflicts += int(np.count_nonzero(starts[order][1:] < ends[order][:-1]))
+    return {
+        "requests": len(requests),
+        "assigned": int(done.sum()),
+        "total_utility": float(np.nansum(utility)),
+        "mean_utility": float(np.nanmean(utility)) if done.any() else 0.0,
+        "empty_seat_share": float(np.mean((capacity - headcount[done]) / capacity)) if done.any() else 0.0,
+        "conflicts": conflicts,
+    }
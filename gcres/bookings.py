@@ -0,0 +1,222 @@
+# Room bookings with an interval index for free/busy queries.
+#
+# Each room keeps its bookings as sorted, non-overlapping intervals, so a
+# conflict check is a bisect. For "which rooms are busy between start and end"
+# across all rooms there is a global index, split by booking length into
+# buckets of durations [2^(b-1), 2^b) seconds, each with its starts sorted in
+# a NumPy array. A booking of bucket b overlapping [start, end) must start in
+# [start - 2^b, end), so one searchsorted per bucket plus a scan of the
+# candidates answers it in O(B log n + k) for B buckets (about 20 between a
+# minute and a year), and a few long bookings don't widen the scan of the
+# short ones. New bookings sit in a small pending list until the index is
+# rebuilt.
+
+import bisect
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from gcres.profiling import timed
+
+rebuild_after = 1024  # Pending bookings before the global index is rebuilt
+
+
+class BookingConflict(ValueError):
+    def __init__(self, room, start, end):
+        self.room = room
+        self.start = start
+        self.end = end
+        super().__init__(f"{room} is already booked {_fmt(start)}–{_fmt(end)}")
+
+
+def _ts(value):
+    return value.timestamp() if isinstance(value, datetime) else float(value)
+
+
+def _fmt(ts):
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+
+
+def _bucket(durations):
+    # Duration bucket b of each booking: 2^(b-1) <= duration < 2^b seconds
+    return np.frexp(np.asarray(durations, dtype=np.float64))[1]
+
+
+class BookingStore:
+    def __init__(self, rooms):
+        self.rooms = list(rooms)
+        self.index = {room: i for i, room in enumerate(self.rooms)}
+        self._starts = [[] for _ in self.rooms]  # Per room, sorted
+        self._ends = [[] for _ in self.rooms]
+        self._who = [[] for _ in self.rooms]
+        # Global index over all rooms: per duration bucket, starts sorted with
+        # matching ends / room ids
+        self._buckets = {}  # b -> (starts, ends, rooms)
+        self._pending = []  # (start, end, room) not yet in the global index
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._booking_listeners = []
+        self.version = 0
+
+    def add_listener(self, fn):
+        # fn(store) is called after bookings change, outside the lock
+        self._listeners.append(fn)
+
+    def remove_listener(self, fn):
+        if fn in self._listeners:
+            self._listeners.remove(fn)
+
+    def add_booking_listener(self, fn):
+        # fn(room, start, end, who) is called after each book(), outside the lock
+        self._booking_listeners.append(fn)
+
+    def _changed(self):
+        for fn in self._listeners:
+            fn(self)
+
+    def __len__(self):
+        return sum(len(s) for s in self._starts)
+
+    # --- Writes ---
+
+    def book(self, room, start, end, who=None):
+        # Insert a booking; raises BookingConflict if the room is taken
+        start, end = _ts(start), _ts(end)
+        if end <= start:
+            raise ValueError("end must be after start")
+        i = self.index[room]
+        with self._lock:
+            starts, ends = self._starts[i], self._ends[i]
+            pos = bisect.bisect_left(starts, start)
+            # Only the neighbours can overlap, intervals of one room never do
+            if pos > 0 and ends[pos - 1] > start:
+                raise BookingConflict(room, starts[pos - 1], ends[pos - 1])
+            if pos < len(starts) and starts[pos] < end:
+                raise BookingConflict(room, starts[pos], ends[pos])
+            starts.insert(pos, start)
+            ends.insert(pos, end)
+            self._who[i].insert(pos, who)
+            self._pending.append((start, end, i))
+            self.version += 1
+            if len(self._pending) >= rebuild_after:
+                self._rebuild()
+        self._changed()
+        for fn in self._booking_listeners:
+            fn(room, start, end, who)
+
+    def load(self, rooms, starts, ends):
+        # Bulk load (e.g. from a calendar export) without per-booking checks.
+        # rooms are catalog indices; bookings of one room must not overlap.
+        rooms = np.asarray(rooms, dtype=np.int64)
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        with self._lock:
+            order = np.lexsort((starts, rooms))
+            rooms, starts, ends = rooms[order], starts[order], ends[order]
+            bounds = np.searchsorted(rooms, np.arange(len(self.rooms) + 1))
+            for i in np.unique(rooms):
+                lo, hi = bounds[i], bounds[i + 1]
+                merged = sorted(zip(self._starts[i] + starts[lo:hi].tolist(), self._ends[i] + ends[lo:hi].tolist(),
+                                    self._who[i] + [None] * int(hi - lo)), key=lambda b: b[0])
+                self._starts[i] = [b[0] for b in merged]
+                self._ends[i] = [b[1] for b in merged]
+                self._who[i] = [b[2] for b in merged]
+            self._pending.extend(zip(starts.tolist(), ends.tolist(), rooms.tolist()))
+            self._rebuild()
+            self.version += 1
+        self._changed()
+
+    def _rebuild(self):
+        if not self._pending:
+            return
+        pending = np.array(self._pending, dtype=np.float64).reshape(-1, 3)
+        buckets = _bucket(pending[:, 1] - pending[:, 0])
+        for b in np.unique(buckets).tolist():
+            new = pending[buckets == b]
+            old_starts, old_ends, old_rooms = self._buckets.get(b, (np.empty(0), np.empty(0), np.empty(0, dtype=np.int64)))
+            starts = np.concatenate([old_starts, new[:, 0]])
+            ends = np.concatenate([old_ends, new[:, 1]])
+            rooms = np.concatenate([old_rooms, new[:, 2].astype(np.int64)])
+            order = np.argsort(starts, kind="stable")
+            self._buckets[b] = (starts[order], ends[order], rooms[order])
+        self._pending = []
+
+    # --- Queries ---
+
+    def bookings(self, room):
+        i = self.index[room]
+        with self._lock:
+            return list(zip(self._starts[i], self._ends[i], self._who[i]))
+
+    def is_free(self, room, start, end):
+        start, end = _ts(start), _ts(end)
+        i = self.index[room]
+        with self._lock:
+            # First booking ending after start; ends are sorted too since a room's bookings never overlap
+            pos = bisect.bisect_right(self._ends[i], start)
+            return pos >= len(self._starts[i]) or self._starts[i][pos] >= end
+
+    def overlapping(self, start, end):
+        # Bookings overlapping [start, end) across all rooms as arrays
+        # (room index, booking start, booking end)
+        start, end = _ts(start), _ts(end)
+        parts = []
+        with self._lock:
+            for b, (starts, ends, rooms) in self._buckets.items():
+                # Bookings in bucket b last less than 2^b seconds
+                lo = np.searchsorted(starts, start - 2.0 ** b, side="right")
+                hi = np.searchsorted(starts, end, side="left")
+                hit = lo + np.flatnonzero(ends[lo:hi] > start)
+                parts.append((rooms[hit], starts[hit], ends[hit]))
+            if self._pending:
+                p = np.array(self._pending, dtype=np.float64).reshape(-1, 3)
+                p = p[(p[:, 0] < end) & (p[:, 1] > start)]
+                parts.append((p[:, 2].astype(np.int64), p[:, 0], p[:, 1]))
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+        return tuple(np.concatenate(column) for column in zip(*parts))
+
+    def busy_rooms(self, start, end):
+        rooms, _, _ = self.overlapping(start, end)
+        return [self.rooms[i] for i in np.unique(rooms)]
+
+    def free_rooms(self, start, end):
+        busy = np.zeros(len(self.rooms), dtype=bool)
+        busy[self.overlapping(start, end)[0]] = True
+        return [self.rooms[i] for i in np.flatnonzero(~busy)]
+
+    def free_fraction(self, start, end):
+        # Share of [start, end) that each room is free, aligned with self.rooms
+        start, end = _ts(start), _ts(end)
+        free = np.ones(len(self.rooms))
+        if end <= start:
+            return free
+        rooms, s, e = self.overlapping(start, end)
+        busy = np.minimum(e, end) - np.maximum(s, start)
+        busy_total = np.zeros(len(self.rooms))
+        np.add.at(busy_total, rooms, busy)
+        return np.clip(1 - busy_total / (end - start), 0, 1)
+
+    @timed("availability")
+    def availability_scores(self, rooms, start, end):
+        # Availability criterion on the catalog's 1-5 scale: 5 when the room is
+        # free for the whole window, 1 when it is booked throughout
+        fraction = self.free_fraction(start, end)
+        idx = np.array([self.index[room] for room in rooms], dtype=np.int64)
+        return 1 + 4 * fraction[idx]
+
+
+def seed_demo_bookings(store, days=7, first_hour=8, last_hour=18, busy_share=0.3, seed=0, today=None):
+    # Random 30/60-minute meetings on the hour, for yesterday through `days` ahead
+    rng = np.random.default_rng(seed)
+    today = datetime.combine(today or datetime.now().date(), datetime.min.time())
+    day_starts = [(today + timedelta(days=d)).timestamp() for d in range(-1, days + 1)]
+    hours = np.arange(first_hour, last_hour)
+    n_rooms = len(store.rooms)
+    booked = rng.random((n_rooms, len(day_starts), len(hours))) < busy_share
+    rooms, day, hour = np.nonzero(booked)
+    starts = np.asarray(day_starts)[day] + hours[hour] * 3600.0
+    ends = starts + rng.choice([1800.0, 3600.0], size=len(starts))
+    store.load(rooms, starts, ends)
+    return len(starts)
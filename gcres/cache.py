@@ -0,0 +1,161 @@
+# Process-wide result cache shared by every session.
+#
+# Rankings, scores and rendered charts depend only on their inputs (catalog
+# version, sensor snapshot version, weights, meeting window...), so when many
+# people open the dashboard at once they would all compute the same thing.
+# Results are kept here under a hash of those inputs, evicted least recently
+# used first once the entry or byte limit is reached, with hit/miss counters
+# per namespace for the admin page. Cached values are shared: callers must
+# not modify them.
+
+import datetime
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _pandas(*names):
+    # pandas classes for isinstance checks without importing pandas: until a
+    # page has loaded it, no value can be a pandas object
+    pd = sys.modules.get("pandas")
+    return tuple(getattr(pd, name) for name in names) if pd is not None else ()
+
+
+def data_key(*parts):
+    # Stable hash of the inputs of a computation
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, (np.ndarray, *_pandas("Series", "Index", "Categorical"))):
+            arr = np.asarray(part)
+            h.update(str(arr.dtype).encode())
+            h.update(arr.tobytes() if arr.dtype != object else repr(arr.tolist()).encode())
+        elif isinstance(part, dict):
+            h.update(repr(sorted(part.items())).encode())  # Same weights in any order
+        elif isinstance(part, (datetime.datetime, datetime.date)):
+            h.update(part.isoformat().encode())
+        else:
+            h.update(repr(part).encode())
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _size(value):
+    # Approximate memory held by a cached value
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, _pandas("DataFrame", "Series")):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_size(k) + _size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    def __init__(self, max_entries=1024, max_bytes=256 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (namespace, key) -> (value, size), LRU order
+        self._bytes = 0
+        self._stats = {}  # namespace -> counters
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def _counters(self, namespace):
+        return self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "evictions": 0, "compute_s": 0.0})
+
+    def _lookup(self, full_key):
+        entry = self._entries.get(full_key)
+        if entry is None:
+            return False, None
+        self._entries.move_to_end(full_key)
+        return True, entry[0]
+
+    def get_or_compute(self, namespace, key, compute):
+        # Cached value for `key`, else compute() once; concurrent callers with
+        # the same key wait for that computation instead of repeating it
+        full_key = (namespace, key)
+        with self._lock:
+            found, value = self._lookup(full_key)
+            if found:
+                self._counters(namespace)["hits"] += 1
+                return value
+            key_lock = self._key_locks.setdefault(full_key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                found, value = self._lookup(full_key)
+                if found:
+                    self._counters(namespace)["hits"] += 1
+                    return value
+            start = time.perf_counter()
+            try:
+                value = compute()
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    counters = self._counters(namespace)
+                    counters["misses"] += 1
+                    counters["compute_s"] += elapsed
+                    self._key_locks.pop(full_key, None)
+            self.put(namespace, key, value)
+            return value
+
+    def put(self, namespace, key, value):
+        size = _size(value)
+        with self._lock:
+            if size > self.max_bytes:
+                return  # Would evict everything else, not worth keeping
+            old = self._entries.pop((namespace, key), None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[namespace, key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                (evicted_ns, _), (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._counters(evicted_ns)["evictions"] += 1
+
+    def clear(self, namespace=None):
+        with self._lock:
+            for full_key in [k for k in self._entries if namespace is None or k[0] == namespace]:
+                self._bytes -= self._entries.pop(full_key)[1]
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+    def stats(self):
+        # Per namespace: entries, bytes, hits, misses, evictions, hit rate, time spent computing
+        with self._lock:
+            rows = {ns: {"entries": 0, "bytes": 0, **counters} for ns, counters in self._stats.items()}
+            for (ns, _), (_, size) in self._entries.items():
+                row = rows.setdefault(ns, {"entries": 0, "bytes": 0, **self._counters(ns)})
+                row["entries"] += 1
+                row["bytes"] += size
+        for row in rows.values():
+            lookups = row["hits"] + row["misses"]
+            row["hit_rate"] = row["hits"] / lookups if lookups else 0.0
+        return rows
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# The one instance for this process (all Streamlit sessions run in it)
+results = ResultCache()
+
+
+def cached(namespace, compute, *key_parts):
+    # results.get_or_compute keyed on a hash of key_parts
+    return results.get_or_compute(namespace, data_key(*key_parts), compute)
@@ -0,0 +1,557 @@
+# Room calendars from iCalendar (.ics) exports, for the Calendar Agent.
+#
+# Every .ics file under a directory is read. An event belongs to the catalog
+# room named by its LOCATION, or else to the room the file is named after
+# (one export per room mailbox: "B1-F02-007.ics").
+#
+# Recurring events are never materialized. Each event is compiled into rows
+# of arithmetic series in wall-clock time:
+#
+#   occurrence m of a row starts at base + m * period (local time of its TZID)
+#
+# DAILY and WEEKLY rules with INTERVAL, COUNT, UNTIL, BYDAY and WKST become one
+# row per weekday. For a query window, every row's occurrences are enumerated
+# at once with NumPy: the m range comes from the window, and is capped by
+# COUNT. The wall times are then converted to UTC, and UNTIL, EXDATE and
+# moved / cancelled occurrences (RECURRENCE-ID) are applied. Rules outside
+# that subset (MONTHLY, YEARLY, BYSETPOS, ...) are expanded over the window by
+# dateutil. Single events are rows with one occurrence.
+#
+# Free/busy is answered from per-room bitmaps at slot granularity, one per
+# local day: (rooms, slots / 8) bytes, bit set = busy. They are built on first
+# use and kept until the calendars change.
+#
+# sync() re-reads only files whose mtime or size changed. Within such a file
+# only events whose text changed are compiled again, and rows of removed
+# events are freed for reuse. Events are keyed by UID and RECURRENCE-ID.
+# Time zones: TZID names are looked up in the IANA database; Windows names and
+# VTIMEZONE definitions are not interpreted (such times are read as local).
+
+import calendar
+import glob
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from gcres.profiling import timed
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9: TZIDs are read as local time
+    ZoneInfo = None
+
+default_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "calendars")
+slot_seconds = 900
+day_seconds = 86400
+max_bitmaps = 32  # Day bitmaps kept
+# Largest UTC offset, so a window in UTC covers every wall-clock time that can fall in it
+_max_offset = 14 * 3600
+_weekdays = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+_vectorized = {"FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY", "WKST"}
+_no_limit = 2 ** 62
+
+_unfold = re.compile(r"\r?\n[ \t]")
+_vevent = re.compile(r"^BEGIN:VEVENT\s*$(.*?)^END:VEVENT\s*$", re.M | re.S)
+_key_line = re.compile(r"^(UID|RECURRENCE-ID)([;:].*)$", re.M)
+_property = re.compile(r'^([A-Za-z0-9-]+)((?:;[A-Za-z0-9-]+=(?:"[^"]*"|[^";:]*)(?:,(?:"[^"]*"|[^";:]*))*)*):(.*)$')
+_parameter = re.compile(r';([A-Za-z0-9-]+)=("[^"]*"|[^";:]*)')
+_duration = re.compile(r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+def calendar_dir(path=None):
+    return path or os.environ.get("GCRES_CALENDAR_DIR") or default_dir
+
+
+# --- Parsing ---
+
+def _zone(tzid):
+    # None = UTC, a tzinfo otherwise
+    if tzid == "UTC":
+        return None
+    if tzid != "local" and ZoneInfo is not None:
+        try:
+            return ZoneInfo(tzid.strip('"'))
+        except (KeyError, ValueError, OSError):
+            pass
+    return _local
+
+
+class _LocalZone:
+    # The process's local time zone, with DST, via the C library
+    def utcoffset(self, dt):
+        ts = calendar.timegm(dt.timetuple())
+        return timedelta(seconds=ts - time.mktime(dt.timetuple()))
+
+
+_local = _LocalZone()
+
+
+def to_utc(wall, tzid):
+    # Wall-clock seconds (a naive time as if it were UTC) in zone tzid -> UTC seconds.
+    # Offsets are looked up once per distinct hour.
+    wall = np.asarray(wall, dtype=np.float64)
+    zone = _zone(tzid)
+    if zone is None or not len(wall):
+        return wall
+    hours, inverse = np.unique(np.floor(wall / 3600), return_inverse=True)
+    offsets = np.array([zone.utcoffset(datetime(1970, 1, 1) + timedelta(hours=h)).total_seconds()
+                        for h in hours.tolist()])
+    return wall - offsets[inverse.reshape(-1)]
+
+
+def _wall(dt):
+    return float(calendar.timegm(dt.timetuple()))
+
+
+def _parse_time(value, params):
+    # (wall seconds, tzid, all_day) of a DATE or DATE-TIME value
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        d = datetime.strptime(value[:8], "%Y%m%d")
+        return _wall(d), "local", True
+    if value.endswith("Z"):
+        return _wall(datetime.strptime(value[:15], "%Y%m%dT%H%M%S")), "UTC", False
+    return _wall(datetime.strptime(value[:15], "%Y%m%dT%H%M%S")), params.get("TZID", "local"), False
+
+
+def _parse_duration(value):
+    m = _duration.match(value.strip())
+    if not m:
+        raise ValueError(f"bad DURATION {value!r}")
+    sign, weeks, days, hours, minutes, seconds = m.groups()
+    total = (int(weeks or 0) * 7 + int(days or 0)) * day_seconds + int(hours or 0) * 3600 + \
+        int(minutes or 0) * 60 + int(seconds or 0)
+    return -total if sign == "-" else total
+
+
+def _unescape(text):
+    return text.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+
+
+def parse_event(block):
+    # One VEVENT body (unfolded) -> dict of the properties the store uses
+    event = {"exdates": []}
+    for line in block.splitlines():
+        m = _property.match(line)
+        if not m:
+            continue
+        name, raw_params, value = m.group(1).upper(), m.group(2), m.group(3)
+        if name == "BEGIN" and value.strip().upper() == "VALARM":
+            break  # Alarms come last and are not needed
+        params = {k.upper(): v.strip('"') for k, v in _parameter.findall(raw_params)}
+        if name in ("DTSTART", "DTEND", "RECURRENCE-ID"):
+            event[name] = _parse_time(value, params)
+        elif name == "EXDATE":
+            event["exdates"].extend(_parse_time(v, params) for v in value.split(",") if v.strip())
+        elif name == "DURATION":
+            event["DURATION"] = _parse_duration(value)
+        elif name == "RRULE":
+            event["RRULE"] = {k.upper(): v for k, v in (p.split("=", 1) for p in value.strip().split(";") if "=" in p)}
+        elif name in ("UID", "LOCATION", "SUMMARY", "STATUS", "TRANSP"):
+            event[name] = _unescape(value.strip())
+    return event
+
+
+def read_events(text):
+    # [(key, block)] of the VEVENTs in an .ics text; key = (UID, RECURRENCE-ID).
+    # An event without a UID is keyed by a hash of its text (and how many
+    # identical ones came before it), so it stays apart from the others.
+    text = _unfold.sub("", text)
+    events = []
+    anonymous = {}
+    for m in _vevent.finditer(text):
+        block = m.group(1)
+        key = {}
+        for name, value in _key_line.findall(block):
+            # UIDs may contain ":" (urn:uuid:...); a RECURRENCE-ID's value follows its parameters
+            key[name] = value[1:].strip() if name == "UID" and value.startswith(":") else value.rsplit(":", 1)[-1].strip()
+        if "UID" not in key:
+            digest = hash(block)
+            anonymous[digest] = anonymous.get(digest, -1) + 1
+            key["UID"] = f"#{digest & 0xffffffffffffffff:016x}/{anonymous[digest]}"
+        events.append(((key["UID"], key.get("RECURRENCE-ID", "")), block))
+    return events
+
+
+# --- Store ---
+
+class CalendarStore:
+    def __init__(self, rooms, directory=None, slot_seconds=slot_seconds):
+        self.rooms = list(rooms)
+        self.index = {room: i for i, room in enumerate(self.rooms)}
+        self.directory = calendar_dir(directory)
+        self.slot_seconds = slot_seconds
+        # Rows: one arithmetic series of occurrences each, see the header
+        self._size = 0
+        cap = 1024
+        self._base = np.zeros(cap)  # Wall-clock start of occurrence 0
+        self._period = np.full(cap, float(day_seconds))
+        self._first = np.zeros(cap, dtype=np.int64)  # First valid m
+        self._rank = np.zeros(cap, dtype=np.int64)  # For COUNT: occurrence index = m * per_week + rank - skipped
+        self._per_week = np.ones(cap, dtype=np.int64)
+        self._skipped = np.zeros(cap, dtype=np.int64)
+        self._count = np.full(cap, _no_limit, dtype=np.int64)
+        self._until = np.full(cap, np.inf)  # UTC
+        self._duration = np.zeros(cap)
+        self._room = np.zeros(cap, dtype=np.int64)
+        self._tz = np.zeros(cap, dtype=np.int64)  # Into self._tzids
+        self._uid = np.zeros(cap, dtype=np.int64)  # Into self._uids, for exclusions
+        self._active = np.zeros(cap, dtype=bool)
+        self._free_rows = []
+        self._rules = {}  # row -> dateutil rule, for rules outside the vectorized subset
+        self._summary = {}  # row -> SUMMARY
+        self._tzids = ["UTC", "local"]
+        self._uids = {}
+        # path -> (mtime_ns, size, {event key: hash}); (path, event key) -> (rows, exclusions)
+        self._files = {}
+        self._events = {}
+        self._exclusions = None  # Sorted uid << 32 | UTC start keys, rebuilt after changes
+        self._bitmaps = OrderedDict()  # (version, day start) -> packed bits
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._stop = threading.Event()
+        self._watcher = None
+        self.version = 0
+        self.last_sync = {}
+
+    def add_listener(self, fn):
+        # fn(store) is called after a sync that changed something, outside the lock
+        self._listeners.append(fn)
+
+    @property
+    def events(self):
+        return len(self._events)
+
+    @property
+    def files(self):
+        return len(self._files)
+
+    # --- Sync ---
+
+    @timed("calendar sync")
+    def sync(self):
+        # Re-read changed, new and removed .ics files; returns what changed
+        start = time.perf_counter()
+        stats = {"files": 0, "files_read": 0, "added": 0, "changed": 0, "removed": 0}
+        paths = sorted(glob.glob(os.path.join(self.directory, "**", "*.ics"), recursive=True))
+        with self._lock:
+            seen = set()
+            for path in paths:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue  # Removed while scanning
+                seen.add(path)
+                stats["files"] += 1
+                known = self._files.get(path)
+                if known is not None and known[:2] == (st.st_mtime_ns, st.st_size):
+                    continue
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    text = f.read()
+                stats["files_read"] += 1
+                self._sync_file(path, text, st, stats)
+            for path in set(self._files) - seen:
+                for key in self._files.pop(path)[2]:
+                    self._drop(path, key)
+                    stats["removed"] += 1
+            changed = stats["added"] or stats["changed"] or stats["removed"]
+            if changed:
+                self.version += 1
+                self._exclusions = None
+                self._bitmaps.clear()
+        stats["seconds"] = time.perf_counter() - start
+        self.last_sync = stats
+        if changed:
+            for fn in self._listeners:
+                fn(self)
+        return stats
+
+    def _sync_file(self, path, text, st, stats):
+        old = self._files[path][2] if path in self._files else {}
+        new = {}
+        stem = os.path.splitext(os.path.basename(path))[0]
+        for key, block in read_events(text):
+            digest = hash(block)
+            new[key] = digest
+            if old.get(key) == digest:
+                continue
+            stats["changed" if key in old else "added"] += 1
+            self._drop(path, key)
+            try:
+                event = parse_event(block)
+                event.setdefault("UID", key[0])  # Own EXDATEs only, not those of other UID-less events
+                self._events[path, key] = self._compile(event, stem)
+            except (ValueError, KeyError):
+                self._events[path, key] = ([], [])  # Malformed event: skipped, kept so it isn't retried
+        for key in set(old) - set(new):
+            self._drop(path, key)
+            stats["removed"] += 1
+        self._files[path] = (st.st_mtime_ns, st.st_size, new)
+
+    def _drop(self, path, key):
+        rows, _ = self._events.pop((path, key), ([], []))
+        for row in rows:
+            self._active[row] = False
+            self._rules.pop(row, None)
+            self._summary.pop(row, None)
+            self._free_rows.append(row)
+
+    def _new_row(self):
+        if self._free_rows:
+            return self._free_rows.pop()
+        if self._size == len(self._base):
+            for name in ("_base", "_period", "_first", "_rank", "_per_week", "_skipped", "_count", "_until",
+                         "_duration", "_room", "_tz", "_uid", "_active"):
+                arr = getattr(self, name)
+                grown = np.empty(2 * len(arr), dtype=arr.dtype)
+                grown[:len(arr)] = arr
+                setattr(self, name, grown)
+        self._size += 1
+        return self._size - 1
+
+    def _tz_id(self, tzid):
+        if tzid not in self._tzids:
+            self._tzids.append(tzid)
+        return self._tzids.index(tzid)
+
+    def _uid_id(self, uid):
+        return self._uids.setdefault(uid, len(self._uids))
+
+    def _rooms_of(self, event, stem):
+        location = event.get("LOCATION", "").strip()
+        if location in self.index:
+            return [self.index[location]]
+        parts = [p.strip() for p in re.split(r"[;,]", location) if p.strip() in self.index]
+        if parts:
+            return [self.index[p] for p in parts]
+        if stem in self.index:
+            return [self.index[stem]]
+        return []
+
+    def _compile(self, event, stem):
+        # Parsed event -> (rows, exclusions)
+        uid = self._uid_id(event.get("UID", ""))
+        exclusions = []
+        if "RECURRENCE-ID" in event:
+            # Moves or cancels one occurrence of the series
+            wall, tzid, _ = event["RECURRENCE-ID"]
+            exclusions.append((uid, int(round(to_utc([wall], tzid)[0]))))
+        exclusions += [(uid, int(round(to_utc([wall], tzid)[0]))) for wall, tzid, _ in event["exdates"]]
+        if "RECURRENCE-ID" in event:
+            # The replacement occurrence must not match the series' exclusion
+            uid = self._uid_id((event.get("UID", ""), exclusions[0][1]))
+        rooms = self._rooms_of(event, stem)
+        if (not rooms or event.get("STATUS", "").upper() == "CANCELLED"
+                or event.get("TRANSP", "").upper() == "TRANSPARENT" or "DTSTART" not in event):
+            return [], exclusions
+        start, tzid, all_day = event["DTSTART"]
+        if "DTEND" in event:
+            end_wall, end_tz, _ = event["DTEND"]
+            duration = to_utc([end_wall], end_tz)[0] - to_utc([start], tzid)[0]
+        else:
+            duration = event.get("DURATION", day_seconds if all_day else 0)
+        if duration <= 0:
+            return [], exclusions
+        series = self._series(start, event.get("RRULE"))
+        until = np.inf
+        rule = event.get("RRULE") or {}
+        if "UNTIL" in rule:
+            wall, until_tz, _ = _parse_time(rule["UNTIL"], {})
+            until = to_utc([wall + (day_seconds - 1 if len(rule["UNTIL"].strip()) == 8 else 0)],
+                           tzid if until_tz == "local" else until_tz)[0]
+        rows = []
+        for room in rooms:
+            for base, period, first, rank, per_week, skipped, count in series or [(start, day_seconds, 0, 0, 1, 0, 1)]:
+                row = self._new_row()
+                self._base[row], self._period[row], self._first[row] = base, period, first
+                self._rank[row], self._per_week[row], self._skipped[row] = rank, per_week, skipped
+                self._count[row], self._until[row], self._duration[row] = count, until, duration
+                self._room[row], self._tz[row], self._uid[row] = room, self._tz_id(tzid), uid
+                self._active[row] = True
+                if series is None and rule:
+                    # Outside the vectorized subset: dateutil expands it per query, UNTIL applied here
+                    from dateutil.rrule import rrulestr
+
+                    text = ";".join(f"{k}={v}" for k, v in rule.items() if k != "UNTIL")
+                    self._rules[row] = rrulestr(text, dtstart=datetime(1970, 1, 1) + timedelta(seconds=start))
+                    self._count[row] = _no_limit
+                self._summary[row] = event.get("SUMMARY", "")
+                rows.append(row)
+        return rows, exclusions
+
+    @staticmethod
+    def _series(start, rule):
+        # Arithmetic series rows (base, period, first m, rank, per_week,
+        # skipped, count) for a DAILY / WEEKLY rule, [] for no rule, None when
+        # dateutil has to expand it
+        if not rule:
+            return []
+        freq = rule.get("FREQ", "").upper()
+        interval = int(rule.get("INTERVAL", 1))
+        count = int(rule["COUNT"]) if "COUNT" in rule else _no_limit
+        days = [d.strip().upper() for d in rule.get("BYDAY", "").split(",") if d.strip()]
+        if set(rule) - _vectorized or any(d not in _weekdays for d in days) or interval < 1:
+            return None
+        day = int(start // day_seconds)
+        tod = start - day * day_seconds
+        if freq == "DAILY" and not days:
+            return [(start, interval * day_seconds, 0, 0, 1, 0, count)]
+        if freq == "DAILY" and interval != 1:
+            return None
+        if freq not in ("DAILY", "WEEKLY"):
+            return None
+        # Weekly (or daily on some weekdays): one series per weekday, offsets from WKST
+        wkst = _weekdays.get(rule.get("WKST", "MO").upper(), 0)
+        weekday = (day + 3) % 7  # 1970-01-01 was a Thursday
+        d_start = (weekday - wkst) % 7
+        week0 = day - d_start
+        offsets = sorted({(_weekdays[d] - wkst) % 7 for d in days} or {d_start})
+        skipped = sum(d < d_start for d in offsets)
+        period = 7 * (interval if freq == "WEEKLY" else 1) * day_seconds
+        return [((week0 + d) * day_seconds + tod, period, 0 if d >= d_start else 1, rank, len(offsets), skipped, count)
+                for rank, d in enumerate(offsets)]
+
+    # --- Queries ---
+
+    def _exclusion_keys(self):
+        if self._exclusions is None:
+            keys = [(uid << 32) | ts for rows, exclusions in self._events.values() for uid, ts in exclusions]
+            self._exclusions = np.unique(np.array(keys, dtype=np.int64))
+        return self._exclusions
+
+    @timed("calendar expand")
+    def occurrences(self, start, end):
+        # Occurrences overlapping [start, end) (datetimes or epoch seconds) as
+        # arrays (row, room index, UTC start, UTC end)
+        start, end = _ts(start), _ts(end)
+        with self._lock:
+            n = self._size
+            active = self._active[:n] & (self._until[:n] >= start - self._duration[:n])
+            vector = active.copy()
+            for row in self._rules:
+                vector[row] = False
+            rows = np.flatnonzero(vector)
+            base, period = self._base[rows], self._period[rows]
+            duration = self._duration[rows]
+            # m range from the window, in wall-clock time with the largest offset as slack
+            lo = np.ceil((start - _max_offset - duration - base) / period)
+            hi = np.floor((end + _max_offset - base) / period)
+            lo = np.maximum(lo, self._first[rows])
+            # COUNT: m * per_week + rank - skipped < count
+            per_week, rank, skipped = self._per_week[rows], self._rank[rows], self._skipped[rows]
+            hi = np.minimum(hi, (self._count[rows] - 1 - rank + skipped) // per_week)
+            counts = np.maximum(hi - lo + 1, 0).astype(np.int64)
+            occ_rows = np.repeat(rows, counts)
+            within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            wall = self._base[occ_rows] + (np.repeat(lo, counts) + within) * self._period[occ_rows]
+            fallback = [(row, rule) for row, rule in self._rules.items() if active[row]]
+            if fallback:
+                lo_dt = datetime(1970, 1, 1) + timedelta(seconds=start - _max_offset - float(self._duration[:n].max()))
+                hi_dt = datetime(1970, 1, 1) + timedelta(seconds=end + _max_offset)
+                extra_rows, extra_wall = [], []
+                for row, rule in fallback:
+                    for dt in rule.between(lo_dt, hi_dt, inc=True):
+                        extra_rows.append(row)
+                        extra_wall.append(_wall(dt))
+                occ_rows = np.concatenate([occ_rows, np.array(extra_rows, dtype=np.int64)])
+                wall = np.concatenate([wall, np.array(extra_wall)])
+            # Wall clock -> UTC, one pass per time zone
+            utc = np.empty(len(wall))
+            tz = self._tz[occ_rows]
+            for t in np.unique(tz).tolist():
+                sel = tz == t
+                utc[sel] = to_utc(wall[sel], self._tzids[t])
+            ends = utc + self._duration[occ_rows]
+            keep = (utc < end) & (ends > start) & (utc <= self._until[occ_rows])
+            excluded = self._exclusion_keys()
+            if len(excluded):
+                keys = (self._uid[occ_rows] << 32) | np.round(utc).astype(np.int64)
+                keep &= ~np.isin(keys, excluded)
+            occ_rows, utc, ends = occ_rows[keep], utc[keep], ends[keep]
+            return occ_rows, self._room[occ_rows], utc, ends
+
+    def _day_bitmap(self, day_start, day_end):
+        key = (self.version, day_start)
+        bits = self._bitmaps.get(key)
+        if bits is not None:
+            self._bitmaps.move_to_end(key)
+            return bits
+        slots = int(np.ceil((day_end - day_start) / self.slot_seconds))
+        _, rooms, s, e = self.occurrences(day_start, day_end)
+        first = np.clip(np.floor((s - day_start) / self.slot_seconds), 0, slots).astype(np.int64)
+        last = np.clip(np.ceil((e - day_start) / self.slot_seconds), 0, slots).astype(np.int64)
+        # Difference array per room: +1 where a busy run starts, -1 after it ends
+        diff = np.zeros((len(self.rooms), slots + 1), dtype=np.int32)
+        np.add.at(diff, (rooms, first), 1)
+        np.add.at(diff, (rooms, last), -1)
+        bits = np.packbits(np.cumsum(diff[:, :-1], axis=1) > 0, axis=1)
+        with self._lock:
+            self._bitmaps[key] = bits
+            while len(self._bitmaps) > max_bitmaps:
+                self._bitmaps.popitem(last=False)
+        return bits
+
+    def bitmap(self, day):
+        # Free/busy bits of every room for one local day: (rooms, ceil(slots / 8))
+        # uint8, bit k of a row set = slot k busy
+        start = datetime.combine(day, datetime.min.time())
+        return self._day_bitmap(start.timestamp(), (start + timedelta(days=1)).timestamp())
+
+    def busy(self, start, end):
+        # Bool per room: any busy slot in [start, end)
+        start, end = _ts(start), _ts(end)
+        busy = np.zeros(len(self.rooms), dtype=bool)
+        day = datetime.fromtimestamp(start).date()
+        while True:
+            day_start = datetime.combine(day, datetime.min.time()).timestamp()
+            if day_start >= end:
+                break
+            day_end = datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
+            bits = self._day_bitmap(day_start, day_end)
+            a = int((max(start, day_start) - day_start) // self.slot_seconds)
+            b = int(np.ceil((min(end, day_end) - day_start) / self.slot_seconds))
+            if b > a:
+                busy |= np.unpackbits(bits, axis=1, count=b)[:, a:].any(axis=1)
+            day += timedelta(days=1)
+        return busy
+
+    def busy_rooms(self, start, end):
+        return [self.rooms[i] for i in np.flatnonzero(self.busy(start, end))]
+
+    def agenda(self, start, end, limit=50):
+        # Occurrences in [start, end) as dicts, earliest first, for display
+        rows, rooms, s, e = self.occurrences(start, end)
+        order = np.argsort(s, kind="stable")[:limit]
+        return [{"room": self.rooms[rooms[i]], "summary": self._summary.get(int(rows[i]), ""),
+                 "start": datetime.fromtimestamp(s[i]), "end": datetime.fromtimestamp(e[i])} for i in order]
+
+    # --- Background sync ---
+
+    def watch(self, interval=30.0):
+        # Sync every `interval` seconds in a daemon thread until close()
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.sync()
+                except OSError:
+                    pass  # Directory unavailable for now; try again next time
+
+        self._watcher = threading.Thread(target=run, name="gcres-calendars", daemon=True)
+        self._watcher.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+
+
+def _ts(value):
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time()).timestamp()
+    return float(value)
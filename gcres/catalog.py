@@ -0,0 +1,189 @@
+# Room catalog stored in a local SQLite file.
+#
+# All pages read their room table from here instead of rebuilding dict literals.
+# Swap in another catalog by pointing GCRES_CATALOG at a different file (or by
+# importing one with `python -m gcres.catalog --import rooms.csv`); the pages
+# pick it up on the next rerun because the cache is keyed on the file version.
+
+import argparse
+import os
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+default_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "rooms.sqlite")
+table = "rooms"
+buildings_table = "buildings"
+
+# Building coordinates (example data: the ODC towers), used to seed a missing catalog file
+sample_buildings = {
+    "Building": ["Tower 6", "Tower 4", "Tower 1"],
+    "lat": [28.538549259883805, 28.538605811289006, 28.536188944142335],
+    "lon": [77.33857400717758, 77.34124548735039, 77.34400457694633],
+}
+
+# Room attributes (example data), used to seed a missing catalog file
+sample_rooms = {
+    "Room": ["Room A", "Room B", "Room C"],
+    "Building": ["Tower 6", "Tower 4", "Tower 1"],
+    "Occupancy Suitability": [5, 3, 4],
+    "Natural Lighting": [4, 2, 5],
+    "Energy Efficiency": [3, 5, 4],
+    "AV/Tech Availability": [5, 4, 3],
+    "Noise Isolation": [4, 3, 4],
+    "Proximity to Team Zone": [3, 4, 2],
+    "Availability": [3, 5, 4],  # Baseline availability score
+    "lat": [28.5385, 28.5386, 28.5361],
+    "lon": [77.3385, 77.3412, 77.3440],
+    "Capacity": [8, 12, 6],
+    "Floor": [2, 3, 1],
+    "Quiet": [1, 0, 1],
+    "Projector": [1, 1, 0],
+}
+
+# Values used when a catalog file lacks a column, so older or third-party
+# catalogs keep working as the schema grows
+column_defaults = {
+    "Building": "",
+    "Occupancy Suitability": 3,
+    "Natural Lighting": 3,
+    "Energy Efficiency": 3,
+    "AV/Tech Availability": 3,
+    "Noise Isolation": 3,
+    "Proximity to Team Zone": 3,
+    "Availability": 3,
+    "lat": float("nan"),
+    "lon": float("nan"),
+    "Capacity": 8,
+    "Floor": 0,
+}
+
+# Columns derived from other attributes when missing
+derived_defaults = {
+    "Quiet": lambda df: (df["Noise Isolation"] >= 4).astype(int),
+    "Projector": lambda df: (df["AV/Tech Availability"] >= 4).astype(int),
+}
+
+
+def catalog_path(path=None):
+    return path or os.environ.get("GCRES_CATALOG") or default_path
+
+
+def catalog_version(path=None):
+    # Changes whenever the file is rewritten; used as the cache key
+    path = catalog_path(path)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def write_catalog(df, path=None, buildings=None):
+    path = catalog_path(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    with closing(sqlite3.connect(tmp)) as conn:
+        df.to_sql(table, conn, index=False)
+        conn.execute(f'CREATE UNIQUE INDEX idx_{table}_room ON {table} ("Room")')
+        if buildings is not None:
+            buildings.to_sql(buildings_table, conn, index=False)
+        conn.commit()
+    # Atomic swap so readers never see a half-written catalog
+    os.replace(tmp, path)
+    return path
+
+
+def ensure_catalog(path=None):
+    # Seed the sample rooms when no catalog file exists yet
+    path = catalog_path(path)
+    if not os.path.exists(path):
+        write_sample_catalog(path)
+    return path
+
+
+def write_sample_catalog(path=None):
+    return write_catalog(pd.DataFrame(sample_rooms), path, buildings=pd.DataFrame(sample_buildings))
+
+
+def read_catalog(path=None):
+    path = ensure_catalog(path)
+    with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as conn:
+        df = pd.read_sql_query(f"SELECT * FROM {table}", conn)
+        has_buildings = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                     (buildings_table,)).fetchone()
+        buildings = pd.read_sql_query(f"SELECT * FROM {buildings_table}", conn) if has_buildings else None
+    for col, value in column_defaults.items():
+        if col not in df.columns:
+            df[col] = value
+    for col, derive in derived_defaults.items():
+        if col not in df.columns:
+            df[col] = derive(df)
+    if buildings is None:
+        # No building table: locate each building at the centre of its rooms
+        buildings = df[df["Building"] != ""].groupby("Building", as_index=False)[["lat", "lon"]].mean()
+    else:
+        # Rooms without their own coordinates are placed at their building
+        located = df.merge(buildings[["Building", "lat", "lon"]], on="Building", how="left", suffixes=("", "_building"))
+        df["lat"] = df["lat"].fillna(located["lat_building"])
+        df["lon"] = df["lon"].fillna(located["lon_building"])
+    return df, buildings
+
+
+class Catalog:
+    # A loaded catalog plus the file version it was read from
+    def __init__(self, rooms, buildings, version, path):
+        self.rooms = rooms
+        self.buildings = buildings
+        self.version = version
+        self.path = path
+
+    @property
+    def names(self):
+        return self.rooms["Room"].tolist()
+
+    def __len__(self):
+        return len(self.rooms)
+
+
+def load_catalog(path=None):
+    path = catalog_path(path)
+    rooms, buildings = read_catalog(path)
+    return Catalog(rooms, buildings, catalog_version(path), path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the room catalog file.")
+    parser.add_argument("--path", help="catalog file (default: $GCRES_CATALOG or data/rooms.sqlite)")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--import", dest="source", help="replace the catalog with a CSV or Parquet file")
+    parser.add_argument("--buildings", help="with --import: CSV or Parquet file of Building, lat, lon")
+    group.add_argument("--sample", action="store_true", help="reset the catalog to the sample rooms")
+    group.add_argument("--info", action="store_true", help="print the catalog size and version")
+    group.add_argument("--synthetic", type=int, metavar="ROOMS", help="replace the catalog with a generated facility")
+    parser.add_argument("--synthetic-buildings", type=int, default=5, help="with --synthetic: number of buildings")
+    parser.add_argument("--floors", type=int, default=10, help="with --synthetic: floors per building")
+    parser.add_argument("--seed", type=int, default=0, help="with --synthetic: random seed")
+    args = parser.parse_args(argv)
+
+    def read(source):
+        return pd.read_parquet(source) if source.endswith(".parquet") else pd.read_csv(source)
+
+    if args.source:
+        write_catalog(read(args.source), args.path, buildings=read(args.buildings) if args.buildings else None)
+    elif args.sample:
+        write_sample_catalog(args.path)
+    elif args.synthetic:
+        from gcres.synthetic import generate_facility
+
+        rooms, buildings = generate_facility(args.synthetic_buildings, args.floors, args.synthetic, seed=args.seed)
+        write_catalog(rooms, args.path, buildings=buildings)
+    catalog = load_catalog(args.path)
+    print(f"{catalog.path}: {len(catalog)} rooms, version {catalog.version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# Chart rendering shared by the pages.
+#
+# Pages used to call plt.subplots + st.pyplot on every rerun and never close the
+# figures, so they piled up in pyplot's registry. Here matplotlib figures are
+# created outside pyplot, one per chart shape, reused for every render, and
+# the resulting PNG is kept in the shared result cache under a hash of the
+# plotted data, so every session reuses it. For many rooms the
+# charts switch to Streamlit's native (Vega-Lite) charts, drawn by the browser.
+
+import io
+import threading
+
+import numpy as np
+import pandas as pd
+
+from gcres.cache import data_key, results
+from gcres.profiling import stage
+
+# Above this many bars the native Streamlit backend is used
+vega_threshold = 50
+
+_figures = {}  # (kind, figsize) -> (Figure, Axes)
+_lock = threading.Lock()  # matplotlib is not thread-safe, Streamlit runs sessions in threads
+
+
+def _axes(kind, figsize):
+    from matplotlib.figure import Figure
+
+    if (kind, figsize) not in _figures:
+        fig = Figure(figsize=figsize)
+        _figures[kind, figsize] = (fig, fig.add_subplot())
+    fig, ax = _figures[kind, figsize]
+    ax.clear()
+    return fig, ax
+
+
+def _png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight", dpi=100)
+    return buf.getvalue()
+
+
+def _cached(key, draw):
+    def locked_draw():
+        with _lock, stage("chart render"):
+            return draw()
+
+    return results.get_or_compute("chart", key, locked_draw)
+
+
+def render_bar(labels, values, ylabel, title, color, figsize=(4, 3)):
+    labels, values = list(labels), np.asarray(values)
+
+    def draw():
+        fig, ax = _axes("bar", figsize)
+        ax.bar(labels, values, color=color)
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        return _png(fig)
+
+    return _cached(data_key("bar", labels, values, ylabel, title, color, figsize), draw)
+
+
+def render_band(times, low, mean, high, ylabel, title, figsize=(8, 3)):
+    times, low, mean, high = (np.asarray(a) for a in (times, low, mean, high))
+
+    def draw():
+        fig, ax = _axes("band", figsize)
+        ax.fill_between(times, low, high, color='skyblue', alpha=0.4, label="min–max")
+        ax.plot(times, mean, color='steelblue', label="mean")
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        ax.legend(loc="upper left")
+        for label in ax.get_xticklabels():
+            label.set_rotation(30)
+            label.set_horizontalalignment("right")
+        return _png(fig)
+
+    return _cached(data_key("band", times, low, mean, high, ylabel, title, figsize), draw)
+
+
+def _hex(color):
+    from matplotlib.colors import to_hex
+
+    return to_hex(color)
+
+
+def bar_chart(container, labels, values, ylabel, title, color, backend=None):
+    # Draw a bar chart into a Streamlit container (st, a column, a tab...)
+    if backend is None:
+        backend = "vega" if len(labels) > vega_threshold else "matplotlib"
+    if backend == "vega":
+        container.markdown(f"**{title}**")
+        container.bar_chart(pd.DataFrame({ylabel: np.asarray(values)}, index=list(labels)), y=ylabel, color=_hex(color))
+    else:
+        container.image(render_bar(labels, values, ylabel, title, color))
+
+
+def band_chart(container, times, low, mean, high, ylabel, title, backend="matplotlib"):
+    # Mean line with a min–max band; times are datetimes
+    if backend == "vega":
+        container.markdown(f"**{title}**")
+        container.line_chart(pd.DataFrame({"min": low, "mean": mean, "max": high}, index=times))
+    else:
+        container.image(render_band(times, low, mean, high, ylabel, title))
+
+
+def cache_info():
+    info = results.stats().get("chart", {"entries": 0, "bytes": 0, "hits": 0, "misses": 0})
+    return {"images": info["entries"], "bytes": info["bytes"], "figures": len(_figures),
+            "hits": info["hits"], "misses": info["misses"]}
@@ -0,0 +1,63 @@
+# Client for gcres.service with the same score / recommend / availability / assign calls
+# as an in-process Engine, so a page can use either (see resources.get_service).
+
+import json
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+
+class ServiceError(RuntimeError):
+    pass
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "tolist"):  # NumPy scalars and arrays
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class ServiceClient:
+    def __init__(self, url, timeout=10.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _post(self, endpoint, payload):
+        body = json.dumps(payload, default=_default).encode()
+        request = urllib.request.Request(f"{self.url}/{endpoint}", data=body,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.load(e).get("error", e.reason)
+            except ValueError:
+                message = e.reason
+            if e.code == 400:
+                raise ValueError(message) from e
+            raise ServiceError(f"{endpoint}: {message}") from e
+        except urllib.error.URLError as e:
+            raise ServiceError(f"{self.url} unreachable: {e.reason}") from e
+
+    def score(self, weights=None, start=None, end=None, k=50, rooms=None):
+        return self._post("score", {"weights": weights, "start": start, "end": end, "k": k, "rooms": rooms})
+
+    def recommend(self, preferences=None, k=5):
+        return self._post("recommend", {"preferences": preferences, "k": k})
+
+    def availability(self, start=None, end=None, rooms=None, free_only=False):
+        return self._post("availability", {"start": start, "end": end, "rooms": rooms, "free_only": free_only})
+
+    def assign(self, requests, method="auto"):
+        return self._post("assign", {"requests": requests, "method": method})
+
+    def batch(self, endpoint, requests):
+        # Many requests to one endpoint in a single round trip
+        return self._post(endpoint, list(requests))
+
+    def health(self):
+        with urllib.request.urlopen(f"{self.url}/health", timeout=self.timeout) as response:
+            return json.load(response)
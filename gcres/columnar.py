@@ -0,0 +1,102 @@
+# Compact columnar representation of room attributes and sensor snapshots.
+#
+# Rooms are addressed by integer id (their position in the catalog), names are
+# a pandas Categorical, and metrics live in small NumPy dtypes (float32
+# temperatures, int16 occupancy and ratings). Pages get DataFrames that wrap
+# these arrays without copying, and a snapshot joins to the room table by
+# position, so no per-row dict lookups or lambdas are needed.
+
+import numpy as np
+import pandas as pd
+
+missing_occupancy = -1  # int16 has no NaN; marks rooms without a reading
+
+
+def _compact(values):
+    values = np.asarray(values)
+    if values.dtype.kind in "iub":
+        lo, hi = (int(values.min()), int(values.max())) if len(values) else (0, 0)
+        for dtype in (np.int8, np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if info.min <= lo and hi <= info.max:
+                return values.astype(dtype)
+        return values.astype(np.int64)
+    if values.dtype.kind == "f":
+        return values.astype(np.float32)
+    return values
+
+
+class RoomTable:
+    # Static room attributes, one compact array per column
+    def __init__(self, rooms, keep_float64=("lat", "lon")):
+        self.names = pd.Categorical(rooms["Room"])
+        self.ids = np.arange(len(rooms), dtype=np.int32)
+        self.position = {room: i for i, room in enumerate(rooms["Room"])}
+        self.columns = {}
+        for col in rooms.columns:
+            if col == "Room":
+                continue
+            values = rooms[col].to_numpy()
+            if values.dtype == object:
+                self.columns[col] = pd.Categorical(values)  # e.g. Building
+            elif col in keep_float64:
+                self.columns[col] = values.astype(np.float64)  # float32 would cost metres of precision
+            else:
+                self.columns[col] = _compact(values)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def frame(self, columns=None, rows=None):
+        # DataFrame view over the arrays (copied only when rows are selected)
+        columns = list(self.columns) if columns is None else list(columns)
+        data = {"Room": self.names}
+        data.update((col, self.columns[col]) for col in columns)
+        if rows is not None:
+            data = {col: values[rows] for col, values in data.items()}
+        return pd.DataFrame(data, copy=False)
+
+    @property
+    def nbytes(self):
+        total = self.ids.nbytes + self.names.codes.nbytes + sum(len(c) for c in self.names.categories)
+        for values in self.columns.values():
+            total += values.codes.nbytes if isinstance(values, pd.Categorical) else values.nbytes
+        return total
+
+
+class SensorSnapshot:
+    # Latest temperature / occupancy per room id, aligned with a RoomTable
+    def __init__(self, temp, occupancy, version=0):
+        self.temp = np.asarray(temp, dtype=np.float32)
+        occupancy = np.asarray(occupancy, dtype=np.float32)
+        self.reported = ~(np.isnan(self.temp) | np.isnan(occupancy))
+        self.occupancy = np.where(np.isnan(occupancy), missing_occupancy, np.round(occupancy)).astype(np.int16)
+        self.temp = np.round(self.temp, 1)
+        self.version = version
+
+    @classmethod
+    def from_store(cls, store):
+        latest, version = store.latest_arrays()
+        return cls(latest["temp"], latest["occupancy"], version)
+
+    def __len__(self):
+        return len(self.temp)
+
+    def frame(self, table, columns=(), reported_only=True, names=("temp", "occupancy")):
+        # Room attributes joined with the readings by position; `names` sets the
+        # reading column names, e.g. ("HVAC Temp", "Current Occupancy")
+        rows = np.flatnonzero(self.reported) if reported_only else None
+        df = table.frame(columns, rows=rows)
+        temp, occupancy = (self.temp, self.occupancy) if rows is None else (self.temp[rows], self.occupancy[rows])
+        df[names[0]] = temp
+        df[names[1]] = occupancy
+        return df
+
+    def as_dict(self, table):
+        # The nested {"Room A": {"temp": ..., "occupancy": ...}} form, for JSON output
+        rows = np.flatnonzero(self.reported)
+        return {table.names[i]: {"temp": round(float(self.temp[i]), 1), "occupancy": int(self.occupancy[i])} for i in rows}
+
+    @property
+    def nbytes(self):
+        return self.temp.nbytes + self.occupancy.nbytes + self.reported.nbytes
@@ -0,0 +1,450 @@
+# Headless room-selection engine: the state and logic behind the pages,
+# without Streamlit.
+#
+# An Engine owns the catalog and everything derived from it (indexes, sensor
+# ingestion, bookings, room calendars, the knowledge base) for as long as the
+# process lives, and answers the questions other systems ask:
+#
+#   score(weights, start, end, k)      rooms ranked for a meeting
+#   recommend(preferences, k)          best rooms matching preferences
+#   availability(start, end, rooms)    how free each room is in a window
+#   assign(requests)                   one room each for a batch of meetings
+#
+# Derived state is built on first use and rebuilt when the catalog file
+# changes. Results are plain JSON-able dicts, so the same calls work in-process
+# (the Streamlit pages) and over HTTP (gcres.service). Times may be datetimes,
+# ISO 8601 strings or epoch seconds.
+
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from gcres.agents import Orchestrator
+from gcres.alerts import AlertEngine
+from gcres.assignment import BatchAssigner, summarize
+from gcres.bookings import BookingStore, seed_demo_bookings
+from gcres.cache import cached, data_key
+from gcres.calendars import CalendarStore
+from gcres.catalog import catalog_path, catalog_version, ensure_catalog, load_catalog
+from gcres.columnar import RoomTable, SensorSnapshot
+from gcres.forecast import DemandModel
+from gcres.history import HistoryStore
+from gcres.incremental import IncrementalScorer
+from gcres.ingest import Ingestor, SensorStore, SimulatedSource, feed_source
+from gcres.knowledge import KnowledgeBase
+from gcres.preferences import PreferenceModel, preferences_path
+from gcres.profiling import stage
+from gcres.scoring import DYNAMIC_CRITERIA, default_weights, rank_rooms, static_criteria
+from gcres.search import RoomIndex
+from gcres.spatial import GridIndex
+from gcres.timeseries import Rollups
+
+# Length of the meeting assumed when a request gives no end time
+default_duration = timedelta(hours=1)
+# Live incremental scorers kept per catalog version, one per (weights, window)
+max_scorers = 8
+# Sensor history on disk: finished days are averaged per minute and kept 90 days
+history_resolution = 60.0
+history_retention_days = 90
+# Days of history the demand forecast is fitted on
+demand_days = 28
+# Seconds between checks of the calendar directory for changed .ics files
+calendar_sync_seconds = 30.0
+
+
+def as_datetime(value, default=None):
+    if value is None:
+        return default
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    try:
+        return datetime.fromtimestamp(float(value))
+    except (OverflowError, OSError) as e:
+        raise ValueError(f"timestamp out of range: {value!r}") from e
+
+
+def meeting_window(start=None, end=None):
+    # (start, end) datetimes; start defaults to the current minute
+    start = as_datetime(start, datetime.now().replace(second=0, microsecond=0))
+    end = as_datetime(end, start + default_duration)
+    if end <= start:
+        raise ValueError("end must be after start")
+    return start, end
+
+
+class _Sensors:
+    # Everything fed by the ingestion thread for one catalog version
+    def __init__(self, ingestor, rollups, history, alerts):
+        self.ingestor = ingestor
+        self.store = ingestor.store
+        self.rollups = rollups
+        self.history = history
+        self.alerts = alerts
+
+
+class Engine:
+    def __init__(self, path=None, sensor_feed=None, history_dir=None, calendar_dir=None):
+        self.path = catalog_path(path)
+        # A JSON-lines feed of readings (file or tcp://host:port); without one readings are simulated
+        self.sensor_feed = sensor_feed if sensor_feed is not None else os.environ.get("GCRES_SENSOR_FEED")
+        # Readings are kept on disk unless GCRES_HISTORY=0
+        self.history_dir = history_dir
+        self.keep_history = os.environ.get("GCRES_HISTORY", "1") != "0"
+        # .ics exports of the room calendars, $GCRES_CALENDAR_DIR or data/calendars
+        self.calendar_dir = calendar_dir
+        self.kb = KnowledgeBase()
+        self.orchestrator = Orchestrator(kb=self.kb)
+        self._lock = threading.RLock()
+        self._version = None
+        self._parts = {}
+
+    # --- State, one set per catalog version ---
+
+    def _part(self, name, build):
+        version = catalog_version(ensure_catalog(self.path))
+        parts = self._parts
+        if self._version == version and name in parts:
+            return parts[name]
+        with self._lock:
+            if self._version != version:
+                self._reset(version)
+            if name not in self._parts:
+                self._parts[name] = build()
+            return self._parts[name]
+
+    def _reset(self, version):
+        # The catalog file changed: drop everything built from the old one
+        sensors = self._parts.get("sensors")
+        if sensors is not None:
+            sensors.ingestor.stop()
+        preferences = self._parts.get("preferences")
+        if preferences is not None:
+            preferences.save()
+        calendars = self._parts.get("calendars")
+        if calendars is not None:
+            calendars.close()
+        self._parts = {}
+        self._version = version
+
+    def close(self):
+        with self._lock:
+            self._reset(None)
+
+    def _load_catalog(self):
+        catalog = load_catalog(self.path)
+        self.kb.update("available_rooms", catalog.names)
+        return catalog
+
+    def _start_ingestion(self):
+        rooms = self.catalog.names
+        store = SensorStore(rooms)
+        rollups = Rollups(rooms)
+        store.add_listener(rollups.add)
+        history = None
+        if self.keep_history:
+            history = HistoryStore(self.history_dir, rooms, retention_days=history_retention_days,
+                                   resolution=history_resolution, auto_compact=True)
+            store.add_listener(history.append)
+        alerts = AlertEngine(rooms, self.catalog.rooms["Capacity"])
+
+        def check_alerts(readings):
+            alerts.process(readings)
+            if self.kb.get("alerts_version") != alerts.version:
+                self.kb.update("alerts_version", alerts.version)
+
+        store.add_listener(check_alerts)
+        self.kb.update("alerts_version", alerts.version)
+        store.add_listener(lambda readings: self.kb.update("sensor_version", store.version))
+        source = feed_source(self.sensor_feed) if self.sensor_feed else SimulatedSource(rooms)
+        ingestor = Ingestor(store, source).start(prime=not self.sensor_feed)
+        return _Sensors(ingestor, rollups, history, alerts)
+
+    def _booking_store(self):
+        store = BookingStore(self.catalog.names)
+        store.add_listener(lambda store: self.kb.update("bookings_version", store.version))
+        # No booking backend yet: start from reproducible demo meetings
+        seed_demo_bookings(store)
+        return store
+
+    @property
+    def catalog(self):
+        # Shared: copy catalog.rooms before mutating it
+        return self._part("catalog", self._load_catalog)
+
+    @property
+    def ingestor(self):
+        return self._part("sensors", self._start_ingestion).ingestor
+
+    @property
+    def sensor_store(self):
+        # Latest readings and short history for every catalog room
+        return self._part("sensors", self._start_ingestion).store
+
+    @property
+    def rollups(self):
+        # 1-minute / 15-minute / hourly min/mean/max per room, updated on ingest
+        return self._part("sensors", self._start_ingestion).rollups
+
+    @property
+    def history(self):
+        # Every ingested reading on disk (gcres.history), None when GCRES_HISTORY=0
+        return self._part("sensors", self._start_ingestion).history
+
+    @property
+    def alerts(self):
+        # Streaming AlertEngine fed by every ingested batch
+        return self._part("sensors", self._start_ingestion).alerts
+
+    @property
+    def bookings(self):
+        return self._part("bookings", self._booking_store)
+
+    def _demand_model(self):
+        catalog, store = self.catalog, self.sensor_store
+        model = DemandModel(catalog.names, catalog.rooms["Capacity"], self.bookings).fit(self.history, demand_days)
+
+        def on_readings(readings):
+            model.add_readings(readings)
+            if self.kb.get("demand_version") != model.version:
+                self.kb.update("demand_version", model.version)
+
+        store.add_listener(on_readings)
+        self.kb.update("demand_version", model.version)
+        return model
+
+    @property
+    def demand_model(self):
+        # Per room and time-of-day demand forecast, refitted as each day ends
+        return self._part("demand", self._demand_model)
+
+    def _calendar_store(self):
+        store = CalendarStore(self.catalog.names, self.calendar_dir)
+        store.sync()
+        store.add_listener(lambda store: self.kb.update("calendar_version", store.version))
+        self.kb.update("calendar_version", store.version)
+        return store.watch(calendar_sync_seconds)
+
+    @property
+    def calendars(self):
+        # Room calendars from .ics files, re-synced in the background as files change
+        return self._part("calendars", self._calendar_store)
+
+    def _preference_model(self):
+        model = PreferenceModel(self.catalog.names, path=preferences_path())
+        bookings = self.bookings
+        if not model.events:
+            # Nothing saved yet: start from the bookings so far
+            model.fit(bookings)
+        model.add_listener(lambda model: self.kb.update("preferences_version", model.version))
+        bookings.add_booking_listener(model.on_booking)
+        self.kb.update("preferences_version", model.version)
+        return model
+
+    @property
+    def preferences(self):
+        # Per-user room preferences learned from bookings and feedback, saved to disk
+        return self._part("preferences", self._preference_model)
+
+    @property
+    def room_index(self):
+        # Sorted / bitmap indexes over the static room attributes
+        return self._part("room_index", lambda: RoomIndex(self.catalog.rooms))
+
+    @property
+    def spatial_index(self):
+        # Grid index over room coordinates, positions aligned with catalog.rooms
+        return self._part("spatial_index", lambda: GridIndex(self.catalog.rooms["lat"], self.catalog.rooms["lon"]))
+
+    @property
+    def room_table(self):
+        # Compact columnar room attributes, row i is catalog room i
+        return self._part("room_table", lambda: RoomTable(self.catalog.rooms))
+
+    def sensor_snapshot(self):
+        # Latest readings as compact arrays aligned with room_table; rebuilt
+        # only when new readings arrived since the last call
+        store = self.sensor_store
+
+        def snapshot():
+            with stage("sensor snapshot"):
+                return SensorSnapshot.from_store(store)
+
+        return self.kb.derive("sensor_data", ("available_rooms", "sensor_version"), snapshot)
+
+    def scorer(self, weights, start, end):
+        # IncrementalScorer for these weights and meeting window, kept up to date
+        # by the sensor and booking listeners while it is among the max_scorers
+        # most recently used
+        scorers = self._part("scorers", OrderedDict)
+        key = data_key(weights, start, end)
+        with self._lock:
+            entry = scorers.get(key)
+            if entry is not None:
+                scorers.move_to_end(key)
+                return entry[0]
+            store, bookings = self.sensor_store, self.bookings
+            scorer = IncrementalScorer(self.room_table, weights)
+
+            def on_bookings(bookings):
+                scorer.set_availability(1 + 4 * bookings.free_fraction(start, end))
+
+            # Listen first, then load: a batch ingested in between is applied twice, never lost
+            if scorer.uses_sensors:
+                store.add_listener(scorer.apply_readings)
+            bookings.add_listener(on_bookings)
+            if scorer.uses_sensors:
+                latest, _ = store.latest_arrays()
+                scorer.load_snapshot(SensorSnapshot(latest["temp"], latest["occupancy"]))
+            on_bookings(bookings)
+            scorers[key] = (scorer, on_bookings)
+            while len(scorers) > max_scorers:
+                _, (old, old_on_bookings) = scorers.popitem(last=False)
+                store.remove_listener(old.apply_readings)
+                bookings.remove_listener(old_on_bookings)
+            return scorer
+
+    def versions(self):
+        return {"catalog": self.catalog.version, "sensors": self.sensor_store.version, "bookings": self.bookings.version}
+
+    # --- Queries ---
+
+    def score(self, weights=None, start=None, end=None, k=50, rooms=None):
+        # Rooms ranked by weighted score for a meeting window, best first, with
+        # live readings when the weights use them. Identical requests within the
+        # same catalog, sensor and booking versions share one result.
+        weights = dict(default_weights if weights is None else weights)
+        unknown = set(static_criteria(weights)) - set(self.room_table.columns)
+        if unknown:
+            raise ValueError(f"unknown criteria: {', '.join(sorted(unknown))}")
+        start, end = meeting_window(start, end)
+        if rooms is None:
+            # All rooms: read the top-k off the incrementally maintained scores
+            scorer = self.scorer(weights, start, end)
+
+            def ranked():
+                with stage("ranking"):
+                    return {"start": start.isoformat(), "end": end.isoformat(), "scored": len(scorer),
+                            "rooms": scorer.frame(k).to_dict("records")}
+
+            return cached("score", ranked, self.catalog.version, scorer.version, weights, start, end, k)
+
+        table = self.room_table
+        bookings = self.bookings
+        snapshot = self.sensor_snapshot() if any(crit in weights for crit in DYNAMIC_CRITERIA) else None
+
+        def compute():
+            with stage("ranking"):
+                if snapshot is None:
+                    df = table.frame(static_criteria(weights))
+                else:
+                    df = snapshot.frame(table, static_criteria(weights), names=DYNAMIC_CRITERIA)
+                df = df[df["Room"].isin(rooms)]
+                if snapshot is not None:
+                    # Readings are stored as float32; score the 1-decimal values they stand for
+                    df["HVAC Temp"] = df["HVAC Temp"].astype(np.float64).round(1)
+                df["Availability"] = bookings.availability_scores(df["Room"], start, end)
+                ranked = rank_rooms(df, weights, k=k)
+                return {"start": start.isoformat(), "end": end.isoformat(), "scored": len(df),
+                        "rooms": ranked.to_dict("records")}
+
+        return cached("score", compute, self.catalog.version, snapshot.version if snapshot else None,
+                      bookings.version, weights, start, end, k, sorted(rooms))
+
+    def recommend(self, preferences=None, k=5):
+        # Top-k rooms meeting every preference: max_temp, quiet, projector,
+        # min_capacity, floor, and free for start-end when both are given
+        preferences = preferences or {}
+        if not isinstance(preferences, dict):
+            raise ValueError("preferences must be an object")
+        snapshot = self.sensor_snapshot()
+        busy = None
+        if preferences.get("start") and preferences.get("end"):
+            start, end = meeting_window(preferences["start"], preferences["end"])
+            busy = self.bookings.overlapping(start, end)[0]
+        matches = self.room_index.query(
+            max_temp=preferences.get("max_temp", 23),
+            quiet=preferences.get("quiet", False),
+            projector=preferences.get("projector", preferences.get("need_projector", False)),
+            min_capacity=preferences.get("min_capacity"),
+            floor=preferences.get("floor"),
+            temps=snapshot.temp,
+            occupancy=np.where(snapshot.reported, snapshot.occupancy, np.nan),
+            busy=busy,
+            k=k,
+        )
+        return {"rooms": [{"room": room, "score": score} for room, score in matches]}
+
+    def availability(self, start=None, end=None, rooms=None, free_only=False):
+        # Free share of the window per room (1 = free throughout) and the
+        # matching Availability criterion on the 1-5 scale
+        start, end = meeting_window(start, end)
+        bookings = self.bookings
+        fraction = bookings.free_fraction(start, end)
+        if rooms is None:
+            idx = np.arange(len(bookings.rooms))
+        else:
+            missing = [room for room in rooms if room not in bookings.index]
+            if missing:
+                raise ValueError(f"unknown rooms: {', '.join(missing[:5])}")
+            idx = np.array([bookings.index[room] for room in rooms], dtype=np.int64)
+        if free_only:
+            idx = idx[fraction[idx] >= 1.0]
+        return {"start": start.isoformat(), "end": end.isoformat(),
+                "rooms": [{"room": bookings.rooms[i], "free_fraction": float(fraction[i]),
+                           "availability": float(1 + 4 * fraction[i]), "free": bool(fraction[i] >= 1.0)} for i in idx]}
+
+    def assign(self, requests, method="auto"):
+        # Rooms for many meeting requests at once ({"start", "end", "headcount",
+        # "preferences"} each), overlapping requests in distinct rooms; see
+        # gcres.assignment. method: "auto", "exact" or "greedy".
+        if method not in ("auto", "exact", "greedy"):
+            raise ValueError(f"unknown method: {method}")
+        normalized = []
+        for request in requests:
+            start, end = meeting_window(request.get("start"), request.get("end"))
+            normalized.append({**request, "start": start.timestamp(), "end": end.timestamp()})
+        snapshot = self.sensor_snapshot()
+        index = self.room_index
+        # Readings are stored as float32; score the 1-decimal values they stand for
+        temps = np.round(snapshot.temp.astype(np.float64), 1)
+        assigner = BatchAssigner(index, temps=temps, bookings=self.bookings,
+                                 occupancy=np.where(snapshot.reported, snapshot.occupancy, np.nan))
+        rooms, utility = assigner.assign(normalized, method)
+        return {"assignments": [{"room": index.names[r] if r >= 0 else None,
+                                 "utility": float(u) if r >= 0 else None} for r, u in zip(rooms, utility)],
+                "summary": summarize(assigner, normalized, rooms, utility)}
+
+    # --- Dispatch for the HTTP service ---
+
+    endpoints = ("score", "recommend", "availability", "assign")
+
+    def call(self, endpoint, payload):
+        # One request (a dict of keyword arguments) or a batch (a list of them)
+        if endpoint not in self.endpoints:
+            raise ValueError(f"unknown endpoint: {endpoint}")
+        if isinstance(payload, list):
+            return [self.call_one(endpoint, item, errors_inline=True) for item in payload]
+        return self.call_one(endpoint, payload)
+
+    def call_one(self, endpoint, payload, errors_inline=False):
+        # With errors_inline (batch items) any failure becomes that item's
+        # {"error": ...}, so one bad item never fails the whole batch
+        try:
+            if endpoint not in self.endpoints:
+                raise ValueError(f"unknown endpoint: {endpoint}")
+            if not isinstance(payload, dict):
+                raise ValueError("a request must be a JSON object")
+            return getattr(self, endpoint)(**payload)
+        except (TypeError, ValueError, KeyError) as e:
+            if not errors_inline:
+                raise ValueError(str(e)) from e
+            return {"error": str(e)}
+        except Exception as e:
+            if not errors_inline:
+                raise
+            return {"error": f"{type(e).__name__}: {e}"}
@@ -0,0 +1,226 @@
+# Room demand forecast for the Analytics Agent.
+#
+# The day is split into slots (96 x 15 minutes, local time). For every room
+# and slot the model keeps an exponentially smoothed level of two daily
+# observations: mean occupancy relative to capacity (from sensor readings) and
+# the booked share of the slot (from the booking store). Both are
+# (rooms, slots) float32 arrays, so fitting a day, folding in new data and
+# forecasting a window are a few NumPy operations over all rooms at once.
+#
+# Readings of the current day are accumulated per (room, slot); when the first
+# reading of the next day arrives the day is folded into the levels:
+#
+#   level = obs                           for the first observation
+#   level = level + alpha * (obs - level) afterwards
+#
+# Demand for a window is the mean of the two levels over its slots, on a 0-1
+# scale, labelled Low / Medium / High for determine_optimal_room().
+
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from gcres.profiling import timed
+
+slot_seconds = 900
+day_seconds = 86400
+# Demand below low_demand is "Low Demand", from high_demand on "High Demand"
+low_demand = 1 / 3
+high_demand = 2 / 3
+
+
+def local_utc_offset():
+    return datetime.now().astimezone().utcoffset().total_seconds()
+
+
+def _smooth(level, obs, seen, alpha):
+    # In place; level is NaN until its first observation
+    with np.errstate(invalid="ignore"):
+        updated = np.where(np.isnan(level), obs, level + alpha * (obs - level))
+    np.copyto(level, updated, where=seen)
+
+
+def _nanmean(values, axis):
+    # np.nanmean without the warning for all-NaN rows
+    seen = ~np.isnan(values)
+    count = seen.sum(axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(seen, values, 0).sum(axis=axis) / count
+
+
+class DemandModel:
+    def __init__(self, rooms, capacity=None, bookings=None, alpha=0.3, slot_seconds=slot_seconds, utc_offset=None):
+        self.rooms = list(rooms)
+        self.index = {room: i for i, room in enumerate(self.rooms)}
+        n = len(self.rooms)
+        self.slot_seconds = slot_seconds
+        self.slots = day_seconds // slot_seconds
+        self.alpha = alpha
+        self.utc_offset = local_utc_offset() if utc_offset is None else utc_offset
+        self.capacity = np.ones(n, dtype=np.float32) if capacity is None else \
+            np.maximum(np.asarray(capacity, dtype=np.float32), 1)
+        self.bookings = bookings
+        # Booking store room index -> model index (-1 = not in the model)
+        self._booking_rooms = None if bookings is None else \
+            np.array([self.index.get(room, -1) for room in bookings.rooms], dtype=np.int64)
+        self.occupancy = np.full((n, self.slots), np.nan, dtype=np.float32)  # Smoothed occupancy / capacity
+        self.booked = np.full((n, self.slots), np.nan, dtype=np.float32)  # Smoothed booked share
+        self._sum = np.zeros((n, self.slots), dtype=np.float32)  # Current day, per (room, slot)
+        self._count = np.zeros((n, self.slots), dtype=np.int32)
+        self._day = None  # Local day number being accumulated
+        self._lock = threading.Lock()
+        self.version = 0  # Bumped whenever the levels change
+
+    def _day_slot(self, ts):
+        local = np.asarray(ts, dtype=np.float64) + self.utc_offset
+        days = np.floor(local / day_seconds)
+        slots = np.floor((local - days * day_seconds) / self.slot_seconds)
+        return days.astype(np.int64), slots.astype(np.int64)
+
+    # --- Learning ---
+
+    def add_readings(self, readings):
+        # SensorStore listener: occupancy readings are observations of their slot
+        rooms, times, values = [], [], []
+        for room, metric, ts, value in readings:
+            i = self.index.get(room)
+            if metric == "occupancy" and i is not None:
+                rooms.append(i)
+                times.append(ts)
+                values.append(value)
+        if rooms:
+            self.observe(rooms, times, values)
+
+    def observe(self, rooms, times, values):
+        # Occupancy observations (model room indices, epoch seconds, people)
+        rooms = np.asarray(rooms, dtype=np.int64)
+        days, slots = self._day_slot(times)
+        values = np.asarray(values, dtype=np.float32) / self.capacity[rooms]
+        with self._lock:
+            if self._day is None:
+                self._day = int(days.min())
+            for day in np.unique(days[days > self._day]):
+                self._fold()
+                self._day = int(day)
+            keep = days == self._day  # Late readings for a folded day are dropped
+            self._accumulate(rooms[keep], slots[keep], values[keep])
+
+    def _accumulate(self, rooms, slots, values):
+        if len(rooms) * 8 < self._sum.size:
+            np.add.at(self._sum, (rooms, slots), values)
+            np.add.at(self._count, (rooms, slots), 1)
+        else:
+            # Large batches (e.g. a day of history): one bincount over the whole grid
+            flat = rooms * self.slots + slots
+            self._sum += np.bincount(flat, weights=values, minlength=self._sum.size).reshape(self._sum.shape)
+            self._count += np.bincount(flat, minlength=self._count.size).reshape(self._count.shape).astype(np.int32)
+
+    def _fold(self):
+        # Close self._day: one smoothed observation per (room, slot)
+        seen = self._count > 0
+        if seen.any():
+            with np.errstate(invalid="ignore"):
+                _smooth(self.occupancy, self._sum / self._count, seen, self.alpha)
+        share = None if self.bookings is None else self._booked_share(self._day)
+        if share is not None:
+            _smooth(self.booked, share, np.ones_like(seen), self.alpha)
+        self._sum[:] = 0
+        self._count[:] = 0
+        self.version += 1
+
+    def _booked_share(self, day):
+        # Share of each (room, slot) of a local day covered by bookings, None
+        # for a day without any booking (taken as no data, not as no demand)
+        start = day * day_seconds - self.utc_offset
+        rooms, s, e = self.bookings.overlapping(start, start + day_seconds)
+        if len(rooms) == 0:
+            return None
+        share = np.zeros(self.occupancy.shape, dtype=np.float32)
+        rooms = self._booking_rooms[rooms]
+        known = rooms >= 0
+        a = (np.maximum(s[known], start) - start) / self.slot_seconds  # In slots from midnight
+        b = (np.minimum(e[known], start + day_seconds) - start) / self.slot_seconds
+        first = np.floor(a).astype(np.int64)
+        spans = np.maximum(np.ceil(b).astype(np.int64) - first, 0)
+        # One row per (booking, slot it touches)
+        which = np.repeat(np.arange(len(first)), spans)
+        slot = first[which] + np.arange(len(which)) - np.repeat(np.cumsum(spans) - spans, spans)
+        overlap = np.minimum(b[which], slot + 1) - np.maximum(a[which], slot)
+        np.add.at(share, (rooms[known][which], slot), overlap)
+        return np.minimum(share, 1)
+
+    @timed("demand fit")
+    def fit(self, history=None, days=28, now=None):
+        # Fold the last `days` full days from a HistoryStore (occupancy) and
+        # the booking store, oldest first; today's readings then accumulate
+        today = int(self._day_slot(time.time() if now is None else now)[0])
+        hist_rooms = None
+        if history is not None:
+            hist_rooms = np.array([self.index.get(room, -1) for room in history.rooms], dtype=np.int64)
+        with self._lock:
+            for day in range(today - days, today):
+                self._day = day
+                if history is not None:
+                    start = day * day_seconds - self.utc_offset
+                    rows = history.scan(start, start + day_seconds, metric="occupancy")
+                    rooms = hist_rooms[rows["room"].astype(np.int64)] if len(rows) else np.empty(0, dtype=np.int64)
+                    known = rooms >= 0
+                    rooms = rooms[known]
+                    slots = self._day_slot(rows["ts"][known])[1]
+                    self._accumulate(rooms, slots, rows["value"][known] / self.capacity[rooms])
+                self._fold()
+            self._day = today
+        return self
+
+    # --- Forecast ---
+
+    def _window_slots(self, start, end):
+        start, end = float(start), float(end)
+        if end - start >= day_seconds:
+            return np.arange(self.slots)
+        first = int(self._day_slot(start)[1])
+        n = max(int(np.ceil((end - start) / self.slot_seconds)), 1)
+        return (first + np.arange(n)) % self.slots
+
+    def _demand(self, slots):
+        # (rooms, len(slots)) combined demand, NaN where neither level is known
+        with self._lock:
+            occupancy = np.clip(self.occupancy[:, slots], 0, 1)
+            booked = self.booked[:, slots]
+        return _nanmean(np.stack([occupancy, booked]), axis=0)
+
+    def demand(self, start, end):
+        # Forecast demand (0-1) per room for the window [start, end), epoch
+        # seconds or datetimes; NaN for rooms without any history
+        start = start.timestamp() if isinstance(start, datetime) else start
+        end = end.timestamp() if isinstance(end, datetime) else end
+        return _nanmean(self._demand(self._window_slots(start, end)), axis=1)
+
+    def labels(self, start, end):
+        # "Low Demand" / "Medium Demand" / "High Demand" (or "No Data") per room
+        demand = self.demand(start, end)
+        return np.select([np.isnan(demand), demand < low_demand, demand < high_demand],
+                         ["No Data", "Low Demand", "Medium Demand"], "High Demand")
+
+    def peak(self, hours=2):
+        # Start slot of the `hours`-long window of the day with the highest mean
+        # demand over all rooms, or None without history
+        by_slot = _nanmean(self._demand(np.arange(self.slots)), axis=0)
+        if np.isnan(by_slot).all():
+            return None
+        width = max(int(hours * 3600 // self.slot_seconds), 1)
+        filled = np.nan_to_num(by_slot, nan=0.0)
+        window = np.convolve(np.concatenate([filled, filled[:width - 1]]), np.ones(width), mode="valid")
+        return int(np.argmax(window))
+
+    def slot_time(self, slot):
+        # "2 PM", "2:15 PM" for a slot number
+        minutes = int(slot) % self.slots * self.slot_seconds // 60
+        label = datetime(2000, 1, 1, minutes // 60, minutes % 60).strftime("%I:%M %p").lstrip("0")
+        return label.replace(":00", "")
+
+    @property
+    def nbytes(self):
+        return self.occupancy.nbytes + self.booked.nbytes + self._sum.nbytes + self._count.nbytes
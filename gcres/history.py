@@ -0,0 +1,432 @@
+# Persistent sensor history in append-only, memory-mapped day segments.
+#
+# Every ingested reading is appended as a fixed-width 17-byte record
+# (ts float64, room uint32, metric uint8, value float32, little-endian) to the
+# log of its UTC day:
+#
+#   data/history/meta.json          room and metric names, record i.room -> rooms[i]
+#   data/history/2026-01-05.log     today's readings in arrival order
+#   data/history/2026-01-04.seg     a compacted day, sorted by (room, metric, ts)
+#   data/history/2026-01-04.idx.npy where each (room, metric) run starts and ends in the .seg
+#
+# Readers map the files with np.memmap instead of loading them, so months of
+# history cost disk, not RAM, and opening the store reads only meta.json. A
+# scan of a compacted day slices the runs of the requested rooms through the
+# index and binary-searches the time range; the open log is filtered with one
+# vectorized mask. compact() turns finished logs into sorted segments, can
+# average raw readings into fixed buckets (e.g. one per minute) and drops
+# segments past the retention. A reading already stored with the same room,
+# metric and ts is skipped, so a feed replayed after a restart is not stored
+# twice; late or out-of-order readings are kept.
+#
+#   python -m gcres.history [--dir data/history] [--compact] [--resolution 60] [--retention-days 90]
+
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from gcres.ingest import metrics as default_metrics
+
+record = np.dtype([("ts", "<f8"), ("room", "<u4"), ("metric", "u1"), ("value", "<f4")])
+default_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "history")
+day_seconds = 86400
+
+
+def history_dir(path=None):
+    return path or os.environ.get("GCRES_HISTORY_DIR") or default_dir
+
+
+def day_name(day):
+    # UTC day number (ts // 86400) -> "2026-01-05"
+    return datetime.fromtimestamp(day * day_seconds, timezone.utc).strftime("%Y-%m-%d")
+
+
+def _day_number(name):
+    return int(datetime.strptime(name, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()) // day_seconds
+
+
+def _map(path):
+    # Read-only view of a record file; empty files can't be mapped
+    n = os.path.getsize(path) // record.itemsize
+    if n == 0:
+        return np.empty(0, dtype=record)
+    return np.memmap(path, dtype=record, mode="r", shape=(n,))
+
+
+def _replace(path, write):
+    # Write to a temporary file and move it over path, so readers never see half a file
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+class HistoryStore:
+    def __init__(self, directory=None, rooms=(), metrics=default_metrics, retention_days=None, resolution=None,
+                 auto_compact=False):
+        self.directory = history_dir(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.retention_days = retention_days
+        self.resolution = resolution  # Bucket seconds for compacted days, None = keep raw readings
+        # Compact finished days in a background thread on the first write of each new day
+        self.auto_compact = auto_compact
+        self._day = -1
+        self._lock = threading.RLock()
+        self._segments = {}  # day -> (mtime, memmap, runs) of compacted days
+        self.rooms, self.metrics = [], []
+        meta = os.path.join(self.directory, "meta.json")
+        if os.path.exists(meta):
+            with open(meta) as f:
+                saved = json.load(f)
+            self.rooms, self.metrics = saved["rooms"], saved["metrics"]
+        self.index = {room: i for i, room in enumerate(self.rooms)}
+        self.metric_ids = {m: i for i, m in enumerate(self.metrics)}
+        # Ids are never reused: new rooms and metrics are added at the end
+        self._register(rooms, metrics)
+        self.written = 0
+        self.replayed = 0  # Readings skipped as already stored
+        self._high = None  # Last stored ts per (room, metric), read on the first append
+        self._replay_keys = {}  # day -> sorted keys of its stored readings, during a replay
+        self._compact_lock = threading.Lock()  # One compaction at a time
+        self._aligned = set()  # Days whose log is known to end on a record boundary
+
+    def _register(self, rooms, metrics):
+        new_rooms = [room for room in dict.fromkeys(rooms) if room not in self.index]
+        new_metrics = [m for m in dict.fromkeys(metrics) if m not in self.metric_ids]
+        if not new_rooms and not new_metrics:
+            return
+        with self._lock:
+            for room in new_rooms:
+                self.index[room] = len(self.rooms)
+                self.rooms.append(room)
+            for m in new_metrics:
+                self.metric_ids[m] = len(self.metrics)
+                self.metrics.append(m)
+            meta = {"rooms": self.rooms, "metrics": self.metrics}
+            _replace(os.path.join(self.directory, "meta.json"), lambda f: f.write(json.dumps(meta).encode()))
+
+    def _path(self, day, kind):
+        return os.path.join(self.directory, f"{day_name(day)}.{kind}")
+
+    # --- Writing ---
+
+    def _high_water(self):
+        # Last stored ts per (room, metric), from the newest stored day. A
+        # reading newer than that is new; only older ones (a feed replayed from
+        # its start by a FileTailSource after a restart, or genuinely late
+        # readings) are looked up among the stored readings of their day.
+        if self._high is None:
+            high = np.full((len(self.rooms), len(self.metrics)), -np.inf)
+            days = self.days()
+            if days:
+                # Rooms that have not reported on the newest day are checked too
+                high[:] = days[-1] * day_seconds
+                for kind in ("seg", "log"):
+                    path = self._path(days[-1], kind)
+                    if os.path.exists(path):
+                        rows = _map(path)
+                        np.maximum.at(high, (rows["room"].astype(np.int64), rows["metric"].astype(np.int64)), rows["ts"])
+            self._high = high
+        return self._high
+
+    def _keys(self, rows):
+        # ts + 1j * (room, metric) run: complex numbers sort by ts, then run
+        return rows["ts"] + 1j * (rows["room"].astype(np.int64) * len(self.metrics) + rows["metric"])
+
+    def _stored_keys(self, day):
+        # Sorted keys of the readings stored for a day, kept while a replay
+        # needs them. Readings in a segment averaged into buckets match by
+        # their bucket start.
+        keys = self._replay_keys.get(day)
+        if keys is None:
+            parts = []
+            for kind in ("seg", "log"):
+                path = self._path(day, kind)
+                if os.path.exists(path):
+                    parts.append(self._keys(_map(path)))
+            keys = self._replay_keys[day] = np.sort(np.concatenate(parts)) if parts else np.empty(0, complex)
+        return keys
+
+    def _duplicates(self, batch):
+        # Mask of the batch's readings already stored with the same room, metric and ts
+        seen = np.zeros(len(batch), dtype=bool)
+        days = (batch["ts"] // day_seconds).astype(np.int64)
+        for day in np.unique(days):
+            mine = np.flatnonzero(days == day)
+            stored = self._stored_keys(int(day))
+            if not len(stored):
+                continue
+            rows = batch[mine]
+            candidates = [self._keys(rows)]
+            if self.resolution:
+                bucketed = rows.copy()
+                bucketed["ts"] = rows["ts"] // self.resolution * self.resolution
+                candidates.append(self._keys(bucketed))
+            first = rows["ts"].min()
+            if self.resolution:
+                first = first // self.resolution * self.resolution
+            lo, hi = np.searchsorted(stored.real, first), np.searchsorted(stored.real, rows["ts"].max(), side="right")
+            window = stored[lo:hi]
+            for keys in candidates:
+                seen[mine] |= np.isin(keys, window)
+        return seen
+
+    def _open_log(self, day):
+        # A write torn by a crash leaves part of a record at the end of the
+        # log; cut it off so the records appended after it stay aligned
+        path = self._path(day, "log")
+        if day not in self._aligned:
+            if os.path.exists(path):
+                size = os.path.getsize(path)
+                if size % record.itemsize:
+                    os.truncate(path, size - size % record.itemsize)
+            self._aligned.add(day)
+        return open(path, "ab")
+
+    def append(self, readings):
+        # Append (room, metric, ts, value) readings; usable as a SensorStore listener
+        readings = [r for r in readings if r[0] in self.index and r[1] in self.metric_ids]
+        if not readings:
+            return 0
+        batch = np.empty(len(readings), dtype=record)
+        batch["ts"] = [ts for _, _, ts, _ in readings]
+        batch["room"] = [self.index[room] for room, _, _, _ in readings]
+        batch["metric"] = [self.metric_ids[metric] for _, metric, _, _ in readings]
+        batch["value"] = [value for _, _, _, value in readings]
+        with self._lock:
+            high = self._high_water()
+            at = (batch["room"].astype(np.int64), batch["metric"].astype(np.int64))
+            older = batch["ts"] <= high[at]
+            if older.any():
+                duplicate = np.zeros(len(batch), dtype=bool)
+                duplicate[older] = self._duplicates(batch[older])
+                if duplicate.any():
+                    self.replayed += int(duplicate.sum())
+                    keep = ~duplicate
+                    batch, at = batch[keep], (at[0][keep], at[1][keep])
+                    if not len(batch):
+                        return 0
+            else:
+                self._replay_keys.clear()  # Replay over (or none): stop holding the stored keys
+            np.maximum.at(high, at, batch["ts"])
+            days = (batch["ts"] // day_seconds).astype(np.int64)
+            for day in np.unique(days):
+                rows = batch[days == day]
+                with self._open_log(int(day)) as f:
+                    f.write(rows.tobytes())
+                if int(day) in self._replay_keys:
+                    keys = self._replay_keys[int(day)]
+                    self._replay_keys[int(day)] = np.sort(np.concatenate([keys, self._keys(rows)]))
+            self.written += len(batch)
+            if self.auto_compact and days.max() > self._day:
+                self._day = int(days.max())
+                threading.Thread(target=self.compact, name="gcres-history-compact", daemon=True).start()
+        return len(batch)
+
+    # --- Reading ---
+
+    def days(self):
+        # UTC day numbers with stored readings, oldest first
+        found = set()
+        for name in os.listdir(self.directory):
+            stem, _, kind = name.partition(".")
+            if kind in ("log", "seg"):
+                try:
+                    found.add(_day_number(stem))
+                except ValueError:
+                    continue
+        return sorted(found)
+
+    def _segment(self, day):
+        # Memory-mapped compacted segment and its (rooms, metrics, [start, end))
+        # run bounds, reopened when the day is compacted again
+        path = self._path(day, "seg")
+        if not os.path.exists(path):
+            return None, None
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._segments.get(day)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, _map(path), np.load(self._path(day, "idx.npy"), mmap_mode="r"))
+            self._segments[day] = cached
+        return cached[1], cached[2]
+
+    def _scan_day(self, day, start, end, rooms, metric):
+        parts = []
+        seg, runs = self._segment(day)
+        if seg is not None:
+            if rooms is None:
+                mask = (seg["ts"] >= start) & (seg["ts"] < end)
+                if metric is not None:
+                    mask &= seg["metric"] == metric
+                parts.append(seg[mask])
+            else:
+                for r in rooms:
+                    if r >= runs.shape[0]:
+                        continue  # Room added after this day was compacted
+                    for m in range(runs.shape[1]) if metric is None else [metric]:
+                        if m >= runs.shape[1]:
+                            continue
+                        rows = seg[runs[r, m, 0]:runs[r, m, 1]]
+                        lo, hi = np.searchsorted(rows["ts"], [start, end])
+                        if hi > lo:
+                            parts.append(rows[lo:hi])
+        log = self._path(day, "log")
+        if os.path.exists(log):
+            rows = _map(log)
+            mask = (rows["ts"] >= start) & (rows["ts"] < end)
+            if rooms is not None:
+                mask &= np.isin(rows["room"], rooms)
+            if metric is not None:
+                mask &= rows["metric"] == metric
+            parts.append(rows[mask])
+        return parts
+
+    def scan(self, start=None, end=None, rooms=None, metric=None):
+        # Records with start <= ts < end, for the given room names and metric
+        # (None = all), as a structured array sorted by time. Only the day
+        # segments overlapping the range are touched.
+        start = -np.inf if start is None else float(start)
+        end = np.inf if end is None else float(end)
+        ids = None if rooms is None else np.array([self.index[room] for room in rooms if room in self.index], dtype=np.uint32)
+        m = None if metric is None else self.metric_ids.get(metric)
+        if metric is not None and m is None:
+            return np.empty(0, dtype=record)
+        parts = []
+        with self._lock:
+            for day in self.days():
+                if (day + 1) * day_seconds <= start or day * day_seconds >= end:
+                    continue
+                parts.extend(self._scan_day(day, start, end, None if ids is None else ids.tolist(), m))
+        if not parts:
+            return np.empty(0, dtype=record)
+        rows = np.concatenate(parts)  # Copies out of the maps
+        return rows[np.argsort(rows["ts"], kind="stable")]
+
+    def series(self, room, metric, start=None, end=None):
+        # (ts, values) of one room and metric, oldest first
+        rows = self.scan(start, end, rooms=[room], metric=metric)
+        return rows["ts"], rows["value"]
+
+    def hourly_mean(self, metric, start=None, end=None, utc_offset=0.0):
+        # Mean value per hour of day (0-23, local to utc_offset seconds) over all
+        # rooms; NaN for hours without readings
+        rows = self.scan(start, end, metric=metric)
+        hours = (((rows["ts"] + utc_offset) // 3600) % 24).astype(np.int64)
+        sums = np.bincount(hours, weights=rows["value"], minlength=24)
+        counts = np.bincount(hours, minlength=24)
+        with np.errstate(invalid="ignore"):
+            return sums / counts
+
+    def peak_hours(self, metric="occupancy", days=28, width=2, utc_offset=0.0):
+        # Start hour of the `width`-hour window with the highest mean over the
+        # last `days` days, or None without history
+        hourly = self.hourly_mean(metric, time.time() - days * day_seconds, None, utc_offset)
+        if np.isnan(hourly).all():
+            return None
+        window = np.convolve(np.nan_to_num(np.concatenate([hourly, hourly[:width - 1]]), nan=0.0),
+                             np.ones(width), mode="valid")  # Windows may wrap past midnight
+        return int(np.argmax(window))
+
+    # --- Maintenance ---
+
+    def compact(self, before=None, resolution=None):
+        # Sort the logs of days before `before` (default: today, UTC) into
+        # indexed segments, merging readings that arrived after a day was
+        # compacted. With a resolution (seconds, default self.resolution),
+        # readings are averaged per room, metric and bucket. Returns the number
+        # of days compacted. Segments are built without the lock, so appends
+        # from the ingest thread only wait for the files to be swapped.
+        before = int(time.time() // day_seconds) if before is None else before
+        resolution = self.resolution if resolution is None else resolution
+        compacted = 0
+        with self._compact_lock:
+            for day in self.days():
+                if self.retention_days is not None and day < before - self.retention_days:
+                    with self._lock:
+                        self._drop(day)
+                    continue
+                log = self._path(day, "log")
+                if day >= before or not os.path.exists(log):
+                    continue
+                with self._lock:
+                    seg, _ = self._segment(day)
+                    n = os.path.getsize(log) // record.itemsize
+                rows = np.fromfile(log, dtype=record, count=n)
+                rows = np.concatenate([np.asarray(seg), rows]) if seg is not None else rows
+                self._write_segment(day, _aggregate(rows, resolution) if resolution else rows, ".new")
+                with self._lock:
+                    # Readings appended to the log meanwhile stay in it
+                    with open(log, "rb") as f:
+                        f.seek(n * record.itemsize)
+                        tail = f.read()
+                    tail = tail[:len(tail) - len(tail) % record.itemsize]
+                    self._segments.pop(day, None)
+                    self._replay_keys.pop(day, None)
+                    os.replace(self._path(day, "idx.npy") + ".new", self._path(day, "idx.npy"))
+                    os.replace(self._path(day, "seg") + ".new", self._path(day, "seg"))
+                    if tail:
+                        _replace(log, lambda f: f.write(tail))
+                    else:
+                        os.remove(log)
+                    self._aligned.discard(day)
+                compacted += 1
+        return compacted
+
+    def _write_segment(self, day, rows, suffix=""):
+        n_rooms, n_metrics = len(self.rooms), len(self.metrics)
+        rows = rows[np.lexsort((rows["ts"], rows["metric"], rows["room"]))]
+        run = rows["room"].astype(np.int64) * n_metrics + rows["metric"]
+        offsets = np.searchsorted(run, np.arange(n_rooms * n_metrics + 1))
+        runs = np.stack([offsets[:-1], offsets[1:]], axis=1).reshape(n_rooms, n_metrics, 2)
+        _replace(self._path(day, "idx.npy") + suffix, lambda f: np.save(f, runs))
+        _replace(self._path(day, "seg") + suffix, lambda f: f.write(rows.tobytes()))
+
+    def _drop(self, day):
+        self._segments.pop(day, None)
+        for kind in ("log", "seg", "idx.npy"):
+            path = self._path(day, kind)
+            if os.path.exists(path):
+                os.remove(path)
+
+    @property
+    def disk_bytes(self):
+        return sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.is_file())
+
+
+def _aggregate(rows, resolution):
+    # One record per (room, metric, bucket): mean value at the bucket start
+    bucket = (rows["ts"] // resolution).astype(np.int64)
+    keys = np.stack([rows["room"].astype(np.int64), rows["metric"].astype(np.int64), bucket])
+    unique, inverse = np.unique(keys, axis=1, return_inverse=True)
+    inverse = inverse.ravel()
+    counts = np.bincount(inverse)
+    out = np.empty(unique.shape[1], dtype=record)
+    out["room"], out["metric"] = unique[0], unique[1]
+    out["ts"] = unique[2] * float(resolution)
+    out["value"] = np.bincount(inverse, weights=rows["value"]) / counts
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or compact the sensor history store.")
+    parser.add_argument("--dir", help="history directory (default: $GCRES_HISTORY_DIR or data/history)")
+    parser.add_argument("--compact", action="store_true", help="compact the logs of finished days")
+    parser.add_argument("--resolution", type=float, help="with --compact: average readings into buckets of this many seconds")
+    parser.add_argument("--retention-days", type=int, help="with --compact: drop days older than this")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.dir, retention_days=args.retention_days)
+    if args.compact:
+        print(f"compacted {store.compact(resolution=args.resolution)} days")
+    days = store.days()
+    span = f"{day_name(days[0])} to {day_name(days[-1])}" if days else "empty"
+    print(f"{store.directory}: {len(store.rooms)} rooms, {len(days)} days ({span}), {store.disk_bytes / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
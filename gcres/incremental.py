@@ -0,0 +1,202 @@
+# Incremental scoring: only rooms whose inputs changed are re-scored.
+#
+# The static criteria of a room never change between reruns, so their weighted
+# sum is computed once. A room's score is that partial sum plus the dynamic
+# terms (availability for the meeting window, temperature penalty, occupancy
+# bonus), and a sensor batch only re-scores the rooms it touched.
+#
+# The current top-k is kept in a min-heap of k entries whose root is the
+# weakest room in it; every room outside scores no better than the root. A
+# changed room outside the heap that beats the root replaces it, a room in the
+# heap that improves stays, so m changed rooms cost O(m log k). Only when a
+# room in the top-k gets worse can an outsider overtake it; the heap is then
+# rebuilt on the next read with one vectorized top_k pass over all scores.
+#
+# Scores are bit-identical to rank_rooms when Availability is the last static
+# criterion in the weights (as on every page); otherwise they may differ in
+# the last bit.
+
+import heapq
+import itertools
+import threading
+
+import numpy as np
+
+from gcres.scoring import (DYNAMIC_CRITERIA, ideal_occupancy, ideal_temp, max_occupancy_bonus, static_criteria,
+                           temp_penalty_rate, top_k, weight_vector, weighted_sum)
+
+# Above this share of changed rooms one vectorized pass beats per-room updates
+full_update_share = 0.02
+
+# Versions are unique across scorers, so a result cached for one scorer never
+# matches another
+_versions = itertools.count(1)
+
+
+class IncrementalScorer:
+    def __init__(self, table, weights, availability=None, k=50):
+        # table: a RoomTable; availability: Availability criterion per room (1-5)
+        self.table = table
+        self.weights = dict(weights)
+        n = len(table)
+        criteria = [crit for crit in static_criteria(weights) if crit != "Availability"]
+        X = np.column_stack([table.columns[crit].astype(np.float64) for crit in criteria]) if criteria else np.zeros((n, 0))
+        self.static = weighted_sum(X, weight_vector(weights, criteria))
+        self.availability_weight = weights.get("Availability", 0.0)
+        self.temp_weighted = "HVAC Temp" in weights
+        self.occupancy_weight = weights.get("Current Occupancy", 0.0)
+        self.uses_sensors = any(crit in weights for crit in DYNAMIC_CRITERIA)
+        self.availability = np.full(n, 3.0) if availability is None else np.asarray(availability, dtype=np.float64)
+        self.temp = np.full(n, np.nan)
+        self.occupancy = np.full(n, np.nan)
+        self.scores = np.full(n, -np.inf)
+        self.k = k
+        self._heap = None  # [(score, -position)] of the top-k, weakest first; None = rebuild on read
+        self._members = set()
+        self._lock = threading.Lock()
+        self.version = next(_versions)
+        self._rescore(None)
+
+    def __len__(self):
+        return int(np.count_nonzero(self._eligible(None)))
+
+    def _eligible(self, ids):
+        if not self.uses_sensors:
+            return np.ones(len(self.scores) if ids is None else len(ids), dtype=bool)
+        temp = self.temp if ids is None else self.temp[ids]
+        occupancy = self.occupancy if ids is None else self.occupancy[ids]
+        return ~(np.isnan(temp) | np.isnan(occupancy))  # Rooms without readings are not ranked
+
+    def _compute(self, ids):
+        # Same operations, in the same order, as calculate_scores
+        sl = slice(None) if ids is None else ids
+        scores = self.static[sl] + self.availability[sl] * self.availability_weight
+        if self.temp_weighted:
+            scores -= np.abs(self.temp[sl] - ideal_temp) * temp_penalty_rate
+        if "Current Occupancy" in self.weights:
+            scores += (max_occupancy_bonus - np.abs(self.occupancy[sl] - ideal_occupancy)) * self.occupancy_weight
+        return np.where(self._eligible(ids), scores, -np.inf)
+
+    def _rescore(self, ids):
+        # Caller holds the lock (or is __init__)
+        self.version = next(_versions)
+        if ids is None or len(ids) > full_update_share * len(self.scores):
+            self.scores = self._compute(ids=None)
+            self._heap = None
+            return
+        ids = np.unique(ids)
+        new = self._compute(ids)
+        old = self.scores[ids]
+        self.scores[ids] = new
+        heap = self._heap
+        if heap is None:
+            return
+        changes = list(zip(ids.tolist(), old.tolist(), new.tolist()))
+        # Members first: the heap has to hold their current scores before any
+        # outsider is compared against its root
+        members = [(i, before, after) for i, before, after in changes if i in self._members]
+        if any(after < before for _, before, after in members):
+            self._heap = None  # An outsider may now be better: rebuild on read
+            return
+        if members:
+            # Improved, still in the top-k
+            heap = self._heap = [(float(self.scores[-neg]), neg) for _, neg in heap]
+            heapq.heapify(heap)
+        for i, _, after in changes:
+            if i in self._members or after == -np.inf:
+                continue
+            if len(heap) < self.k:
+                heapq.heappush(heap, (after, -i))
+            elif (after, -i) > heap[0]:
+                _, evicted = heapq.heapreplace(heap, (after, -i))
+                self._members.discard(-evicted)
+            else:
+                continue
+            self._members.add(i)
+
+    def set_readings(self, ids, temp=None, occupancy=None):
+        # New temperature / occupancy for the rooms at positions ids
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            if temp is not None:
+                self.temp[ids] = np.round(np.asarray(temp, dtype=np.float64), 1)
+            if occupancy is not None:
+                self.occupancy[ids] = np.round(np.asarray(occupancy, dtype=np.float64))
+            self._rescore(ids)
+
+    def set_availability(self, availability, ids=None):
+        # New Availability criterion for all rooms, or for the rooms at ids
+        with self._lock:
+            if ids is None:
+                self.availability = np.asarray(availability, dtype=np.float64)
+            else:
+                ids = np.asarray(ids, dtype=np.int64)
+                self.availability[ids] = availability
+            self._rescore(ids)
+
+    def apply_readings(self, readings):
+        # SensorStore listener: readings is a batch of (room, metric, ts, value);
+        # the last value per room and metric wins
+        temp, occupancy = {}, {}
+        position = self.table.position
+        for room, metric, _, value in readings:
+            i = position.get(room)
+            if i is None:
+                continue
+            if metric == "temp":
+                temp[i] = value
+            elif metric == "occupancy":
+                occupancy[i] = value
+        if not temp and not occupancy:
+            return
+        with self._lock:
+            if temp:
+                ids = np.fromiter(temp, dtype=np.int64, count=len(temp))
+                self.temp[ids] = np.round(np.fromiter(temp.values(), dtype=np.float64, count=len(temp)), 1)
+            if occupancy:
+                ids = np.fromiter(occupancy, dtype=np.int64, count=len(occupancy))
+                self.occupancy[ids] = np.round(np.fromiter(occupancy.values(), dtype=np.float64, count=len(occupancy)))
+            self._rescore(np.fromiter(temp.keys() | occupancy.keys(), dtype=np.int64))
+
+    def load_snapshot(self, snapshot):
+        # Initialise the readings from a SensorSnapshot in one pass
+        with self._lock:
+            self.temp = np.where(snapshot.reported, np.round(snapshot.temp.astype(np.float64), 1), np.nan)
+            self.occupancy = np.where(snapshot.reported, snapshot.occupancy.astype(np.float64), np.nan)
+            self._rescore(None)
+
+    def _rebuild(self):
+        live = np.isfinite(self.scores)
+        best = top_k(np.where(live, self.scores, -np.inf), self.k)
+        best = best[live[best]]
+        self._heap = [(float(self.scores[i]), -int(i)) for i in best]
+        heapq.heapify(self._heap)
+        self._members = set(best.tolist())
+
+    def top(self, k):
+        # Positions and scores of the k best rooms, best first
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        with self._lock:
+            if k > self.k:
+                self.k = k
+                self._heap = None
+            if self._heap is None:
+                self._rebuild()
+            best = sorted(self._heap, reverse=True)[:k]  # Ties in room order, like top_k
+        ids = np.array([-neg for _, neg in best], dtype=np.int64)
+        return ids, np.array([score for score, _ in best], dtype=np.float64)
+
+    def frame(self, k, column="Weighted Score"):
+        # Top-k rows with their criteria, readings and score, like rank_rooms
+        ids, scores = self.top(k)
+        criteria = [crit for crit in static_criteria(self.weights) if crit != "Availability"]
+        df = self.table.frame(criteria, rows=ids)
+        if "Availability" in self.weights:
+            df["Availability"] = self.availability[ids]
+        if self.temp_weighted:
+            df["HVAC Temp"] = self.temp[ids]
+        if "Current Occupancy" in self.weights:
+            df["Current Occupancy"] = self.occupancy[ids].astype(np.int64)
+        df[column] = scores
+        return df
@@ -0,0 +1,349 @@
+# Background ingestion of sensor readings into fixed-size NumPy ring buffers.
+#
+# A source yields batches of readings, each a (room, metric, ts, value) tuple.
+# The Ingestor thread drains the source into a SensorStore, which keeps the
+# last `capacity` readings per room and metric, so memory stays flat however
+# long the dashboard runs. Pages read the latest values without waiting on the
+# source.
+
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+
+import numpy as np
+
+from gcres.sensors import simulated_reading
+
+metrics = ("temp", "occupancy")
+log = logging.getLogger(__name__)
+
+
+class SensorStore:
+    def __init__(self, rooms, metrics=metrics, capacity=256):
+        self.rooms = list(rooms)
+        self.index = {room: i for i, room in enumerate(self.rooms)}
+        self.metrics = tuple(metrics)
+        self.capacity = capacity
+        n = len(self.rooms)
+        # Per metric: (rooms, capacity) ring of values and timestamps
+        self._values = {m: np.full((n, capacity), np.nan, dtype=np.float32) for m in self.metrics}
+        self._ts = {m: np.zeros((n, capacity), dtype=np.float64) for m in self.metrics}
+        self._head = {m: np.zeros(n, dtype=np.int64) for m in self.metrics}  # Total writes per room
+        self._latest = {m: np.full(n, np.nan, dtype=np.float32) for m in self.metrics}
+        self._latest_ts = {m: np.zeros(n, dtype=np.float64) for m in self.metrics}
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.version = 0  # Bumped on every write, cheap change detection for readers
+        self.listener_errors = 0
+        self.rejected = 0  # Readings with a malformed room, ts or value
+
+    def add_listener(self, fn):
+        # fn(readings) is called after each ingested batch, outside the lock. A
+        # listener that raises is logged and skipped for that batch only.
+        self._listeners.append(fn)
+
+    def remove_listener(self, fn):
+        if fn in self._listeners:
+            self._listeners.remove(fn)
+
+    def _write(self, i, metric, ts, value):
+        pos = self._head[metric][i] % self.capacity
+        self._values[metric][i, pos] = value
+        self._ts[metric][i, pos] = ts
+        self._head[metric][i] += 1
+        self._latest[metric][i] = value
+        self._latest_ts[metric][i] = ts
+
+    def append(self, room, metric, ts, value):
+        self.extend([(room, metric, ts, value)])
+
+    def extend(self, readings):
+        accepted = []
+        with self._lock:
+            for room, metric, ts, value in readings:
+                try:
+                    i = self.index.get(room)
+                    if i is None or metric not in self._values:
+                        continue  # Unknown room or metric, e.g. a sensor not in the catalog
+                    ts, value = float(ts), float(value)
+                except (TypeError, ValueError):
+                    self.rejected += 1  # Not a room name, or a ts / value that is not a number
+                    continue
+                self._write(i, metric, ts, value)
+                accepted.append((room, metric, ts, value))
+            if accepted:
+                self.version += 1
+        for fn in self._listeners:
+            try:
+                fn(accepted)
+            except Exception:  # E.g. a full disk under the history log must not stop ingestion
+                self.listener_errors += 1
+                log.exception("sensor listener %r failed", fn)
+        return len(accepted)
+
+    def latest(self, room):
+        # O(1): last value per metric for one room (None until it has reported)
+        i = self.index[room]
+        values = {m: self._latest[m][i] for m in self.metrics}
+        if all(np.isnan(v) for v in values.values()):
+            return None
+        return _as_reading(values)
+
+    def latest_arrays(self):
+        # Copy of the latest value per room for every metric, aligned with self.rooms
+        with self._lock:
+            return {m: self._latest[m].copy() for m in self.metrics}, self.version
+
+    def readings(self, rooms=None):
+        # Latest readings in the {"Room A": {"temp": ..., "occupancy": ...}} form
+        # the pages use. Rooms that have not reported every metric are left out.
+        rooms = self.rooms if rooms is None else rooms
+        latest, _ = self.latest_arrays()
+        complete = np.logical_and.reduce([~np.isnan(latest[m]) for m in self.metrics])
+        data = {}
+        for room in rooms:
+            i = self.index.get(room)
+            if i is None or not complete[i]:
+                continue
+            data[room] = _as_reading({m: latest[m][i] for m in self.metrics})
+        return data
+
+    def history(self, room, metric):
+        # Buffered readings for one room and metric, oldest first
+        i = self.index[room]
+        with self._lock:
+            head = int(self._head[metric][i])
+            n = min(head, self.capacity)
+            order = (np.arange(head - n, head) % self.capacity)
+            return self._ts[metric][i, order].copy(), self._values[metric][i, order].copy()
+
+    @property
+    def nbytes(self):
+        arrays = [*self._values.values(), *self._ts.values(), *self._head.values(),
+                  *self._latest.values(), *self._latest_ts.values()]
+        return sum(a.nbytes for a in arrays)
+
+
+def _as_reading(values):
+    reading = {}
+    for metric, value in values.items():
+        value = float(value)
+        if np.isnan(value):
+            value = None
+        elif metric == "temp":
+            value = round(value, 1)
+        elif metric == "occupancy":
+            value = int(round(value))
+        reading[metric] = value
+    return reading
+
+
+# --- Sources ---
+
+class SimulatedSource:
+    # Every `interval` seconds, one reading per room and metric from gcres.sensors
+    def __init__(self, rooms, interval=2.0, rng=None):
+        self.rooms = list(rooms)
+        self.interval = interval
+        self.rng = rng
+
+    def __iter__(self):
+        while True:
+            ts = time.time()
+            batch = []
+            for room in self.rooms:
+                reading = simulated_reading(room) if self.rng is None else simulated_reading(room, self.rng)
+                batch.extend((room, metric, ts, value) for metric, value in reading.items())
+            yield batch
+            time.sleep(self.interval)
+
+
+class QueueSource:
+    # In-process stand-in for an MQTT broker: producers publish(), the ingestor consumes
+    def __init__(self, max_batch=1000, timeout=0.5):
+        self._queue = queue.Queue()
+        self.max_batch = max_batch
+        self.timeout = timeout
+
+    def publish(self, room, metric, value, ts=None):
+        self._queue.put((room, metric, time.time() if ts is None else ts, value))
+
+    def __iter__(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.timeout)]
+            except queue.Empty:
+                yield []
+                continue
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            yield batch
+
+
+class FileTailSource:
+    # Follows a JSON-lines file, one reading per line:
+    #   {"room": "Room A", "ts": 1718000000.0, "temp": 22.4, "occupancy": 3}
+    # ts is optional (arrival time is used), any subset of metrics may be present.
+    def __init__(self, path, poll=0.5):
+        self.path = path
+        self.poll = poll
+        self.rejected = 0  # Lines that were not valid readings
+
+    def __iter__(self):
+        while not os.path.exists(self.path):
+            yield []
+            time.sleep(self.poll)
+        with open(self.path) as f:
+            while True:
+                batch = []
+                while True:
+                    pos = f.tell()
+                    line = f.readline()
+                    if not line.endswith("\n"):
+                        f.seek(pos)  # Nothing new, or a line still being written
+                        break
+                    readings = _parse_line(line)
+                    if readings is None:
+                        self.rejected += 1
+                    else:
+                        batch.extend(readings)
+                yield batch
+                if not batch:
+                    time.sleep(self.poll)
+
+
+class SocketSource:
+    # Listens on host:port for JSON-lines readings (the FileTailSource format)
+    # from any number of TCP clients, e.g. python -m gcres.simulator --out tcp://127.0.0.1:9009
+    # At most max_pending received batches wait for the ingestor; when clients
+    # send faster than it keeps up, further batches are dropped and counted,
+    # so memory stays flat.
+    def __init__(self, host="127.0.0.1", port=9009, max_batch=10_000, timeout=0.5, max_pending=256):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.dropped = 0  # Readings dropped because the queue was full
+        self.rejected = 0  # Lines that were not valid readings
+        self._dropped_lock = threading.Lock()
+        self._server = socket.create_server((host, port))
+        self.address = self._server.getsockname()
+        threading.Thread(target=self._accept, name="gcres-feed", daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return  # Closed
+            threading.Thread(target=self._read, args=(conn,), daemon=True).start()
+
+    def _read(self, conn):
+        pending = b""
+        with conn:
+            while True:
+                chunk = conn.recv(1 << 16)
+                if not chunk:
+                    return
+                *lines, pending = (pending + chunk).split(b"\n")
+                batch = []
+                for line in lines:
+                    readings = _parse_line(line)
+                    if readings is None:
+                        self.rejected += 1
+                    else:
+                        batch.extend(readings)
+                if batch:
+                    try:
+                        self._queue.put_nowait(batch)
+                    except queue.Full:
+                        with self._dropped_lock:
+                            self.dropped += len(batch)
+
+    def close(self):
+        self._server.close()
+
+    def __iter__(self):
+        while True:
+            try:
+                batch = self._queue.get(timeout=self.timeout)
+            except queue.Empty:
+                yield []
+                continue
+            while len(batch) < self.max_batch:
+                try:
+                    batch.extend(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            yield batch
+
+
+def feed_source(feed):
+    # Source for GCRES_SENSOR_FEED: tcp://host:port listens for readings, anything else is a file to follow
+    if feed.startswith("tcp://"):
+        host, port = feed[len("tcp://"):].rsplit(":", 1)
+        return SocketSource(host, int(port))
+    return FileTailSource(feed)
+
+
+def _parse_line(line):
+    # Readings of one feed line; None for a line that is not a valid record
+    # (the sources count those in `rejected`), [] for a blank one
+    if not line.strip():
+        return []
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict) or not isinstance(record.get("room"), str):
+            return None
+        ts = float(record.get("ts", time.time()))
+        return [(record["room"], m, ts, float(record[m])) for m in metrics if m in record]
+    except (ValueError, TypeError):
+        return None  # Not JSON, or a ts / value that is not a number
+
+
+# --- Ingestion thread ---
+
+class Ingestor:
+    def __init__(self, store, source):
+        self.store = store
+        self.source = source
+        self.ingested = 0
+        self.failed_batches = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, prime=True):
+        it = iter(self.source)
+        if prime:
+            # Ingest the first batch synchronously so the first render has data
+            self.ingested += self.store.extend(next(it))
+        self._thread = threading.Thread(target=self._run, args=(it,), name="gcres-ingestor", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self, it):
+        for batch in it:
+            if self._stop.is_set():
+                break
+            if batch:
+                try:
+                    self.ingested += self.store.extend(batch)
+                except Exception:  # One bad batch must not stop ingestion
+                    self.failed_batches += 1
+                    log.exception("sensor batch of %d readings failed", len(batch))
+
+    def stop(self):
+        self._stop.set()
+        close = getattr(self.source, "close", None)
+        if close is not None:
+            close()  # Free e.g. a SocketSource's port
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
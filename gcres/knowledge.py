@@ -0,0 +1,85 @@
+# Shared knowledge base for the agents.
+#
+# One instance lives for the whole process (see gcres.resources), so it is
+# shared by reruns and sessions and guarded by a lock. Every key carries a
+# version, an update time and an optional TTL. Agents record which input
+# versions a value was computed from and skip recomputing until one of those
+# inputs changes (derive / is_fresh).
+
+import threading
+import time
+
+
+class Entry:
+    def __init__(self, value, version, ttl=None, inputs=None):
+        self.value = value
+        self.version = version
+        self.updated = time.time()
+        self.ttl = ttl  # Seconds, None = never expires
+        self.inputs = inputs  # Versions of the keys this value was derived from
+
+    @property
+    def expired(self):
+        return self.ttl is not None and time.time() - self.updated > self.ttl
+
+
+class KnowledgeBase:
+    def __init__(self):
+        self.data = {}
+        self._lock = threading.RLock()
+        self._key_locks = {}
+
+    def update(self, key, value, ttl=None, inputs=None):
+        with self._lock:
+            old = self.data.get(key)
+            self.data[key] = Entry(value, old.version + 1 if old else 1, ttl, inputs)
+
+    def get(self, key, default=None, stale_ok=False):
+        # Expired values are only returned with stale_ok, e.g. to show the last
+        # output of an agent that timed out
+        with self._lock:
+            entry = self.data.get(key)
+        if entry is None or (entry.expired and not stale_ok):
+            return default
+        return entry.value
+
+    def entry(self, key):
+        with self._lock:
+            return self.data.get(key)
+
+    def version(self, key):
+        with self._lock:
+            entry = self.data.get(key)
+            return entry.version if entry else 0
+
+    def versions(self, keys):
+        with self._lock:
+            return tuple(self.data[k].version if k in self.data else 0 for k in keys)
+
+    def is_fresh(self, key, inputs=()):
+        # Present, not expired, and computed from the current versions of `inputs`
+        with self._lock:
+            entry = self.data.get(key)
+            if entry is None or entry.expired:
+                return False
+            return not inputs or entry.inputs == self.versions(inputs)
+
+    def derive(self, key, inputs, compute, ttl=None):
+        # Value of `key`, recomputed with compute() only when an input changed or
+        # the TTL ran out. Concurrent callers wait for one computation instead of
+        # all doing it.
+        if self.is_fresh(key, inputs):
+            return self.data[key].value
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if self.is_fresh(key, inputs):
+                return self.data[key].value
+            signature = self.versions(inputs)
+            value = compute()
+            self.update(key, value, ttl=ttl, inputs=signature)
+            return value
+
+    def keys(self):
+        with self._lock:
+            return list(self.data)
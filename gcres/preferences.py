@@ -0,0 +1,321 @@
+# Per-user room preferences for the Learning Agent.
+#
+# Every booking and every piece of feedback is an event (user, room, weight):
+# a booking counts +1, a thumbs up / down +/-feedback_weight. A preference is
+# the exponentially decayed sum of a user's events for a room, with a
+# half-life of half_life_days, so old habits fade.
+#
+# Decay uses a landmark time t0: an event at time t is stored as
+# weight * 2 ** ((t - t0) / half_life), and every stored value is scaled by
+# the same 2 ** (-(now - t0) / half_life) when read. Nothing has to be
+# touched as time passes and the order of a user's rooms never changes by
+# decay alone. When the stored values grow too large, everything is rescaled
+# to a new landmark.
+#
+# Storage is sparse and fixed-size per user. Each user has a row of
+# max_rooms (room, value) slots in two (users, max_rooms) arrays, kept
+# sorted by value with the best room first. An event touches one row of
+# max_rooms entries, and a user's top rooms are the first entries of its row,
+# both independent of how many users and rooms there are. A full row evicts
+# its weakest preference (the value closest to 0). Room popularity over all
+# users is one dense array over the rooms, the fallback for users without
+# history. 100k users x 32 slots take about 40 MB (plus growth headroom).
+#
+# The state is saved to a local .npz file (atomically, by a timer
+# save_interval seconds after the first unsaved change, and at interpreter
+# exit) and loaded on start.
+# Rooms are stored by name, so a changed catalog keeps what still applies.
+
+import atexit
+import os
+import threading
+import time
+
+import numpy as np
+
+from gcres.profiling import timed
+
+default_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "preferences.npz")
+day_seconds = 86400
+booking_weight = 1.0
+feedback_weight = 2.0
+# Largest stored exponent (log2) before rescaling to a new landmark
+_max_exponent = 500.0
+
+
+def preferences_path(path=None):
+    return path or os.environ.get("GCRES_PREFERENCES") or default_path
+
+
+class PreferenceModel:
+    def __init__(self, rooms, path=None, half_life_days=30.0, max_rooms=32, save_interval=5.0):
+        self.rooms = list(rooms)
+        self.index = {room: i for i, room in enumerate(self.rooms)}
+        self.path = path  # None = not persisted
+        self.half_life = half_life_days * day_seconds
+        self.max_rooms = max_rooms
+        self.save_interval = save_interval
+        self.users = []
+        self.user_index = {}
+        self._room = np.full((0, max_rooms), -1, dtype=np.int32)  # Per user, slots sorted by value
+        self._value = np.zeros((0, max_rooms), dtype=np.float64)
+        self._count = np.zeros(0, dtype=np.int32)  # Used slots per user
+        self.popularity = np.zeros(len(self.rooms), dtype=np.float64)  # Stored values, all users
+        self.t0 = time.time()
+        self.events = 0
+        self.version = 0  # Bumped on every event
+        self._saved_version = 0
+        self._saver = None  # Pending save timer
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()  # One writer of the file at a time
+        self._listeners = []
+        if path is not None and os.path.exists(path):
+            self.load(path)
+        if path is not None:
+            atexit.register(self.save)  # Whatever the timer has not written yet
+
+    def add_listener(self, fn):
+        # fn(model) is called after each event, outside the lock
+        self._listeners.append(fn)
+
+    # --- Decay ---
+
+    def _boost(self, ts):
+        # Stored value of a unit event at ts
+        exponent = (ts - self.t0) / self.half_life
+        if exponent > _max_exponent:
+            self._rebase(ts)
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _rebase(self, ts):
+        scale = 2.0 ** (-(ts - self.t0) / self.half_life)
+        self._value *= scale
+        self.popularity *= scale
+        self.t0 = ts
+
+    def _decay(self, now=None):
+        # Factor turning stored values into current scores
+        now = time.time() if now is None else now
+        return 2.0 ** (-(now - self.t0) / self.half_life)
+
+    # --- Events ---
+
+    def _user_row(self, user):
+        u = self.user_index.get(user)
+        if u is not None:
+            return u
+        u = len(self.users)
+        if u == len(self._count):
+            grow = max(1024, u)
+            self._room = np.vstack([self._room, np.full((grow, self.max_rooms), -1, dtype=np.int32)])
+            self._value = np.vstack([self._value, np.zeros((grow, self.max_rooms))])
+            self._count = np.concatenate([self._count, np.zeros(grow, dtype=np.int32)])
+        self.users.append(user)
+        self.user_index[user] = u
+        return u
+
+    def observe(self, user, room, weight=booking_weight, ts=None):
+        # One event: `user` (None = anonymous, popularity only) chose `room`
+        # (weight > 0) or rejected it (weight < 0)
+        r = self.index.get(room)
+        if r is None:
+            return
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            value = weight * self._boost(ts)
+            if weight > 0:
+                self.popularity[r] += value
+            if user is not None:
+                self._update(self._user_row(user), r, value)
+            self.events += 1
+            self.version += 1
+        for fn in self._listeners:
+            fn(self)
+        self._maybe_save()
+
+    def feedback(self, user, room, liked, ts=None):
+        self.observe(user, room, feedback_weight if liked else -feedback_weight, ts)
+
+    def on_booking(self, room, start, end, who):
+        # BookingStore booking listener
+        self.observe(who, room, booking_weight)
+
+    def _update(self, u, r, value):
+        rooms, values = self._room[u], self._value[u]
+        n = int(self._count[u])
+        hit = np.flatnonzero(rooms[:n] == r)
+        if len(hit):
+            j = int(hit[0])
+            values[j] += value
+        elif n < self.max_rooms:
+            j = n
+            rooms[j], values[j] = r, value
+            self._count[u] = n + 1
+        else:
+            # Full: the new room replaces the weakest preference
+            j = int(np.argmin(np.abs(values)))
+            rooms[j], values[j] = r, value
+        # Move entry j to its place in the sorted row (one shift of at most max_rooms)
+        n = int(self._count[u])
+        room, v = rooms[j], values[j]
+        k = j
+        while k > 0 and values[k - 1] < v:
+            k -= 1
+        while k < n - 1 and values[k + 1] > v:
+            k += 1
+        if k < j:
+            rooms[k + 1:j + 1], values[k + 1:j + 1] = rooms[k:j].copy(), values[k:j].copy()
+        elif k > j:
+            rooms[j:k], values[j:k] = rooms[j + 1:k + 1].copy(), values[j + 1:k + 1].copy()
+        rooms[k], values[k] = room, v
+
+    @timed("preference fit")
+    def fit(self, bookings):
+        # Seed from a BookingStore's existing bookings, each counted at its
+        # start (or now, for future ones)
+        now = time.time()
+        rooms, starts, _ = bookings.overlapping(-np.inf, np.inf)
+        positions = np.array([self.index.get(room, -1) for room in bookings.rooms] + [-1], dtype=np.int64)
+        rooms = positions[rooms]
+        keep = rooms >= 0
+        rooms, starts = rooms[keep], np.minimum(starts[keep], now)
+        with self._lock:
+            if len(starts) and (starts.max() - self.t0) / self.half_life > _max_exponent:
+                self._rebase(float(starts.max()))
+            # Popularity over every booking, vectorized
+            self.popularity += np.bincount(rooms, weights=booking_weight * 2.0 ** ((starts - self.t0) / self.half_life),
+                                           minlength=len(self.rooms))
+            # Per-user rows only for bookings that name who made them
+            for room in bookings.rooms:
+                r = self.index.get(room)
+                if r is None:
+                    continue
+                for start, _, who in bookings.bookings(room):
+                    if who is not None:
+                        self._update(self._user_row(who), r, booking_weight * self._boost(min(start, now)))
+            self.events += len(starts)
+            self.version += 1
+        self._maybe_save()
+        return self
+
+    # --- Queries ---
+
+    def top(self, user, n=5, now=None):
+        # The user's n most preferred rooms as [(room, score)], best first: O(n)
+        u = self.user_index.get(user)
+        if u is None:
+            return []
+        decay = self._decay(now)
+        with self._lock:
+            count = min(n, int(self._count[u]))
+            rooms, values = self._room[u, :count].tolist(), self._value[u, :count].tolist()
+        return [(self.rooms[r], v * decay) for r, v in zip(rooms, values) if v > 0]
+
+    def scores(self, user):
+        # Learning Agent values on the agents' 0-5 scale for the user's rooms:
+        # 5 for the favourite, down to -5 for the room they reject most.
+        # Rooms without events are left out (0).
+        u = self.user_index.get(user)
+        if u is None:
+            return {}
+        with self._lock:
+            count = int(self._count[u])
+            rooms, values = self._room[u, :count], self._value[u, :count]
+            scale = np.abs(values).max() if count else 0.0
+            if scale == 0:
+                return {}
+            return {self.rooms[r]: round(float(v), 1) for r, v in zip(rooms.tolist(), (5 * values / scale).tolist())}
+
+    def popular(self, rooms=None):
+        # Popularity over all users on the 0-5 scale, the fallback for users without history
+        with self._lock:
+            top = self.popularity.max() if len(self.popularity) else 0.0
+            values = 5 * self.popularity / top if top > 0 else np.zeros(len(self.popularity))
+        if rooms is None:
+            return dict(zip(self.rooms, np.round(values, 1).tolist()))
+        return {room: round(float(values[self.index[room]]), 1) if room in self.index else 0.0 for room in rooms}
+
+    @property
+    def nbytes(self):
+        return self._room.nbytes + self._value.nbytes + self._count.nbytes + self.popularity.nbytes
+
+    # --- Persistence ---
+
+    def _maybe_save(self):
+        # One timer per burst of changes, so a change is on disk within
+        # save_interval seconds however sparse the events are
+        if self.path is None or self.save_interval == float("inf"):
+            return
+        with self._lock:
+            if self._saver is not None:
+                return
+            self._saver = threading.Timer(self.save_interval, self._timed_save)
+            self._saver.daemon = True
+        self._saver.start()
+
+    def _timed_save(self):
+        with self._lock:
+            self._saver = None
+        self.save()
+
+    def save(self, path=None):
+        path = path or self.path
+        if path is None:
+            return
+        with self._lock:
+            if self.version == self._saved_version and os.path.exists(path):
+                return
+            n = len(self.users)
+            state = {"users": np.array(self.users, dtype=str), "rooms": np.array(self.rooms, dtype=str),
+                     "slot_room": self._room[:n].copy(), "slot_value": self._value[:n].copy(),
+                     "count": self._count[:n].copy(), "popularity": self.popularity.copy(),
+                     "t0": np.float64(self.t0), "half_life": np.float64(self.half_life),
+                     "events": np.int64(self.events)}
+            version = self.version
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._save_lock:
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                np.savez(f, **state)
+            os.replace(tmp, path)  # Readers never see half a file
+            self._saved_version = max(self._saved_version, version)
+
+    def load(self, path=None):
+        with np.load(path or self.path) as state:
+            users = state["users"].tolist()
+            old_rooms = state["rooms"].tolist()
+            slot_room, slot_value = state["slot_room"], state["slot_value"]
+            count, popularity = state["count"], state["popularity"]
+            t0, half_life, events = float(state["t0"]), float(state["half_life"]), int(state["events"])
+        # Saved room positions -> current catalog positions (-1 = gone)
+        remap = np.array([self.index.get(room, -1) for room in old_rooms] + [-1], dtype=np.int32)
+        slot_room = remap[np.where(slot_room >= 0, slot_room, len(old_rooms))]
+        valid = (slot_room >= 0) & (np.arange(slot_room.shape[1]) < count[:, None])
+        # Keep the valid slots in value order, best first
+        order = np.lexsort((-slot_value, ~valid), axis=1)
+        slot_room = np.take_along_axis(np.where(valid, slot_room, -1), order, axis=1)
+        slot_value = np.take_along_axis(np.where(valid, slot_value, 0.0), order, axis=1)
+        width = min(self.max_rooms, slot_room.shape[1])
+        with self._lock:
+            self.users = users
+            self.user_index = {user: u for u, user in enumerate(users)}
+            self._room = np.full((len(users), self.max_rooms), -1, dtype=np.int32)
+            self._value = np.zeros((len(users), self.max_rooms))
+            self._room[:, :width], self._value[:, :width] = slot_room[:, :width], slot_value[:, :width]
+            self._count = np.minimum(valid.sum(axis=1), self.max_rooms).astype(np.int32)
+            self.popularity = np.zeros(len(self.rooms))
+            known = remap[:-1] >= 0
+            self.popularity[remap[:-1][known]] = popularity[known]
+            # Values are relative to the saved landmark. With a different
+            # half-life, restate today's scores against a landmark of now.
+            self.t0 = t0
+            if half_life != self.half_life:
+                self.t0 = time.time()
+                scale = 2.0 ** (-(self.t0 - t0) / half_life)
+                self._value *= scale
+                self.popularity *= scale
+            self.events = events
+            self.version += 1
+            self._saved_version = self.version
+        return self
@@ -0,0 +1,173 @@
+# Lightweight timing of the hot paths, per page and per stage.
+#
+#   with stage("scoring"):          # or @timed("scoring") on a function
+#       ...
+#
+# Each stage records its wall time and the change in process RSS into a
+# bounded window of recent samples (for p50/p95/p99) plus cumulative
+# Prometheus-style histogram buckets. home.py sets the current page around
+# pg.run(), so the same stage is reported separately for every page that hits
+# it. The numbers can be written to a file as JSON or Prometheus text.
+#
+# RSS is per process, so memory deltas include whatever other sessions
+# allocated at the same time; read them as a trend, not an exact figure.
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+# Upper bounds (seconds) of the exported histogram buckets, +Inf is implicit
+buckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+window = 2048  # Recent samples kept per (page, stage) for percentiles
+
+_current_page = contextvars.ContextVar("gcres_page", default="-")
+_page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss():
+    # Resident set size of this process in bytes (0 where /proc is unavailable)
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _page_size
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class _Series:
+    def __init__(self):
+        self.seconds = np.zeros(window, dtype=np.float64)
+        self.memory = np.zeros(window, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.bucket_counts = np.zeros(len(buckets) + 1, dtype=np.int64)
+
+    def add(self, seconds, memory):
+        i = self.count % window
+        self.seconds[i] = seconds
+        self.memory[i] = memory
+        self.count += 1
+        self.total += seconds
+        self.bucket_counts[np.searchsorted(buckets, seconds)] += 1
+
+    def summary(self):
+        n = min(self.count, window)
+        p50, p95, p99 = np.percentile(self.seconds[:n], (50, 95, 99)) if n else (0.0, 0.0, 0.0)
+        return {
+            "count": self.count,
+            "sum_s": self.total,
+            "p50_ms": p50 * 1e3,
+            "p95_ms": p95 * 1e3,
+            "p99_ms": p99 * 1e3,
+            "max_ms": float(self.seconds[:n].max()) * 1e3 if n else 0.0,
+            "mem_mean_mb": float(self.memory[:n].mean()) / 2**20 if n else 0.0,
+            "mem_max_mb": float(self.memory[:n].max()) / 2**20 if n else 0.0,
+        }
+
+
+class Profiler:
+    def __init__(self):
+        self._series = {}  # (page, stage) -> _Series
+        self._lock = threading.Lock()
+        self.enabled = os.environ.get("GCRES_PROFILE", "1") != "0"
+
+    def record(self, stage, seconds, memory=0, page=None):
+        key = (page or _current_page.get(), stage)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.add(seconds, memory)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        mem = rss()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, rss() - mem)
+
+    @contextlib.contextmanager
+    def page(self, name):
+        # Stages inside are attributed to page `name`; the page itself is timed as "page"
+        token = _current_page.set(name)
+        try:
+            with self.stage("page"):
+                yield
+        finally:
+            _current_page.reset(token)
+
+    def timed(self, name):
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def summary(self):
+        # [{"page", "stage", "count", "p50_ms", ...}] for every recorded stage
+        with self._lock:
+            return [{"page": page, "stage": stage, **series.summary()}
+                    for (page, stage), series in sorted(self._series.items())]
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def to_json(self):
+        return json.dumps({"generated": time.time(), "buckets": list(buckets), "stages": self.summary()}, indent=2)
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP gcres_stage_seconds Wall time of a dashboard stage.",
+            "# TYPE gcres_stage_seconds histogram",
+        ]
+        with self._lock:
+            items = sorted(self._series.items())
+            snapshot = [(page, stage, series.bucket_counts.cumsum(), series.total, series.count)
+                        for (page, stage), series in items]
+        for page, stage, cumulative, total, count in snapshot:
+            labels = f'page="{_escape(page)}",stage="{_escape(stage)}"'
+            for bound, n in zip((*buckets, "+Inf"), cumulative):
+                lines.append(f'gcres_stage_seconds_bucket{{{labels},le="{bound}"}} {n}')
+            lines.append(f"gcres_stage_seconds_sum{{{labels}}} {total:.6f}")
+            lines.append(f"gcres_stage_seconds_count{{{labels}}} {count}")
+        lines += [
+            "# HELP gcres_stage_memory_delta_bytes Mean change in process RSS over a stage (recent samples).",
+            "# TYPE gcres_stage_memory_delta_bytes gauge",
+        ]
+        for row in self.summary():
+            labels = f'page="{_escape(row["page"])}",stage="{_escape(row["stage"])}"'
+            lines.append(f"gcres_stage_memory_delta_bytes{{{labels}}} {row['mem_mean_mb'] * 2**20:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        # Writes JSON, or Prometheus text when path ends in .prom / .txt
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+        return path
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# The one profiler for this process
+profiler = Profiler()
+stage = profiler.stage
+timed = profiler.timed
@@ -0,0 +1,111 @@
+# Process-wide resources shared by every page in home.py's navigation.
+#
+# Streamlit re-executes a page script on each interaction; the state behind the
+# pages lives in one gcres.engine.Engine per process, created here with
+# st.cache_resource and reused by all reruns and sessions. The getters below
+# hand out its parts; the engine rebuilds them when the catalog file changes.
+
+import os
+
+import streamlit as st
+
+from gcres.client import ServiceClient
+from gcres.engine import Engine
+
+
+@st.cache_resource(show_spinner=False)
+def get_engine():
+    # Catalog, indexes, sensor ingestion, bookings and knowledge base for this process
+    return Engine()
+
+
+@st.cache_resource(show_spinner=False)
+def _service_client(url):
+    return ServiceClient(url)
+
+
+def get_service():
+    # score / recommend / availability: the HTTP service at $GCRES_SERVICE_URL
+    # (python -m gcres.service) when set, otherwise the in-process engine
+    url = os.environ.get("GCRES_SERVICE_URL")
+    return _service_client(url) if url else get_engine()
+
+
+def get_knowledge_base():
+    # One knowledge base for all pages, reruns and sessions
+    return get_engine().kb
+
+
+def get_catalog():
+    # The returned Catalog is shared, so copy catalog.rooms before mutating it
+    return get_engine().catalog
+
+
+def get_ingestor():
+    return get_engine().ingestor
+
+
+def get_sensor_store():
+    # Latest readings and short history for every catalog room
+    return get_engine().sensor_store
+
+
+def get_rollups():
+    # 1-minute / 15-minute / hourly min/mean/max per room, updated on ingest
+    return get_engine().rollups
+
+
+def get_history():
+    # Sensor readings kept on disk across restarts; None when disabled
+    return get_engine().history
+
+
+def get_alert_engine():
+    # Active sensor alerts and recent raise / resolve events (gcres.alerts)
+    return get_engine().alerts
+
+
+def get_demand_model():
+    # Occupancy and booking demand per room and time of day (gcres.forecast)
+    return get_engine().demand_model
+
+
+def get_calendar_store():
+    # Room calendars from iCalendar exports (gcres.calendars)
+    return get_engine().calendars
+
+
+def get_preference_model():
+    # Per-user room preferences for the Learning Agent (gcres.preferences)
+    return get_engine().preferences
+
+
+def get_booking_store():
+    # Bookings for every catalog room, shared by all sessions; lives for the process
+    return get_engine().bookings
+
+
+def get_orchestrator():
+    # Agents share their outputs through the knowledge base, so one
+    # orchestrator serves every session
+    return get_engine().orchestrator
+
+
+def get_room_index():
+    # Sorted / bitmap indexes over the static room attributes
+    return get_engine().room_index
+
+
+def get_spatial_index():
+    # Grid index over room coordinates, positions aligned with catalog.rooms
+    return get_engine().spatial_index
+
+
+def get_room_table():
+    # Compact columnar room attributes, row i is catalog room i
+    return get_engine().room_table
+
+
+def get_sensor_snapshot():
+    # Latest readings as compact arrays aligned with get_room_table()
+    return get_engine().sensor_snapshot()
@@ -0,0 +1,126 @@
+# Vectorized room scoring shared by the comparison / live IoT pages.
+#
+# The pages used to score with df.apply(calculate_score, axis=1), i.e. one Python
+# loop per room over the weights dict. Here the criteria matrix and the weights
+# vector are built once and every room is scored in the same array operations.
+
+import numpy as np
+import pandas as pd
+
+from gcres.profiling import timed
+
+# Criteria fed by sensors rather than room attributes
+DYNAMIC_CRITERIA = ("HVAC Temp", "Current Occupancy")
+
+# Weights of the live IoT pages, used where no page-specific weights apply
+default_weights = {
+    "Occupancy Suitability": 0.20,
+    "Natural Lighting": 0.10,
+    "Energy Efficiency": 0.15,
+    "AV/Tech Availability": 0.10,
+    "Noise Isolation": 0.05,
+    "Proximity to Team Zone": 0.05,
+    "Availability": 0.25,
+    "HVAC Temp": 0.05,
+    "Current Occupancy": 0.05
+}
+
+ideal_temp = 22.0
+ideal_occupancy = 4
+temp_penalty_rate = 0.1  # Score lost per °C away from ideal_temp
+max_occupancy_bonus = 5  # Bonus when occupancy == ideal_occupancy
+
+
+def static_criteria(weights):
+    return [crit for crit in weights if crit not in DYNAMIC_CRITERIA]
+
+
+def weight_vector(weights, criteria=None):
+    criteria = static_criteria(weights) if criteria is None else criteria
+    return np.array([weights[crit] for crit in criteria], dtype=np.float64)
+
+
+def criteria_matrix(df, criteria):
+    return df[list(criteria)].to_numpy(dtype=np.float64)
+
+
+def weighted_sum(X, w):
+    # Matrix-vector product X @ w, accumulated one criterion column at a time in
+    # the weights' order. BLAS is free to reorder the additions, which changes
+    # the last bit of some scores (and can flip ties); this keeps the old
+    # left-to-right sum exact while still being vectorized over rooms.
+    scores = np.zeros(X.shape[0], dtype=np.float64)
+    for j in range(X.shape[1]):
+        scores += X[:, j] * w[j]
+    return scores
+
+
+def score_arrays(X, w, temp=None, occupancy=None, occupancy_weight=0.0):
+    # X: (rooms, criteria) matrix, w: (criteria,) weights
+    return apply_sensor_terms(weighted_sum(X, w), temp, occupancy, occupancy_weight)
+
+
+def apply_sensor_terms(scores, temp=None, occupancy=None, occupancy_weight=0.0):
+    # Temperature penalty and occupancy bonus, added in place to scores
+    if temp is not None:
+        scores -= np.abs(np.asarray(temp, dtype=np.float64) - ideal_temp) * temp_penalty_rate
+    if occupancy is not None:
+        occupancy_bonus = max_occupancy_bonus - np.abs(np.asarray(occupancy, dtype=np.float64) - ideal_occupancy)
+        scores += occupancy_bonus * occupancy_weight
+    return scores
+
+
+def calculate_scores(df, weights):
+    # Same result as the old row-wise calculate_score, for every row at once.
+    # The sensor terms are only applied when the weights mention them (the
+    # comparison table page scores static criteria only).
+    criteria = static_criteria(weights)
+    X = criteria_matrix(df, criteria)
+    w = weight_vector(weights, criteria)
+    temp = df["HVAC Temp"].to_numpy() if "HVAC Temp" in weights else None
+    occupancy = df["Current Occupancy"].to_numpy() if "Current Occupancy" in weights else None
+    return score_arrays(X, w, temp, occupancy, weights.get("Current Occupancy", 0.0))
+
+
+def top_k(scores, k):
+    # Indices of the k best scores, best first. argpartition is O(n), only the
+    # k selected rows get sorted.
+    scores = np.asarray(scores)
+    n = len(scores)
+    if k is None or k >= n:
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+@timed("scoring")
+def rank_rooms(df, weights, k=None, column="Weighted Score"):
+    # Score df and return its top-k rows (all rows when k is None), best first
+    scores = calculate_scores(df, weights)
+    order = top_k(scores, k)
+    ranked = df.iloc[order].copy()
+    ranked[column] = scores[order]
+    return ranked
+
+
+def encode_ratings(frame, rating_map, criteria, defaults=None, unknown=2):
+    # Rating labels ("High", "Quiet", ...) -> (rooms, criteria) integer matrix in
+    # one pass. Columns missing from frame take defaults[crit]; labels not in
+    # rating_map score `unknown`, like rating_map.get(selection, 2) in the selector.
+    defaults = defaults or {}
+    labels = list(rating_map)
+    lut = np.array([rating_map[label] for label in labels] + [unknown], dtype=np.int16)  # code -1 -> unknown
+    values = np.empty((len(frame), len(criteria)), dtype=object)
+    for j, crit in enumerate(criteria):
+        values[:, j] = frame[crit].to_numpy() if crit in frame else defaults.get(crit)
+    codes = pd.Categorical(values.ravel(), categories=labels).codes
+    return lut[codes].reshape(values.shape)
+
+
+@timed("selector scoring")
+def rating_scores(matrix, criteria_weights):
+    # Selector score per room: sum(rating * weight) as one integer dot product
+    w = np.array(list(criteria_weights.values()), dtype=np.int64)
+    return matrix.astype(np.int64) @ w
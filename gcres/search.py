@@ -0,0 +1,97 @@
+# Preference-based room search over the catalog and the latest sensor snapshot.
+#
+# Static attributes are indexed once per catalog version: capacity as a sorted
+# array (range queries by searchsorted), floor as a posting list per value, and
+# quiet / projector as bitmaps. A query starts from the most selective indexed
+# constraint, checks the remaining ones on those candidates only, drops rooms
+# that are booked in the requested interval and returns the top-k by score.
+
+import numpy as np
+
+from gcres.profiling import timed
+from gcres.scoring import (apply_sensor_terms, criteria_matrix, default_weights, ideal_occupancy, ideal_temp,
+                           static_criteria, top_k, weighted_sum)
+
+
+class RoomIndex:
+    def __init__(self, rooms, weights=default_weights):
+        self.names = rooms["Room"].tolist()
+        self.position = {room: i for i, room in enumerate(self.names)}
+        self.capacity = rooms["Capacity"].to_numpy(dtype=np.int32)
+        self.floor = rooms["Floor"].to_numpy(dtype=np.int16)
+        self.quiet = rooms["Quiet"].to_numpy().astype(bool)
+        self.projector = rooms["Projector"].to_numpy().astype(bool)
+        # Sorted index on capacity
+        self._capacity_order = np.argsort(self.capacity, kind="stable")
+        self._capacity_sorted = self.capacity[self._capacity_order]
+        # Posting lists: floor value / flag -> sorted room positions
+        self._floors = {int(f): np.flatnonzero(self.floor == f) for f in np.unique(self.floor)}
+        self._quiet_rooms = np.flatnonzero(self.quiet)
+        self._projector_rooms = np.flatnonzero(self.projector)
+        # Static part of the score, computed once
+        self.weights = weights
+        criteria = static_criteria(weights)
+        self.static_score = weighted_sum(criteria_matrix(rooms, criteria), np.array([weights[c] for c in criteria]))
+
+    def __len__(self):
+        return len(self.names)
+
+    def _candidates(self, quiet, projector, min_capacity, floor):
+        # Position arrays from each indexed constraint; the smallest one seeds the query
+        lists = []
+        if quiet:
+            lists.append(self._quiet_rooms)
+        if projector:
+            lists.append(self._projector_rooms)
+        if min_capacity is not None:
+            lo = np.searchsorted(self._capacity_sorted, min_capacity, side="left")
+            lists.append(self._capacity_order[lo:])
+        if floor is not None:
+            lists.append(self._floors.get(int(floor), np.empty(0, dtype=np.int64)))
+        if not lists:
+            return np.arange(len(self.names))
+        return min(lists, key=len)
+
+    def matches(self, max_temp=None, quiet=False, projector=False, min_capacity=None, floor=None, temps=None, busy=None):
+        # Positions of the rooms meeting every constraint, in catalog order.
+        # temps: latest readings aligned with the catalog (NaN = no reading);
+        # busy: positions of rooms booked in the requested interval.
+        cand = self._candidates(quiet, projector, min_capacity, floor)
+        keep = np.ones(len(cand), dtype=bool)
+        if quiet:
+            keep &= self.quiet[cand]
+        if projector:
+            keep &= self.projector[cand]
+        if min_capacity is not None:
+            keep &= self.capacity[cand] >= min_capacity
+        if floor is not None:
+            keep &= self.floor[cand] == floor
+        if max_temp is not None and temps is not None:
+            keep &= temps[cand] < max_temp  # NaN (no reading) never matches
+        if busy is not None and len(busy):
+            booked = np.zeros(len(self.names), dtype=bool)
+            booked[busy] = True
+            keep &= ~booked[cand]
+        return cand[keep]
+
+    def scores(self, cand=None, temps=None, occupancy=None):
+        # Static part precomputed, sensor terms only for the rooms at cand (all when None)
+        cand = np.arange(len(self.names)) if cand is None else cand
+        return apply_sensor_terms(
+            self.static_score[cand],
+            temp=None if temps is None or "HVAC Temp" not in self.weights else np.nan_to_num(temps[cand], nan=ideal_temp),
+            occupancy=None if occupancy is None or "Current Occupancy" not in self.weights else np.nan_to_num(occupancy[cand], nan=ideal_occupancy),
+            occupancy_weight=self.weights.get("Current Occupancy", 0.0),
+        )
+
+    @timed("room search")
+    def query(self, max_temp=None, quiet=False, projector=False, min_capacity=None, floor=None,
+              temps=None, occupancy=None, busy=None, k=5):
+        # Top-k rooms meeting the constraints (see matches) by score.
+        # Returns [(room, score), ...] best first.
+        cand = self.matches(max_temp, quiet, projector, min_capacity, floor, temps, busy)
+        if len(cand) == 0:
+            return []
+        scores = self.scores(cand, temps, occupancy)
+        best = top_k(scores, k)
+        return [(self.names[cand[i]], float(scores[i])) for i in best]
@@ -0,0 +1,20 @@
+# Simulated sensor readings for rooms without real IoT feeds.
+
+import random
+
+# (temp low, temp high, occupancy low, occupancy high) per sample room
+sample_ranges = {
+    "Room A": (21.0, 23.5, 1, 6),
+    "Room B": (23.0, 25.5, 2, 8),
+    "Room C": (20.0, 22.5, 1, 5),
+}
+default_range = (21.0, 24.0, 1, 6)
+
+
+def simulated_reading(room, rng=random):
+    temp_low, temp_high, occ_low, occ_high = sample_ranges.get(room, default_range)
+    return {"temp": round(rng.uniform(temp_low, temp_high), 1), "occupancy": rng.randint(occ_low, occ_high)}
+
+
+def simulated_readings(rooms, rng=random):
+    return {room: simulated_reading(room, rng) for room in rooms}
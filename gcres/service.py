@@ -0,0 +1,85 @@
+# Local HTTP/JSON service in front of one long-lived Engine.
+#
+#   POST /score          {"weights": {...}, "start": "2026-01-05T10:00", "end": ..., "k": 50}
+#   POST /recommend      {"preferences": {"max_temp": 23, "quiet": true, ...}, "k": 5}
+#   POST /availability   {"start": ..., "end": ..., "rooms": ["Room A"], "free_only": false}
+#   POST /assign         {"requests": [{"start": ..., "end": ..., "headcount": 6, "preferences": {...}}, ...]}
+#   GET  /health         catalog / sensor / booking versions
+#
+# Each endpoint also accepts a JSON array of requests and answers with an array
+# of results (errors reported per item). Requests are parsed on the event loop
+# and computed on a pool of worker threads, so slow queries don't hold up the
+# others; the engine's state (catalog, indexes, sensor ingestion, bookings,
+# result cache) stays in memory between requests.
+#
+#   python -m gcres.service [--host 127.0.0.1] [--port 8765] [--workers 8]
+
+import argparse
+import asyncio
+import contextlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from gcres.engine import Engine
+
+default_port = 8765
+
+
+def create_app(engine=None, workers=None):
+    engine = Engine() if engine is None else engine
+    pool = ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4),
+                              thread_name_prefix="gcres-api")
+
+    async def run(fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+    async def endpoint(request):
+        name = request.url.path.strip("/")
+        try:
+            payload = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "request body must be JSON"}, status_code=400)
+        if isinstance(payload, list):
+            # Batch: items run concurrently on the pool, errors stay per item
+            results = await asyncio.gather(*(run(engine.call_one, name, item, True) for item in payload))
+            return JSONResponse(results)
+        try:
+            return JSONResponse(await run(engine.call, name, payload))
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+
+    async def health(request):
+        return JSONResponse({"status": "ok", "rooms": len(engine.catalog), "versions": await run(engine.versions)})
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        await run(engine.versions)  # Load the catalog and start ingestion before the first request
+        yield
+        engine.close()
+        pool.shutdown(wait=False)
+
+    routes = [Route(f"/{name}", endpoint, methods=["POST"]) for name in Engine.endpoints]
+    routes.append(Route("/health", health, methods=["GET"]))
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.engine = engine
+    return app
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve room scoring, recommendations, availability and batch assignment over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=default_port)
+    parser.add_argument("--workers", type=int, help="worker threads computing requests")
+    parser.add_argument("--catalog", help="catalog file (default: $GCRES_CATALOG or data/rooms.sqlite)")
+    args = parser.parse_args(argv)
+    uvicorn.run(create_app(Engine(args.catalog), args.workers), host=args.host, port=args.port, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
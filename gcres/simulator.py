@@ -0,0 +1,207 @@
+# Multi-process sensor simulator and load generator.
+#
+# Emits temperature / occupancy readings for every catalog room as JSON lines
+# in the format gcres.ingest reads (FileTailSource / SocketSource):
+#
+#   {"room": "B1-F02-007", "ts": 1718000000.123, "temp": 22.4, "occupancy": 3}
+#
+# Rooms are split into shards, one per worker process. Each worker keeps its
+# rooms' state in NumPy arrays and advances it every tick, so readings are
+# correlated in time rather than independent draws:
+#
+#   temperature  Ornstein-Uhlenbeck process pulled towards the room's setpoint
+#                plus a daily swing and body heat from its occupants
+#   occupancy    meetings that last ~30 minutes on average; when one ends the
+#                next headcount is drawn around the room's mean, scaled by a
+#                working-hours profile
+#
+# Output goes to a file (appended with whole lines per write, so several
+# workers can share it; point GCRES_SENSOR_FEED at it) or to a TCP socket
+# (tcp://host:port, served by ingest.SocketSource when GCRES_SENSOR_FEED is the
+# same URL). The achieved events/s is reported every second.
+#
+#   python -m gcres.simulator --rate 1 --workers 4 --seconds 60 [--rooms 100000] [--out data/feed.jsonl]
+
+import argparse
+import json
+import math
+import multiprocessing as mp
+import os
+import socket
+import threading
+import time
+
+import numpy as np
+
+from gcres.catalog import catalog_path, load_catalog
+
+default_feed = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "feed.jsonl")
+tick_seconds = 0.1
+meeting_seconds = 1800.0  # Mean time before a room's headcount changes
+# Seconds the workers get to start and open the output before simulate() gives up
+startup_timeout = 60.0
+
+
+def working_hours(hour):
+    # Share of a room's mean occupancy expected at this local hour (0-24)
+    return 0.05 + 0.95 * np.exp(-0.5 * ((hour - 12.5) / 2.6) ** 2)
+
+
+class RoomStates:
+    # Simulated state of a set of rooms, advanced in vectorized steps
+    def __init__(self, n, seed=0, now=None):
+        self.rng = np.random.default_rng(seed)
+        rng = self.rng
+        self.setpoint = rng.normal(22.0, 0.8, n)
+        self.mean_occupancy = rng.uniform(0.5, 8.0, n)
+        self.temp = self.setpoint + rng.normal(0, 0.3, n)
+        self.occupancy = rng.poisson(self.mean_occupancy * working_hours(self._hour(now)))
+
+    @staticmethod
+    def _hour(ts):
+        t = time.localtime(time.time() if ts is None else ts)
+        return t.tm_hour + t.tm_min / 60
+
+    def step(self, ts, dt, theta=1 / 900, sigma=0.02):
+        rng = self.rng
+        hour = self._hour(ts)
+        n = len(self.temp)
+        # A meeting ends with probability 1 - exp(-dt / meeting_seconds)
+        change = rng.random(n) < -math.expm1(-dt / meeting_seconds)
+        if change.any():
+            self.occupancy[change] = rng.poisson(self.mean_occupancy[change] * working_hours(hour))
+        target = self.setpoint + 0.8 * math.sin(2 * math.pi * (hour - 9) / 24) + 0.1 * self.occupancy
+        self.temp += (target - self.temp) * min(theta * dt, 1.0) + sigma * math.sqrt(dt) * rng.standard_normal(n)
+
+
+def format_lines(names, idx, ts, temp, occupancy):
+    # JSON lines for the rooms at idx, one reading each. names are the room
+    # names encoded with json.dumps, so quotes or backslashes in a name still
+    # give valid lines.
+    return "".join(f'{{"room": {names[i]}, "ts": {t:.3f}, "temp": {x:.1f}, "occupancy": {o}}}\n'
+                   for i, t, x, o in zip(idx.tolist(), ts.tolist(), temp.tolist(), occupancy.tolist()))
+
+
+def _open(out):
+    # A write(str) callable for a file path or tcp://host:port
+    if out.startswith("tcp://"):
+        host, port = out[len("tcp://"):].rsplit(":", 1)
+        sock = socket.create_connection((host, int(port)))
+        return lambda text: sock.sendall(text.encode()), sock.close
+    fd = os.open(out, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    return lambda text: os.write(fd, text.encode()), lambda: os.close(fd)
+
+
+def _worker(rooms, shard, rate, seconds, out, seed, emitted, finished, stop, ready):
+    # One shard: rate readings per room and second for `seconds` (or until stop is set)
+    try:
+        write, close = _open(out)
+    except BaseException:
+        ready.abort()  # Don't leave the others (and simulate()) waiting for this worker
+        raise
+    try:
+        ready.wait(startup_timeout)  # Every worker starts emitting at the same time
+    except threading.BrokenBarrierError:
+        close()
+        return  # Another worker failed to start
+    names = [json.dumps(room) for room in rooms]
+    states = RoomStates(len(rooms), seed=(seed, shard))
+    rng = states.rng
+    per_tick = rate * len(rooms) * tick_seconds
+    carry = 0.0
+    start = time.time()
+    next_tick = start
+    try:
+        while not stop.is_set() and time.time() - start < seconds:
+            now = time.time()
+            states.step(now, tick_seconds)
+            carry += per_tick
+            count = int(carry)
+            carry -= count
+            if count:
+                idx = rng.integers(0, len(rooms), count)
+                ts = now + rng.uniform(0, tick_seconds, count)
+                write(format_lines(names, idx, ts, states.temp[idx], states.occupancy[idx]))
+                with emitted.get_lock():
+                    emitted.value += count
+            next_tick += tick_seconds
+            delay = next_tick - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.time()  # Behind schedule: don't try to catch up in a burst
+    finally:
+        close()
+        with finished.get_lock():
+            finished.value = max(finished.value, time.time())
+
+
+def simulate(rooms, rate=1.0, seconds=60.0, workers=None, out=default_feed, seed=0, report=print):
+    # Run the simulator for `seconds`; returns {"emitted", "seconds",
+    # "target_per_s", "events_per_s"}. An event is one line with both readings.
+    rooms = list(rooms)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(rooms)))
+    shards = np.array_split(np.arange(len(rooms)), workers)
+    # spawn, not fork: the caller may be a dashboard or benchmark with threads running
+    ctx = mp.get_context("spawn")
+    emitted = ctx.Value("q", 0)
+    finished = ctx.Value("d", 0.0)  # When the last worker stopped emitting
+    stop = ctx.Event()
+    ready = ctx.Barrier(workers + 1)
+    procs = [ctx.Process(target=_worker, args=([rooms[i] for i in shard], k, rate, seconds, out, seed, emitted, finished, stop, ready),
+                        daemon=True) for k, shard in enumerate(shards)]
+    for p in procs:
+        p.start()
+    try:
+        ready.wait(startup_timeout)  # Process start-up is not counted
+    except threading.BrokenBarrierError:
+        stop.set()
+        for p in procs:
+            p.join()
+        raise RuntimeError(f"simulator workers could not start writing to {out}") from None
+    start = time.time()
+    target = rate * len(rooms)
+    last, last_t = 0, start
+    try:
+        while any(p.is_alive() for p in procs):
+            time.sleep(0.05)
+            now = time.time()
+            if now - last_t < 1.0:
+                continue
+            total = emitted.value
+            if report:
+                report(f"{now - start:6.1f} s  {(total - last) / (now - last_t):>12,.0f} events/s  "
+                       f"(target {target:,.0f})  total {total:,}")
+            last, last_t = total, now
+    except KeyboardInterrupt:
+        stop.set()
+    for p in procs:
+        p.join()
+    elapsed = (finished.value or time.time()) - start
+    return {"emitted": emitted.value, "seconds": elapsed, "target_per_s": target, "events_per_s": emitted.value / elapsed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate sensor readings for the catalog rooms.")
+    parser.add_argument("--catalog", help="catalog file (default: $GCRES_CATALOG or data/rooms.sqlite)")
+    parser.add_argument("--rooms", type=int, help="simulate this many rooms (default: every catalog room); "
+                                                  "beyond the catalog size, rooms are named 'Sim <n>'")
+    parser.add_argument("--rate", type=float, default=1.0, help="readings per room per second")
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--workers", type=int, help="processes (default: one per CPU)")
+    parser.add_argument("--out", default=os.environ.get("GCRES_SENSOR_FEED") or default_feed,
+                        help="JSON-lines file or tcp://host:port (default: $GCRES_SENSOR_FEED or data/feed.jsonl)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rooms = load_catalog(catalog_path(args.catalog)).names
+    if args.rooms is not None:
+        rooms = rooms[:args.rooms] + [f"Sim {i}" for i in range(len(rooms), args.rooms)]
+    print(f"{len(rooms)} rooms at {args.rate} readings/s each -> {args.out}")
+    stats = simulate(rooms, args.rate, args.seconds, args.workers, args.out, args.seed)
+    print(f"emitted {stats['emitted']:,} events in {stats['seconds']:.1f} s: {stats['events_per_s']:,.0f} events/s "
+          f"(target {stats['target_per_s']:,.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Spatial index and zoom-level clustering for the room location map.
+#
+# Rooms are bucketed into a lat/lon grid and stored sorted by cell (a CSR
+# layout), so a viewport or radius query only looks at the cells it overlaps.
+# cluster() merges points per grid cell at the current zoom level, so the map
+# payload stays bounded however many rooms the catalog holds.
+
+import numpy as np
+import pandas as pd
+
+from gcres.profiling import timed
+
+earth_radius_m = 6_371_000.0
+_span = 1 << 20  # Cell columns per row in the packed cell key
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * earth_radius_m * np.arcsin(np.sqrt(a))
+
+
+def _cells(lat, lon, cell_deg):
+    row = np.floor((np.asarray(lat) + 90.0) / cell_deg).astype(np.int64)
+    col = np.floor((np.asarray(lon) + 180.0) / cell_deg).astype(np.int64)
+    return row, col
+
+
+class GridIndex:
+    def __init__(self, lat, lon, cell_deg=0.005):
+        # cell_deg 0.005 is roughly 500 m, about a campus block
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.cell_deg = cell_deg
+        valid = np.flatnonzero(~(np.isnan(self.lat) | np.isnan(self.lon)))
+        row, col = _cells(self.lat[valid], self.lon[valid], cell_deg)
+        keys = row * _span + col
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]  # Sorted cell key per point
+        self._points = valid[order]  # Point positions in the same order
+
+    def __len__(self):
+        return len(self._points)
+
+    def viewport(self, south, west, north, east):
+        # Positions of the points inside the box, one searchsorted pair per grid row
+        r0, c0 = _cells(south, west, self.cell_deg)
+        r1, c1 = _cells(north, east, self.cell_deg)
+        if (r1 - r0 + 1) > 4096:
+            # Most of the globe: a plain scan is cheaper than row lookups
+            candidates = self._points
+        else:
+            rows = np.arange(r0, r1 + 1, dtype=np.int64)
+            lo = np.searchsorted(self._keys, rows * _span + c0, side="left")
+            hi = np.searchsorted(self._keys, rows * _span + c1, side="right")
+            if not (hi > lo).any():
+                return np.empty(0, dtype=np.int64)
+            candidates = np.concatenate([self._points[a:b] for a, b in zip(lo, hi) if b > a])
+        lat, lon = self.lat[candidates], self.lon[candidates]
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return np.sort(candidates[inside])
+
+    def within(self, lat, lon, radius_m):
+        # Positions and distances of points within radius_m of (lat, lon), nearest first
+        dlat = np.degrees(radius_m / earth_radius_m)
+        dlon = dlat / max(np.cos(np.radians(lat)), 1e-6)
+        candidates = self.viewport(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+        distance = haversine_m(lat, lon, self.lat[candidates], self.lon[candidates])
+        near = distance <= radius_m
+        candidates, distance = candidates[near], distance[near]
+        order = np.argsort(distance, kind="stable")
+        return candidates[order], distance[order]
+
+
+def viewport_bounds(lat, lon, zoom, width_px=700, height_px=500):
+    # Approximate box shown by a web-mercator map of the given size at `zoom`
+    deg_per_px = 360.0 / (256 * 2 ** zoom)
+    dlon = deg_per_px * width_px / 2
+    dlat = deg_per_px * height_px / 2 * np.cos(np.radians(lat))
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+
+@timed("map clustering")
+def cluster(lat, lon, zoom, max_points=2000, cells_per_tile=8):
+    # Merge points per grid cell sized for `zoom` (cells_per_tile cells across one
+    # 256 px map tile). Zooms out further until at most max_points remain.
+    # Returns DataFrame(lat, lon, count) at the mean position of each cluster.
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    if len(lat) == 0:
+        return pd.DataFrame({"lat": [], "lon": [], "count": []})
+    while True:
+        cell_deg = 360.0 / (2 ** zoom * cells_per_tile)
+        row, col = _cells(lat, lon, cell_deg)
+        keys, inverse, counts = np.unique(row * _span + col, return_inverse=True, return_counts=True)
+        if len(keys) <= max_points or zoom <= 0:
+            break
+        zoom -= 1
+    return pd.DataFrame({
+        "lat": np.bincount(inverse, weights=lat) / counts,
+        "lon": np.bincount(inverse, weights=lon) / counts,
+        "count": counts,
+    })
@@ -0,0 +1,177 @@
+# Synthetic facilities for benchmarks and load tests.
+#
+# generate_facility lays out N buildings around a campus centre with M floors
+# and K rooms spread over them, in the catalog schema (gcres.catalog), so the
+# result can be written with write_catalog or used directly. Bookings come from
+# seed_demo_bookings; sensor_stream yields readings at a configurable rate in
+# the (room, metric, ts, value) batches a SensorStore ingests; write_calendars
+# writes .ics exports for gcres.calendars. Everything is seeded, so the same
+# arguments give the same facility.
+
+import itertools
+import math
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from gcres.bookings import seed_demo_bookings
+
+# Campus centre of the sample catalog (the ODC towers)
+default_center = (28.5378, 77.3413)
+rating_criteria = (
+    "Occupancy Suitability",
+    "Natural Lighting",
+    "Energy Efficiency",
+    "AV/Tech Availability",
+    "Noise Isolation",
+    "Proximity to Team Zone",
+    "Availability",
+)
+capacities = (4, 6, 8, 10, 12, 16, 20, 40)
+_metres_per_degree = 111_320.0
+
+
+def generate_facility(buildings=5, floors=10, rooms=1000, seed=0, center=default_center, spread_m=1500.0):
+    # Returns (rooms, buildings) DataFrames in the catalog schema
+    rng = np.random.default_rng(seed)
+    lat0, lon0 = center
+    names = [f"Building {b + 1}" for b in range(buildings)]
+    # Buildings scattered within spread_m of the centre, rooms within ~30 m of their building
+    dlat = rng.uniform(-spread_m, spread_m, buildings) / _metres_per_degree
+    dlon = rng.uniform(-spread_m, spread_m, buildings) / (_metres_per_degree * math.cos(math.radians(lat0)))
+    building_df = pd.DataFrame({"Building": names, "lat": lat0 + dlat, "lon": lon0 + dlon})
+
+    building = rng.integers(0, buildings, rooms)
+    floor = rng.integers(0, floors, rooms)
+    # Room names are unique per building and floor: "B3-F12-007"
+    order = np.lexsort((floor, building))
+    seq = np.empty(rooms, dtype=np.int64)
+    keys = building[order] * floors + floor[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, rooms])
+    seq[order] = np.arange(rooms) - np.repeat(starts, counts)
+
+    data = {
+        "Room": [f"B{b + 1}-F{f:02d}-{s + 1:03d}" for b, f, s in zip(building, floor, seq)],
+        "Building": np.asarray(names, dtype=object)[building],
+    }
+    for crit in rating_criteria:
+        data[crit] = rng.integers(1, 6, rooms)
+    jitter = 30.0 / _metres_per_degree
+    data["lat"] = building_df["lat"].to_numpy()[building] + rng.uniform(-jitter, jitter, rooms)
+    data["lon"] = building_df["lon"].to_numpy()[building] + rng.uniform(-jitter, jitter, rooms)
+    data["Capacity"] = rng.choice(capacities, rooms)
+    data["Floor"] = floor
+    data["Quiet"] = (data["Noise Isolation"] >= 4).astype(int)
+    data["Projector"] = (data["AV/Tech Availability"] >= 4).astype(int)
+    return pd.DataFrame(data), building_df
+
+
+def generate_bookings(store, days=7, busy_share=0.3, seed=0):
+    # Random meetings for every room in a BookingStore; returns how many
+    return seed_demo_bookings(store, days=days, busy_share=busy_share, seed=seed)
+
+
+def sensor_stream(rooms, rate=0.5, seconds=60.0, start=0.0, batch_seconds=1.0, seed=0):
+    # Readings for `seconds` of simulated time, `rate` readings per room and
+    # second, yielded as one batch per batch_seconds. Temperatures drift around
+    # 22 °C per room, occupancy follows a Poisson draw around each room's mean.
+    rooms = list(rooms)
+    n = len(rooms)
+    rng = np.random.default_rng(seed)
+    base_temp = rng.normal(22.0, 1.2, n)
+    mean_occupancy = rng.uniform(0.5, 8.0, n)
+    per_batch = rate * batch_seconds * n
+    carry = 0.0
+    t = start
+    while t < start + seconds:
+        carry += per_batch
+        count = int(carry)
+        carry -= count
+        idx = rng.integers(0, n, count)
+        ts = t + rng.uniform(0, batch_seconds, count)
+        temp = np.round(base_temp[idx] + rng.normal(0, 0.3, count), 1)
+        occupancy = rng.poisson(mean_occupancy[idx])
+        batch = [(rooms[i], "temp", s, float(v)) for i, s, v in zip(idx, ts, temp)]
+        batch += [(rooms[i], "occupancy", s, float(v)) for i, s, v in zip(idx, ts, occupancy)]
+        yield batch
+        t += batch_seconds
+
+
+def write_calendars(rooms, directory, events=10_000, files=20, recurring_share=0.8, seed=0, today=None):
+    # iCalendar exports for gcres.calendars: `events` meetings spread over
+    # `files` .ics files. Most recur (weekly on some weekdays, every weekday,
+    # every n days, monthly), some with COUNT / UNTIL, EXDATEs and moved or
+    # cancelled occurrences, in a mix of time zones. Returns the file paths.
+    from dateutil.rrule import rrulestr
+
+    rng = np.random.default_rng(seed)
+    rooms = list(rooms)
+    today = datetime.combine(today or datetime.now().date(), datetime.min.time())
+    zones = [("TZID=Asia/Kolkata", ""), ("TZID=America/New_York", ""), ("", ""), ("", "Z")]
+    days = ["MO", "TU", "WE", "TH", "FR"]
+    blocks = [[] for _ in range(files)]
+
+    def fmt(dt, suffix):
+        return dt.strftime("%Y%m%dT%H%M%S") + suffix
+
+    for k in range(events):
+        room = rooms[int(rng.integers(len(rooms)))]
+        start = today + timedelta(days=int(rng.integers(-180, 30)), hours=int(rng.integers(8, 18)),
+                                  minutes=15 * int(rng.integers(4)))
+        minutes = int(rng.choice([30, 60, 90]))
+        param, suffix = zones[int(rng.choice(len(zones), p=[0.6, 0.15, 0.15, 0.1]))]
+        sep = ";" if param else ""
+        lines = ["BEGIN:VEVENT", f"UID:gcres-{seed}-{k}@example.com", f"SUMMARY:Meeting {k}", f"LOCATION:{room}",
+                 f"DTSTART{sep}{param}:{fmt(start, suffix)}", f"DTEND{sep}{param}:{fmt(start + timedelta(minutes=minutes), suffix)}"]
+        rule = None
+        if rng.random() < recurring_share:
+            kind = rng.random()
+            if kind < 0.5:
+                picked = sorted(rng.choice(5, int(rng.integers(1, 4)), replace=False).tolist())
+                if start.weekday() < 5 and start.weekday() not in picked:
+                    picked = sorted(picked + [start.weekday()])
+                rule = f"FREQ=WEEKLY;INTERVAL={int(rng.choice([1, 1, 2]))};BYDAY={','.join(days[d] for d in picked)}"
+            elif kind < 0.7:
+                rule = "FREQ=DAILY;BYDAY=MO,TU,WE,TH,FR"
+            elif kind < 0.85:
+                rule = f"FREQ=DAILY;INTERVAL={int(rng.integers(2, 8))}"
+            else:
+                rule = f"FREQ=MONTHLY;BYMONTHDAY={start.day}"
+            limit = rng.random()
+            if limit < 0.2:
+                rule += f";COUNT={int(rng.integers(5, 60))}"
+            elif limit < 0.4:
+                until = start + timedelta(days=int(rng.integers(14, 240)))
+                rule += f";UNTIL={until:%Y%m%dT235959}Z" if suffix else f";UNTIL={until:%Y%m%dT235959}"
+            lines.append(f"RRULE:{rule}")
+        overrides = []
+        if rule is not None and rng.random() < 0.3:
+            # Skip or move one of the first occurrences
+            first = list(itertools.islice(rrulestr(rule.replace("Z", ""), dtstart=start), 5))
+            if len(first) > 2:
+                occurrence = first[int(rng.integers(1, len(first)))]
+                if rng.random() < 0.5:
+                    lines.append(f"EXDATE{sep}{param}:{fmt(occurrence, suffix)}")
+                else:
+                    moved = occurrence + timedelta(hours=1)
+                    status = ["STATUS:CANCELLED"] if rng.random() < 0.3 else []
+                    overrides = ["BEGIN:VEVENT", f"UID:gcres-{seed}-{k}@example.com",
+                                 f"RECURRENCE-ID{sep}{param}:{fmt(occurrence, suffix)}", f"SUMMARY:Meeting {k} (moved)",
+                                 f"LOCATION:{room}", f"DTSTART{sep}{param}:{fmt(moved, suffix)}",
+                                 f"DTEND{sep}{param}:{fmt(moved + timedelta(minutes=minutes), suffix)}", *status,
+                                 "END:VEVENT"]
+        lines.append("END:VEVENT")
+        blocks[k % files].append("\r\n".join(lines + overrides))
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for f, events_text in enumerate(blocks):
+        path = os.path.join(directory, f"calendar-{f:03d}.ics")
+        with open(path, "w", newline="") as out:
+            out.write("\r\n".join(["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//GCRES//synthetic//EN",
+                                   *events_text, "END:VCALENDAR", ""]))
+        paths.append(path)
+    return paths
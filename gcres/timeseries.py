@@ -0,0 +1,163 @@
+# Pre-aggregated sensor rollups and LTTB downsampling for trend charts.
+#
+# Rollups keep min / mean / max per room and metric in fixed rings of time
+# buckets (1 minute, 15 minutes, 1 hour) that are updated as readings arrive,
+# so a chart over hours or weeks never touches raw samples. lttb() then caps
+# the number of points actually drawn.
+
+import threading
+
+import numpy as np
+
+# Bucket width in seconds -> number of buckets kept
+default_retention = {
+    60: 240,     # 1-minute buckets for 4 hours
+    900: 672,    # 15-minute buckets for 7 days
+    3600: 744,   # hourly buckets for 31 days
+}
+
+resolution_labels = {60: "1 min", 900: "15 min", 3600: "1 hour"}
+
+
+class _Ring:
+    # Aggregates for one metric at one resolution, shape (rooms, buckets)
+    def __init__(self, n_rooms, n_buckets):
+        self.ids = np.full((n_rooms, n_buckets), -1, dtype=np.int64)  # Bucket number held by each slot
+        self.min = np.full((n_rooms, n_buckets), np.inf, dtype=np.float32)
+        self.max = np.full((n_rooms, n_buckets), -np.inf, dtype=np.float32)
+        self.sum = np.zeros((n_rooms, n_buckets), dtype=np.float64)
+        self.count = np.zeros((n_rooms, n_buckets), dtype=np.int32)
+
+    def add(self, rooms, buckets, values):
+        slots = buckets % self.ids.shape[1]
+        held = self.ids[rooms, slots]
+        # Newest bucket per (room, slot) in this batch: a backlog may span
+        # several laps of the ring, and only the latest lap may land in a slot
+        _, where = np.unique(rooms * self.ids.shape[1] + slots, return_inverse=True)
+        newest = np.full(where.max() + 1, -1, dtype=np.int64)
+        np.maximum.at(newest, where, buckets)
+        # Readings older than the ring's window would overwrite newer buckets
+        keep = (buckets >= held) & (buckets == newest[where])
+        rooms, buckets, slots, values, held = rooms[keep], buckets[keep], slots[keep], values[keep], held[keep]
+        stale = buckets > held
+        if stale.any():
+            r, s = rooms[stale], slots[stale]
+            self.ids[r, s] = buckets[stale]
+            self.min[r, s] = np.inf
+            self.max[r, s] = -np.inf
+            self.sum[r, s] = 0
+            self.count[r, s] = 0
+        np.minimum.at(self.min, (rooms, slots), values)
+        np.maximum.at(self.max, (rooms, slots), values)
+        np.add.at(self.sum, (rooms, slots), values)
+        np.add.at(self.count, (rooms, slots), 1)
+
+    def nbytes(self):
+        return self.ids.nbytes + self.min.nbytes + self.max.nbytes + self.sum.nbytes + self.count.nbytes
+
+
+class Rollups:
+    def __init__(self, rooms, metrics=("temp", "occupancy"), retention=None):
+        self.rooms = list(rooms)
+        self.index = {room: i for i, room in enumerate(self.rooms)}
+        self.metrics = tuple(metrics)
+        self.retention = dict(default_retention if retention is None else retention)
+        self.resolutions = sorted(self.retention)
+        self._rings = {(m, res): _Ring(len(self.rooms), n) for m in self.metrics for res, n in self.retention.items()}
+        self._lock = threading.Lock()
+
+    def add(self, readings):
+        # Incremental update from (room, metric, ts, value) readings; usable as a
+        # SensorStore listener
+        grouped = {m: ([], [], []) for m in self.metrics}
+        for room, metric, ts, value in readings:
+            i = self.index.get(room)
+            if i is None or metric not in grouped:
+                continue
+            rooms, times, values = grouped[metric]
+            rooms.append(i)
+            times.append(ts)
+            values.append(value)
+        with self._lock:
+            for metric, (rooms, times, values) in grouped.items():
+                if not rooms:
+                    continue
+                rooms = np.asarray(rooms, dtype=np.int64)
+                times = np.asarray(times, dtype=np.float64)
+                values = np.asarray(values, dtype=np.float64)
+                for res in self.resolutions:
+                    self._rings[metric, res].add(rooms, (times // res).astype(np.int64), values)
+
+    def series(self, metric, resolution, start, end, room=None):
+        # Buckets overlapping [start, end) in time order as arrays
+        # (ts, min, mean, max). room=None aggregates over all rooms.
+        ring = self._rings[metric, resolution]
+        first, last = int(start // resolution), int(end // resolution)
+        with self._lock:
+            if room is None:
+                ids, mins, maxs, sums, counts = ring.ids, ring.min, ring.max, ring.sum, ring.count
+            else:
+                i = self.index[room]
+                ids, mins, maxs = ring.ids[i:i + 1], ring.min[i:i + 1], ring.max[i:i + 1]
+                sums, counts = ring.sum[i:i + 1], ring.count[i:i + 1]
+            mask = (ids >= first) & (ids <= last) & (counts > 0)
+            r, s = np.nonzero(mask)
+            bucket = ids[r, s]
+            b_min, b_max, b_sum, b_count = mins[r, s], maxs[r, s], sums[r, s], counts[r, s]
+        # Merge rooms that share a bucket
+        buckets, inverse = np.unique(bucket, return_inverse=True)
+        n = len(buckets)
+        out_min = np.full(n, np.inf)
+        out_max = np.full(n, -np.inf)
+        out_sum = np.zeros(n)
+        out_count = np.zeros(n)
+        np.minimum.at(out_min, inverse, b_min)
+        np.maximum.at(out_max, inverse, b_max)
+        np.add.at(out_sum, inverse, b_sum)
+        np.add.at(out_count, inverse, b_count)
+        return buckets * float(resolution), out_min, out_sum / np.maximum(out_count, 1), out_max
+
+    def pick_resolution(self, span, max_points):
+        # Finest resolution that covers `span` seconds within its retention
+        # and in at most max_points buckets (else the coarsest one)
+        for res in self.resolutions:
+            buckets = span / res
+            if buckets <= self.retention[res] and buckets <= max_points:
+                return res
+        return self.resolutions[-1]
+
+    @property
+    def nbytes(self):
+        return sum(ring.nbytes() for ring in self._rings.values())
+
+
+def lttb(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: keep n_out points that preserve the visual
+    # shape of (x, y). x must be sorted. Returns the selected indices.
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # First and last points are always kept, the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Average of the next bucket is the third triangle vertex
+        nlo, nhi = hi, edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = x[nlo:nhi].mean() if nhi > nlo else x[-1]
+        avg_y = y[nlo:nhi].mean() if nhi > nlo else y[-1]
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[b + 1] = a
+    return selected
+
+
+def downsample(x, *ys, max_points=2000):
+    # LTTB on the first series, the same indices applied to the others
+    idx = lttb(x, ys[0], max_points)
+    return (np.asarray(x)[idx], *(np.asarray(y)[idx] for y in ys))
@@ -0,0 +1,60 @@
+# NOTE: This Streamlit app must be run in a local environment where 'streamlit' and 'pandas' are installed.
+
+import os
+import streamlit as st
+import pandas as pd
+from gcres.charts import bar_chart
+from gcres.profiling import profiler
+
+# Where "Export" writes the metrics (next to the room catalog)
+metrics_dir = os.environ.get("GCRES_METRICS_DIR", "data")
+
+st.set_page_config(page_title="Performance", layout="wide")
+st.title("⏱️ Performance")
+
+st.markdown("""
+Latency of each stage of a rerun (scoring, availability, chart rendering, agents...), per page,
+over the most recent runs. `page` is the whole rerun of that page. Memory is the change in
+process memory during the stage.
+""")
+
+summary = pd.DataFrame(profiler.summary())
+if summary.empty:
+    st.info("No timings recorded yet. Open a dashboard page first.")
+    st.stop()
+
+# Filter by page
+pages = sorted(summary["page"].unique())
+selected_pages = st.multiselect("Pages", pages, default=pages)
+summary = summary[summary["page"].isin(selected_pages)]
+
+# Per stage and page
+st.subheader("📋 Stages")
+table = summary.rename(columns={"page": "Page", "stage": "Stage", "count": "Runs", "sum_s": "Total (s)",
+                                "p50_ms": "p50 (ms)", "p95_ms": "p95 (ms)", "p99_ms": "p99 (ms)", "max_ms": "Max (ms)",
+                                "mem_mean_mb": "Mem Δ mean (MB)", "mem_max_mb": "Mem Δ max (MB)"})
+st.dataframe(table.sort_values("p95 (ms)", ascending=False), hide_index=True, use_container_width=True)
+
+# Slowest stages across pages
+st.subheader("📊 p95 per stage")
+by_stage = summary[summary["stage"] != "page"].groupby("stage")["p95_ms"].max().sort_values(ascending=False)
+if len(by_stage):
+    bar_chart(st, by_stage.index, by_stage.to_numpy(), "p95 (ms)", "Slowest stages (worst page)", 'salmon')
+
+# Whole reruns per page
+page_rows = summary[summary["stage"] == "page"]
+if len(page_rows):
+    st.subheader("📄 p95 per page")
+    bar_chart(st, page_rows["page"], page_rows["p95_ms"].to_numpy(), "p95 (ms)", "Rerun latency per page", 'skyblue')
+
+# Export
+st.subheader("💾 Export")
+col1, col2, col3 = st.columns(3)
+if col1.button("Write metrics files"):
+    json_path = profiler.export(os.path.join(metrics_dir, "metrics.json"))
+    prom_path = profiler.export(os.path.join(metrics_dir, "metrics.prom"))
+    st.success(f"Wrote `{json_path}` and `{prom_path}`")
+col2.download_button("Download Prometheus text", profiler.to_prometheus(), file_name="metrics.prom")
+if col3.button("Reset timings"):
+    profiler.reset()
+    st.rerun()
@@ -2,6 +2,8 @@
 
 import streamlit as st
 import pandas as pd
+from gcres.resources import get_catalog
+from gcres.scoring import encode_ratings, rating_scores
 
 st.set_page_config(page_title="Smart Meeting Room Selector", layout="wide")
 st.title("🏢 Smart Meeting Room Selection Matrix")
@@ -25,30 +27,99 @@ criteria = {
     "Crowd Level on Floor": 3,
 }
 
-rooms = st.multiselect("Select Rooms to Compare", ["Room A", "Room B", "Room C"], default=["Room A", "Room B", "Room C"])
-
-# Store results
-room_scores = {}
-
-for room in rooms:
-    st.subheader(f"🏷️ {room}")
-    score = 0
-    cols = st.columns(3)  # 3 columns for narrower dropdown layout
-    for idx, (crit, weight) in enumerate(criteria.items()):
-        options = list(rating_map.keys())
-        default = "Medium" if "Level" in crit else "Yes"
-        with cols[idx % 3]:
-            selection = st.selectbox(f"{crit}", options, index=options.index(default), key=f"{room}_{crit}")
-        rating = rating_map.get(selection, 2)
-        score += rating * weight
-    room_scores[room] = score
-
-# Display results
-st.markdown("---")
-st.header("📊 Room Scores")
-for room, score in room_scores.items():
-    st.metric(label=room, value=f"{score} points")
-
-# Best room highlight
-best_room = max(room_scores, key=room_scores.get)
-st.success(f"✅ Recommended Room: **{best_room}** with {room_scores[best_room]} points")
+# Default rating per criterion, as preselected in the per-room dropdowns
+defaults = {crit: "Medium" if "Level" in crit else "Yes" for crit in criteria}
+
+# Catalog column behind a criterion and the rating label for each of its
+# scores 1-5 (5 = best room); criteria without a column use the defaults
+catalog_ratings = {
+    "Occupancy Level": ("Occupancy Suitability", ["High", "High", "Medium", "Low", "Low"]),
+    "Noise Level": ("Noise Isolation", ["High", "High", "Medium", "Low", "Low"]),
+    "Natural Light Availability": ("Natural Lighting", ["No", "No", "Partial", "Yes", "Yes"]),
+    "Energy Efficiency Features": ("Energy Efficiency", ["No", "No", "Partial", "Yes", "Yes"]),
+    "Proximity to Team": ("Proximity to Team Zone", ["Far", "Far", "Medium", "Near", "Near"]),
+    "Availability at Required Time": ("Availability", ["No", "No", "Partial", "Yes", "Yes"]),
+}
+
+
+def catalog_rating(rooms, crit):
+    column, labels = catalog_ratings[crit]
+    return rooms[column].round().clip(1, 5).astype(int).map(dict(enumerate(labels, 1)))
+
+mode = st.radio("Mode", ["Compare a few rooms", "Batch scoring"], horizontal=True,
+                help="Batch scoring rates many rooms at once from a file or the room catalog.")
+
+if mode == "Compare a few rooms":
+    room_names = get_catalog().names
+    rooms = st.multiselect("Select Rooms to Compare", room_names, default=room_names[:3])
+
+    # Store results
+    room_scores = {}
+
+    for room in rooms:
+        st.subheader(f"🏷️ {room}")
+        score = 0
+        cols = st.columns(3)  # 3 columns for narrower dropdown layout
+        for idx, (crit, weight) in enumerate(criteria.items()):
+            options = list(rating_map.keys())
+            default = defaults[crit]
+            with cols[idx % 3]:
+                selection = st.selectbox(f"{crit}", options, index=options.index(default), key=f"{room}_{crit}")
+            rating = rating_map.get(selection, 2)
+            score += rating * weight
+        room_scores[room] = score
+
+    # Display results
+    st.markdown("---")
+    st.header("📊 Room Scores")
+    for room, score in room_scores.items():
+        st.metric(label=room, value=f"{score} points")
+
+    # Best room highlight
+    if room_scores:
+        best_room = max(room_scores, key=room_scores.get)
+        st.success(f"✅ Recommended Room: **{best_room}** with {room_scores[best_room]} points")
+
+else:
+    # Ratings for many rooms: one row per room, one column per criterion with a
+    # rating label. Missing columns use the same defaults as the dropdowns.
+    catalog_rooms = get_catalog().rooms
+    template = catalog_rooms[["Room"]].assign(**{crit: catalog_rating(catalog_rooms, crit) if crit in catalog_ratings
+                                                 else default for crit, default in defaults.items()})
+    st.download_button("Download ratings template (CSV)", template.to_csv(index=False), "room_ratings.csv", "text/csv")
+
+    source = st.radio("Ratings source", ["Room catalog", "Upload file"], horizontal=True)
+    if source == "Upload file":
+        uploaded = st.file_uploader("Ratings file (CSV or Parquet)", type=["csv", "parquet"])
+        if uploaded is None:
+            st.info("Upload a file with a `Room` column and one column per criterion.")
+            st.stop()
+        ratings = pd.read_parquet(uploaded) if uploaded.name.endswith(".parquet") else pd.read_csv(uploaded)
+        if "Room" not in ratings:
+            st.error("The file needs a `Room` column.")
+            st.stop()
+    else:
+        ratings = template
+        st.caption("From the catalog: " + ", ".join(f"{crit} ← {column}" for crit, (column, _) in catalog_ratings.items())
+                   + ". Other criteria use the defaults.")
+
+    # Encode once into an integer matrix and score all rooms with one dot product
+    matrix = encode_ratings(ratings, rating_map, list(criteria), defaults)
+    results = pd.DataFrame(matrix, columns=list(criteria))
+    results.insert(0, "Room", ratings["Room"].to_numpy())
+    results.insert(1, "Score", rating_scores(matrix, criteria))
+
+    sort_by = st.selectbox("Sort by", ["Score", "Room", *criteria])
+    results = results.sort_values(sort_by, ascending=sort_by == "Room", kind="stable").reset_index(drop=True)
+
+    st.markdown("---")
+    st.header(f"📊 Room Scores ({len(results)} rooms)")
+    col1, col2 = st.columns(2)
+    page_size = col1.selectbox("Rows per page", [25, 50, 100, 500], index=1)
+    pages = max((len(results) - 1) // page_size + 1, 1)
+    page = col2.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+    st.dataframe(results.iloc[(page - 1) * page_size:page * page_size], use_container_width=True)
+
+    if len(results):
+        best = results.loc[results["Score"].idxmax()]
+        st.success(f"✅ Recommended Room: **{best['Room']}** with {best['Score']} points")
@@ -3,32 +3,10 @@
 
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import random
 from datetime import datetime, time
-
-# Simulated real-time IoT data generator
-def get_simulated_iot_data():
-    return {
-        "Room A": {"temp": round(random.uniform(21, 23.5), 1), "occupancy": random.randint(1, 6)},
-        "Room B": {"temp": round(random.uniform(23, 25.5), 1), "occupancy": random.randint(2, 8)},
-        "Room C": {"temp": round(random.uniform(20, 22.5), 1), "occupancy": random.randint(1, 5)},
-    }
-
-# Room attributes (example data)
-def create_room_data(iot_data):
-    return {
-        "Room": ["Room A", "Room B", "Room C"],
-        "Occupancy Suitability": [5, 3, 4],
-        "Natural Lighting": [4, 2, 5],
-        "Energy Efficiency": [3, 5, 4],
-        "AV/Tech Availability": [5, 4, 3],
-        "Noise Isolation": [4, 3, 4],
-        "Proximity to Team Zone": [3, 4, 2],
-        "Availability": [3, 5, 4],
-        "HVAC Temp": [iot_data["Room A"]["temp"], iot_data["Room B"]["temp"], iot_data["Room C"]["temp"]],
-        "Current Occupancy": [iot_data["Room A"]["occupancy"], iot_data["Room B"]["occupancy"], iot_data["Room C"]["occupancy"]],
-    }
+from gcres.charts import band_chart, bar_chart
+from gcres.resources import get_catalog, get_rollups, get_service
+from gcres.timeseries import downsample, resolution_labels
 
 weights = {
     "Occupancy Suitability": 0.20,
@@ -42,15 +20,8 @@ weights = {
     "Current Occupancy": 0.05
 }
 
-# Scoring function
-ideal_temp = 22.0
-ideal_occupancy = 4
-
-def calculate_score(row):
-    base_score = sum(row[crit] * weights[crit] for crit in weights if crit not in ["HVAC Temp", "Current Occupancy"])
-    temp_penalty = abs(row["HVAC Temp"] - ideal_temp) * 0.1
-    occupancy_bonus = 5 - abs(row["Current Occupancy"] - ideal_occupancy)
-    return base_score - temp_penalty + (occupancy_bonus * weights["Current Occupancy"])
+# Only the best rooms are ranked and shown
+top_n = 50
 
 # Streamlit UI
 st.set_page_config(page_title="Conference Room Selector", layout="wide")
@@ -70,45 +41,57 @@ selected_date = st.sidebar.date_input("Select a date")
 start_time = st.sidebar.time_input("Start Time", value=time(9, 0))
 end_time = st.sidebar.time_input("End Time", value=time(10, 0))
 
-# Generate and display real-time data
-iot_data = get_simulated_iot_data()
-rooms_data = create_room_data(iot_data)
-df = pd.DataFrame(rooms_data)
+# Availability from the booking store: 5 = free for the whole meeting, 1 = booked throughout
+meeting_start = datetime.combine(selected_date, start_time)
+meeting_end = datetime.combine(selected_date, end_time)
+if meeting_end <= meeting_start:
+    st.sidebar.warning("End time must be after the start time.")
+    st.stop()
 
-if start_time >= time(12, 0):
-    df.loc[df['Room'] == "Room A", "Availability"] = 4
-    df.loc[df['Room'] == "Room B", "Availability"] = 5
-    df.loc[df['Room'] == "Room C", "Availability"] = 3
-else:
-    df.loc[df['Room'] == "Room A", "Availability"] = 3
-    df.loc[df['Room'] == "Room B", "Availability"] = 4
-    df.loc[df['Room'] == "Room C", "Availability"] = 5
-
-df["Weighted Score"] = df.apply(calculate_score, axis=1)
-df = df.sort_values("Weighted Score", ascending=False)
+# Rooms with live readings, ranked (shared by sessions asking the same)
+df = pd.DataFrame(get_service().score(weights, meeting_start, meeting_end, k=top_n)["rooms"])
+if df.empty:
+    # With an external feed, rooms are ranked once their sensors first report
+    st.info("No sensor readings yet")
+    st.stop()
 
 # Show live IoT data
 st.subheader("📡 Live IoT Sensor Data")
-for room in df["Room"]:
-    st.markdown(f"**{room}** – Temp: {iot_data[room]['temp']} °C, Occupancy: {iot_data[room]['occupancy']} people")
+for room, temp, occupancy in zip(df["Room"], df["HVAC Temp"], df["Current Occupancy"]):
+    st.markdown(f"**{room}** – Temp: {temp} °C, Occupancy: {occupancy} people")
 
 # Visualize IoT metrics side-by-side
 st.subheader("📈 IoT Metrics Visualization")
 col1, col2 = st.columns(2)
 
-with col1:
-    fig1, ax1 = plt.subplots(figsize=(4, 3))
-    ax1.bar(df["Room"], df["HVAC Temp"], color='skyblue')
-    ax1.set_ylabel("Temperature (°C)")
-    ax1.set_title("HVAC Temperature")
-    st.pyplot(fig1)
-
-with col2:
-    fig2, ax2 = plt.subplots(figsize=(4, 3))
-    ax2.bar(df["Room"], df["Current Occupancy"], color='salmon')
-    ax2.set_ylabel("Number of People")
-    ax2.set_title("Current Occupancy")
-    st.pyplot(fig2)
+bar_chart(col1, df["Room"], df["HVAC Temp"], "Temperature (°C)", "HVAC Temperature", 'skyblue')
+bar_chart(col2, df["Room"], df["Current Occupancy"], "Number of People", "Current Occupancy", 'salmon')
+
+# Trend lines from the pre-aggregated rollups, downsampled to a bounded number of points
+st.subheader("📉 Sensor Trends")
+trend_ranges = {"Last hour": 3600, "Last 6 hours": 6 * 3600, "Last 24 hours": 86400, "Last 7 days": 7 * 86400, "Last 30 days": 30 * 86400}
+trend_metrics = {"HVAC Temperature (°C)": "temp", "Occupancy (people)": "occupancy"}
+max_points = 2000
+
+col1, col2, col3 = st.columns(3)
+trend_room = col1.selectbox("Room", ["All rooms (average)", *get_catalog().names])
+trend_metric = col2.selectbox("Metric", list(trend_metrics))
+trend_range = col3.selectbox("Time range", list(trend_ranges))
+
+rollups = get_rollups()
+end = datetime.now().timestamp()
+span = trend_ranges[trend_range]
+resolution = rollups.pick_resolution(span, max_points)
+ts, low, mean, high = rollups.series(
+    trend_metrics[trend_metric], resolution, end - span, end,
+    room=None if trend_room.startswith("All rooms") else trend_room,
+)
+if len(ts) == 0:
+    st.info("No readings in this time range yet.")
+else:
+    ts, mean, low, high = downsample(ts, mean, low, high, max_points=max_points)
+    times = pd.to_datetime(ts, unit="s")
+    band_chart(st, times, low, mean, high, trend_metric, f"{trend_room} – {resolution_labels[resolution]} buckets")
 
 # Show the table
 st.subheader("🔍 Room Comparison Table")
@@ -2,18 +2,68 @@
 
 import streamlit as st
 import pandas as pd
+from gcres.resources import get_catalog, get_spatial_index
+from gcres.spatial import cluster, viewport_bounds
 
 st.title("📍 Smart Meeting Room Location Map")
 
-# Sample lat/lon data for rooms (replace with your own coordinates)
-room_locations = pd.DataFrame({
-    "Room": ["Room A", "Room B", "Room C"],
-    "lat": [28.5385, 28.5386, 28.5361],
-    "lon": [77.3385, 77.3412, 77.3440],
-})
+# Room and building coordinates from the shared catalog
+catalog = get_catalog()
+rooms = catalog.rooms
+buildings = catalog.buildings
+index = get_spatial_index()
 
-selected_rooms = st.multiselect("Show rooms on map", room_locations["Room"].tolist(), default=room_locations["Room"].tolist())
-filtered = room_locations[room_locations["Room"].isin(selected_rooms)]
+# Above this many points in view the map shows clusters instead of rooms
+max_map_points = 500
 
-st.map(filtered, zoom=15)
+col1, col2 = st.columns([3, 1])
+if len(buildings):
+    building_names = buildings["Building"].tolist()
+    selected_buildings = col1.multiselect("Show buildings", building_names, default=building_names)
+    shown = rooms["Building"].isin(selected_buildings)
+else:
+    shown = pd.Series(True, index=rooms.index)
+if len(rooms) <= 200:
+    room_names = rooms.loc[shown, "Room"].tolist()
+    selected_rooms = col1.multiselect("Show rooms on map", room_names, default=room_names)
+    shown &= rooms["Room"].isin(selected_rooms)
+zoom = col2.slider("Zoom", 3, 18, 15)
 
+# Centre on one building, or on everything selected
+centre_options = ["All selected rooms", *buildings["Building"]]
+centre = col2.selectbox("Centre on", centre_options)
+if centre != "All selected rooms":
+    centre_row = buildings[buildings["Building"] == centre].iloc[0]
+    centre_lat, centre_lon = centre_row["lat"], centre_row["lon"]
+else:
+    centre_lat, centre_lon = rooms.loc[shown, "lat"].mean(), rooms.loc[shown, "lon"].mean()
+
+if pd.isna(centre_lat):
+    st.info("No located rooms selected.")
+else:
+    # Only rooms in the visible area are sent to the browser, clustered if there are many
+    in_view = index.viewport(*viewport_bounds(centre_lat, centre_lon, zoom))
+    in_view = in_view[shown.to_numpy()[in_view]]
+    points = rooms.iloc[in_view]
+    if len(points) > max_map_points:
+        clusters = cluster(points["lat"], points["lon"], zoom, max_points=max_map_points)
+        clusters["size"] = 20 + 10 * clusters["count"] ** 0.5
+        st.map(clusters, zoom=zoom, size="size")
+        st.caption(f"{len(points)} rooms in view, shown as {len(clusters)} clusters.")
+    else:
+        st.map(points[["Room", "lat", "lon"]], zoom=zoom)
+        st.caption(f"{len(points)} rooms in view.")
+
+# Rooms within walking distance of a building or room
+st.subheader("📏 Rooms Near You")
+col1, col2 = st.columns(2)
+origins = [*buildings["Building"], *(rooms["Room"] if len(rooms) <= 200 else [])]
+origin = col1.selectbox("I am at", origins) if origins else None
+radius = col2.slider("Within (metres)", 50, 5000, 500, step=50)
+if origin is not None:
+    located = buildings if origin in set(buildings["Building"]) else rooms.rename(columns={"Room": "Building"})
+    origin_row = located[located["Building"] == origin].iloc[0]
+    near, distance = index.within(origin_row["lat"], origin_row["lon"], radius)
+    nearby = rooms.iloc[near][["Room", "Building"]].assign(**{"Distance (m)": distance.round().astype(int)})
+    st.write(f"{len(nearby)} rooms within {radius} m of {origin}.")
+    st.dataframe(nearby.head(100), hide_index=True, use_container_width=True)
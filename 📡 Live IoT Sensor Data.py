@@ -4,26 +4,7 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, time
-
-# Simulated IoT data generator
-def get_simulated_iot_data():
-    return {
-        "Room A": {"temp": 22.5, "occupancy": 3},
-        "Room B": {"temp": 24.1, "occupancy": 6},
-        "Room C": {"temp": 21.0, "occupancy": 1},
-    }
-
-# Room attributes (example data)
-rooms_data = {
-    "Room": ["Room A", "Room B", "Room C"],
-    "Occupancy Suitability": [5, 3, 4],
-    "Natural Lighting": [4, 2, 5],
-    "Energy Efficiency": [3, 5, 4],
-    "AV/Tech Availability": [5, 4, 3],
-    "Noise Isolation": [4, 3, 4],
-    "Proximity to Team Zone": [3, 4, 2],
-    "Availability": [3, 5, 4]  # Simulated availability score
-}
+from gcres.resources import get_service
 
 weights = {
     "Occupancy Suitability": 0.20,
@@ -37,14 +18,6 @@ weights = {
     "Current Occupancy": 0.05
 }
 
-# Convert to DataFrame
-df = pd.DataFrame(rooms_data)
-
-# Add columns for IoT metrics
-iot_data = get_simulated_iot_data()
-df["HVAC Temp"] = df["Room"].apply(lambda x: iot_data[x]["temp"])
-df["Current Occupancy"] = df["Room"].apply(lambda x: iot_data[x]["occupancy"])
-
 # Streamlit UI
 st.set_page_config(page_title="Conference Room Selector", layout="centered")
 st.title("📊 Conference Room Selector - ODC")
@@ -63,33 +36,26 @@ selected_date = st.date_input("Select a date")
 start_time = st.time_input("Start Time", value=time(9, 0))
 end_time = st.time_input("End Time", value=time(10, 0))
 
-# Simulate availability change based on time
-if start_time >= time(12, 0):
-    df.loc[df['Room'] == "Room A", "Availability"] = 4
-    df.loc[df['Room'] == "Room B", "Availability"] = 5
-    df.loc[df['Room'] == "Room C", "Availability"] = 3
-else:
-    df.loc[df['Room'] == "Room A", "Availability"] = 3
-    df.loc[df['Room'] == "Room B", "Availability"] = 4
-    df.loc[df['Room'] == "Room C", "Availability"] = 5
-
-# Scoring function
-ideal_temp = 22.0
-ideal_occupancy = 4
-
-def calculate_score(row):
-    base_score = sum(row[crit] * weights[crit] for crit in weights if crit not in ["HVAC Temp", "Current Occupancy"])
-    temp_penalty = abs(row["HVAC Temp"] - ideal_temp) * 0.1  # Adjust if far from 22°C
-    occupancy_bonus = 5 - abs(row["Current Occupancy"] - ideal_occupancy)  # Closer to 4 is better
-    return base_score - temp_penalty + (occupancy_bonus * weights["Current Occupancy"])
-
-df["Weighted Score"] = df.apply(calculate_score, axis=1)
-df = df.sort_values("Weighted Score", ascending=False)
+# Availability from the booking store: 5 = free for the whole meeting, 1 = booked throughout
+meeting_start = datetime.combine(selected_date, start_time)
+meeting_end = datetime.combine(selected_date, end_time)
+if meeting_end <= meeting_start:
+    st.warning("End time must be after the start time.")
+    st.stop()
+
+# Score the rooms whose sensors have reported (penalty away from 22°C, bonus near
+# 4 people) and keep the best; shared by sessions asking the same
+top_n = 50
+df = pd.DataFrame(get_service().score(weights, meeting_start, meeting_end, k=top_n)["rooms"])
+if df.empty:
+    # With an external feed, rooms are ranked once their sensors first report
+    st.info("No sensor readings yet")
+    st.stop()
 
 # Show live IoT data
 st.subheader("📡 Live IoT Sensor Data")
-for room in df["Room"]:
-    st.markdown(f"**{room}** – Temp: {iot_data[room]['temp']} °C, Occupancy: {iot_data[room]['occupancy']} people")
+for room, temp, occupancy in zip(df["Room"], df["HVAC Temp"], df["Current Occupancy"]):
+    st.markdown(f"**{room}** – Temp: {temp} °C, Occupancy: {occupancy} people")
 
 # Show the table
 st.subheader("🔍 Room Comparison Table")
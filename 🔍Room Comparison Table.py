@@ -4,18 +4,7 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, time
-
-# Room attributes (example data)
-rooms_data = {
-    "Room": ["Room A", "Room B", "Room C"],
-    "Occupancy Suitability": [5, 3, 4],
-    "Natural Lighting": [4, 2, 5],
-    "Energy Efficiency": [3, 5, 4],
-    "AV/Tech Availability": [5, 4, 3],
-    "Noise Isolation": [4, 3, 4],
-    "Proximity to Team Zone": [3, 4, 2],
-    "Availability": [3, 5, 4]  # Simulated availability score
-}
+from gcres.resources import get_service
 
 weights = {
     "Occupancy Suitability": 0.25,
@@ -27,9 +16,6 @@ weights = {
     "Availability": 0.30
 }
 
-# Convert to DataFrame
-df = pd.DataFrame(rooms_data)
-
 # Streamlit UI
 st.set_page_config(page_title="Conference Room Selector", layout="centered")
 st.title("📊 Conference Room Selector - ODC")
@@ -48,23 +34,16 @@ selected_date = st.date_input("Select a date")
 start_time = st.time_input("Start Time", value=time(9, 0))
 end_time = st.time_input("End Time", value=time(10, 0))
 
-# Simulate dynamic availability based on selected time
-# (In a real app, you'd check this against a room booking database or calendar API)
-if start_time >= time(12, 0):
-    df.loc[df['Room'] == "Room A", "Availability"] = 4
-    df.loc[df['Room'] == "Room B", "Availability"] = 5
-    df.loc[df['Room'] == "Room C", "Availability"] = 3
-else:
-    df.loc[df['Room'] == "Room A", "Availability"] = 3
-    df.loc[df['Room'] == "Room B", "Availability"] = 4
-    df.loc[df['Room'] == "Room C", "Availability"] = 5
-
-# Recalculate weighted score
-def calculate_score(row):
-    return sum(row[criteria] * weights[criteria] for criteria in weights)
+# Availability from the booking store: 5 = free for the whole meeting, 1 = booked throughout
+meeting_start = datetime.combine(selected_date, start_time)
+meeting_end = datetime.combine(selected_date, end_time)
+if meeting_end <= meeting_start:
+    st.warning("End time must be after the start time.")
+    st.stop()
 
-df["Weighted Score"] = df.apply(calculate_score, axis=1)
-df = df.sort_values("Weighted Score", ascending=False)
+# Recalculate weighted score and keep the best rooms (shared by sessions asking the same)
+top_n = 50
+df = pd.DataFrame(get_service().score(weights, meeting_start, meeting_end, k=top_n)["rooms"])
 
 # Show the table
 st.subheader("🔍 Room Comparison Table")
@@ -0,0 +1,44 @@
+# NOTE: This Streamlit app must be run in a local environment where 'streamlit' and 'pandas' are installed.
+
+import streamlit as st
+import pandas as pd
+from gcres.cache import results
+
+st.set_page_config(page_title="Cache Admin", layout="wide")
+st.title("🛠️ Shared Result Cache")
+
+st.markdown("""
+Rankings, scores and charts are computed once per process and shared by every session
+that asks for the same thing (same catalog, sensor snapshot, bookings, weights and meeting time).
+""")
+
+# Totals
+stats = results.stats()
+hits = sum(row["hits"] for row in stats.values())
+misses = sum(row["misses"] for row in stats.values())
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Entries", f"{len(results)} / {results.max_entries}")
+col2.metric("Memory", f"{results.nbytes / 2**20:.1f} / {results.max_bytes / 2**20:.0f} MB")
+col3.metric("Hits / misses", f"{hits} / {misses}")
+col4.metric("Hit rate", f"{hits / (hits + misses):.0%}" if hits + misses else "–")
+
+# Per kind of result
+st.subheader("📊 By namespace")
+if stats:
+    df = pd.DataFrame.from_dict(stats, orient="index")
+    df["bytes"] = df["bytes"] / 2**20
+    df["hit_rate"] = df["hit_rate"] * 100
+    df = df.rename(columns={"entries": "Entries", "bytes": "Memory (MB)", "hits": "Hits", "misses": "Misses",
+                            "evictions": "Evictions", "hit_rate": "Hit rate (%)", "compute_s": "Compute time (s)"})
+    st.dataframe(df, use_container_width=True)
+else:
+    st.info("Nothing cached yet. Open a dashboard page first.")
+
+# Maintenance
+col1, col2 = st.columns(2)
+if col1.button("Clear cache"):
+    results.clear()
+    st.rerun()
+if col2.button("Reset counters"):
+    results.reset_stats()
+    st.rerun()
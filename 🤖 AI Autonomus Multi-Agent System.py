@@ -1,6 +1,8 @@
 import streamlit as st
-import random
 from datetime import time
+from gcres.agents import determine_optimal_room
+from gcres.resources import (get_alert_engine, get_booking_store, get_calendar_store, get_catalog, get_demand_model,
+                             get_knowledge_base, get_orchestrator, get_preference_model, get_sensor_store)
 
 st.set_page_config(page_title="AI Multi-Agent Room Recommender", layout="wide")
 st.title("🤖 Optimal Meeting Room Selector - Multi-Agent System")
@@ -9,107 +11,72 @@ st.markdown("""
 This demo simulates an intelligent system powered by 8 AI agents. The system considers user preferences, environmental data, analytics, and resource availability to recommend the **most optimal meeting room**.
 """)
 
-# Shared knowledge base
-class KnowledgeBase:
-    def __init__(self):
-        self.data = {}
-
-    def update(self, key, value):
-        self.data[key] = value
-
-    def get(self, key):
-        return self.data.get(key)
-
-kb = KnowledgeBase()
-k_rooms = ["Room A", "Room B", "Room C"]
+# Shared knowledge base, lives across reruns and sessions
+k_rooms = get_catalog().names
+kb = get_knowledge_base()
 
 # Dynamic user preference inputs
 st.sidebar.header("🔧 Simulate User Preferences")
+user = st.sidebar.text_input("User", "Jane")
 max_temp = st.sidebar.slider("Preferred Max Temperature (°C)", 20, 26, 23)
 need_quiet = st.sidebar.checkbox("Require Quiet Room", value=True)
 need_projector = st.sidebar.checkbox("Require Projector", value=True)
 k_preferences = {"quiet": need_quiet, "max_temp": max_temp, "need_projector": need_projector}
-kb.update("available_rooms", k_rooms)
-k_preferences = {"quiet": need_quiet, "max_temp": max_temp, "need_projector": need_projector}
-kb.update("preferences", k_preferences)
 
-# Simulated outputs from each agent (with randomized values for variation)
-kb.update("environment", {
-    "Room A": round(random.uniform(21, 24), 1),
-    "Room B": round(random.uniform(22, 26), 1),
-    "Room C": round(random.uniform(20, 23), 1)
+# Run the agents whose inputs changed, concurrently; each has its own timeout
+# and a late agent falls back to its last output
+orchestrator = get_orchestrator()
+k_results = orchestrator.run({
+    "rooms": k_rooms,
+    "sensor_store": get_sensor_store(),
+    "booking_store": get_booking_store(),
+    "calendar_store": get_calendar_store(),
+    "demand_model": get_demand_model(),
+    "alert_engine": get_alert_engine(),
+    "preference_model": get_preference_model(),
 })
-k_analytics = {
-    "Room A": random.choice(["Low Demand", "Medium Demand", "High Demand"]),
-    "Room B": random.choice(["Low Demand", "Medium Demand", "High Demand"]),
-    "Room C": random.choice(["Low Demand", "Medium Demand", "High Demand"])
-}
-kb.update("analytics", k_analytics)
-k_alerts = random.choice([{"Room B": "Over Occupied"}, {}])
-k_learning = {
-    "Room A": round(random.uniform(3.0, 5.0), 1),
-    "Room B": round(random.uniform(3.0, 5.0), 1),
-    "Room C": round(random.uniform(3.0, 5.0), 1)
-}
-kb.update("alerts", k_alerts)
-kb.update("learning", k_learning)
-k_assets = {
-    "Room A": random.choice(["OK", "Needs Cleaning"]),
-    "Room B": random.choice(["OK", "Needs Cleaning"]),
-    "Room C": random.choice(["OK", "Needs Cleaning"])
-}
-kb.update("assets", k_assets)
-k_calendar = {
-    "Room A": random.choice(["Free", "Busy"]),
-    "Room B": random.choice(["Free", "Busy"]),
-    "Room C": random.choice(["Free", "Busy"])
-}
-kb.update("calendar", k_calendar)
-
-# Decision logic
-def determine_optimal_room():
-    final_scores = {}
-    for room in k_rooms:
-        score = 0
-        if kb.get("calendar")[room] == "Free":
-            score += 2
-        if kb.get("assets")[room] == "OK":
-            score += 1
-        if room not in kb.get("alerts"):
-            score += 1
-        if kb.get("environment")[room] <= kb.get("preferences")["max_temp"]:
-            score += 2
-        score += kb.get("learning")[room]
-        if kb.get("analytics")[room] == "Low Demand":
-            score += 1
-        final_scores[room] = round(score, 2)
-    return max(final_scores, key=final_scores.get), final_scores
 
 # UI Summary
 st.header("📋 Agent-Based System Output")
 col1, col2, col3 = st.columns(3)
 
+status_icons = {"ok": "✅", "cached": "♻️", "timeout": "⏱️", "error": "❌"}
+
+def show_agent(key):
+    result = k_results[key]
+    st.subheader(result.name)
+    note = f"{status_icons[result.status]} {result.status}"
+    if result.status != "cached":
+        note += f" in {result.elapsed * 1000:.0f} ms"
+    if result.stale:
+        note += " – showing last good output"
+    st.caption(note)
+    if result.value is not None:
+        st.json(result.value)
+    elif not result.ok:
+        st.warning(f"No output from {result.name} yet.")
+
 with col1:
-    st.subheader("Environment Agent")
-    st.json(kb.get("environment"))
-    st.subheader("Analytics Agent")
-    st.json(kb.get("analytics"))
+    show_agent("environment")
+    show_agent("analytics")
 
 with col2:
-    st.subheader("Alert Agent")
-    st.json(kb.get("alerts"))
-    st.subheader("Learning Agent")
-    st.json(kb.get("learning"))
+    show_agent("alerts")
+    show_agent("learning")
 
 with col3:
-    st.subheader("Asset Agent")
-    st.json(kb.get("assets"))
-    st.subheader("Calendar Agent")
-    st.json(kb.get("calendar"))
+    show_agent("assets")
+    show_agent("calendar")
+
+st.caption(f"All agents finished in {k_results.elapsed * 1000:.0f} ms (run concurrently).")
 
 # Final Recommendation
-best_room, scores = determine_optimal_room()
+# The user's own learned preferences, on top of the Learning Agent's popularity
+best_room, scores = determine_optimal_room(kb, k_rooms, k_preferences, get_preference_model().scores(user))
 st.header("✅ Final Recommended Room")
+if best_room is None:
+    st.warning("The room catalog has no rooms to recommend.")
+    st.stop()
 st.success(f"The most optimal meeting room is **{best_room}** based on all agents' evaluations.")
 
 st.subheader("🏅 Score Summary")
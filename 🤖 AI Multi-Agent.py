@@ -1,19 +1,14 @@
 import streamlit as st
+import time
+from datetime import datetime, timedelta
+from gcres.bookings import BookingConflict
+from gcres.cache import cached
+from gcres.resources import (get_alert_engine, get_booking_store, get_calendar_store, get_catalog, get_demand_model,
+                             get_knowledge_base, get_preference_model, get_sensor_store)
 
-# Shared state
-class KnowledgeBase:
-    def __init__(self):
-        self.data = {}
-
-    def update(self, key, value):
-        self.data[key] = value
-
-    def get(self, key):
-        return self.data.get(key, None)
-
-# Initialize KB
-kb = KnowledgeBase()
-kb.update("available_rooms", ["Room A", "Room B", "Room C"])
+# Shared state, lives across reruns and sessions
+get_catalog()  # Publishes available_rooms
+kb = get_knowledge_base()
 
 # App UI setup
 st.set_page_config(page_title="Multi-Agent Facility AI Demo", layout="wide")
@@ -31,10 +26,26 @@ tabs = st.tabs([
 
 # 1. Booking Agent
 tabs[0].subheader("🏠 Booking Agent")
+bookings = get_booking_store()
+user = tabs[0].text_input("Your name", "Jane")
 selected_date = tabs[0].date_input("Select a booking date")
 time_slot = tabs[0].time_input("Select time slot")
+duration = tabs[0].selectbox("Duration", [30, 60, 90, 120], index=1, format_func=lambda m: f"{m} min")
+booking_start = datetime.combine(selected_date, time_slot)
+booking_end = booking_start + timedelta(minutes=duration)
+free_rooms = bookings.free_rooms(booking_start, booking_end)
+tabs[0].caption(f"{len(free_rooms)} of {len(bookings.rooms)} rooms free for this slot")
+room_choice = tabs[0].selectbox("Room", ["Any free room", *kb.get("available_rooms")])
 if tabs[0].button("Book Room"):
-    tabs[0].success("Room booked based on availability and preferences!")
+    room = room_choice if room_choice != "Any free room" else (free_rooms[0] if free_rooms else None)
+    if room is None:
+        tabs[0].error("No room is free for this slot.")
+    else:
+        try:
+            bookings.book(room, booking_start, booking_end, who=user)
+            tabs[0].success(f"{room} booked {booking_start:%Y-%m-%d %H:%M}–{booking_end:%H:%M}!")
+        except BookingConflict as e:
+            tabs[0].error(f"Conflict: {e}")
 
 # 2. Environment Agent
 tabs[1].subheader("🌡️ Environment Agent")
@@ -44,16 +55,60 @@ if tabs[1].button("Optimize HVAC"):
 
 # 3. Analytics Agent
 tabs[2].subheader("📊 Analytics Agent")
-tabs[2].markdown("Predicted peak demand: 2 PM - 4 PM\n\nEnergy usage high in Room B")
+demand = get_demand_model()
+# Busiest 2 hours of the day over all rooms, cached until the model folds in another day
+peak = cached("demand", demand.peak, "peak", id(demand), demand.version)
+if peak is None:
+    tabs[2].markdown("Predicted peak demand: not enough booking or sensor history yet")
+else:
+    tabs[2].markdown(f"Predicted peak demand: {demand.slot_time(peak)} - {demand.slot_time(peak + 2 * 3600 // demand.slot_seconds)}")
+slot_labels = demand.labels(booking_start, booking_end)
+tabs[2].caption(f"Selected slot: {(slot_labels == 'High Demand').sum()} high-demand and "
+                f"{(slot_labels == 'Low Demand').sum()} low-demand rooms of {len(slot_labels)}")
+tabs[2].markdown("Energy usage high in Room B")
 
 # 4. Alert Agent
 tabs[3].subheader("📢 Alert Agent")
+alert_engine = get_alert_engine()
+alert_room = tabs[3].selectbox("Room", kb.get("available_rooms"), key="alert_room")
 if tabs[3].button("Simulate Over-Occupancy Alert"):
-    tabs[3].warning("Room A exceeded max capacity! Notified admin.")
+    # Push an over-capacity reading through ingestion; the alert engine decides
+    capacity = int(alert_engine.capacity[alert_engine.index[alert_room]])
+    before = alert_engine.suppressed
+    get_sensor_store().append(alert_room, "occupancy", time.time(), capacity + 2)
+    if alert_engine.suppressed > before:
+        tabs[3].info(f"{alert_room} alert suppressed: it resolved less than {alert_engine.cooldown:.0f} s ago.")
+active = alert_engine.active()
+for alert in active[:10]:
+    tabs[3].warning(f"{alert['room']}: {alert['alert']} since {datetime.fromtimestamp(alert['since']):%H:%M:%S} "
+                    f"({alert['hits']} readings)")
+if not active:
+    tabs[3].success("No active alerts.")
+tabs[3].caption(f"{len(active)} active, {alert_engine.suppressed} suppressed by cooldown, "
+                f"{alert_engine.processed} readings checked")
+recent = alert_engine.recent(20)
+if recent:
+    tabs[3].dataframe([{"time": f"{datetime.fromtimestamp(e['ts']):%H:%M:%S}", "event": e["event"], "room": e["room"],
+                        "alert": e["alert"]} for e in recent], hide_index=True)
 
 # 5. Learning Agent
 tabs[4].subheader("🧠 Learning Agent")
-tabs[4].markdown("User Jane prefers Room A for afternoon meetings.\n\nUser Bob avoids Room C due to lighting.")
+preferences = get_preference_model()
+favourites = preferences.top(user, 5)
+if favourites:
+    tabs[4].markdown(f"{user} prefers " + ", ".join(f"**{room}** ({score:.1f})" for room, score in favourites))
+else:
+    tabs[4].markdown(f"No bookings or feedback from {user} yet: recommendations use the most popular rooms.")
+feedback_room = tabs[4].selectbox("Room", kb.get("available_rooms"), key="feedback_room")
+like, dislike = tabs[4].columns(2)
+if like.button("👍 Liked it"):
+    preferences.feedback(user, feedback_room, liked=True)
+    tabs[4].success(f"Noted: {user} likes {feedback_room}.")
+if dislike.button("👎 Avoid it"):
+    preferences.feedback(user, feedback_room, liked=False)
+    tabs[4].info(f"Noted: {user} avoids {feedback_room}.")
+tabs[4].caption(f"{len(preferences.users)} users, {preferences.events} booking and feedback events, "
+                f"half-life {preferences.half_life / 86400:.0f} days")
 
 # 6. Chat Agent
 tabs[5].subheader("💬 Chat Agent")
@@ -67,7 +122,21 @@ tabs[6].markdown("Projector stock: OK\n\nWhiteboard markers: Low\n\nLast mainten
 
 # 8. Calendar Agent
 tabs[7].subheader("📅 Calendar Agent")
-tabs[7].markdown("Meeting: Design Sprint — Room C at 2 PM\n\nAvailability clash resolved by shifting to Room A")
+calendars = get_calendar_store()
+if not calendars.files:
+    tabs[7].info(f"No calendar exports yet: put .ics files in {calendars.directory}")
+else:
+    # Meetings from the room calendars in the slot picked on the Booking tab
+    agenda = calendars.agenda(booking_start, booking_end, limit=20)
+    busy = calendars.busy(booking_start, booking_end)
+    tabs[7].markdown(f"{booking_start:%Y-%m-%d %H:%M}–{booking_end:%H:%M}: **{int(busy.sum())}** of "
+                     f"{len(calendars.rooms)} rooms busy in their calendars")
+    if agenda:
+        tabs[7].dataframe([{"room": a["room"], "meeting": a["summary"], "start": f"{a['start']:%H:%M}",
+                            "end": f"{a['end']:%H:%M}"} for a in agenda], hide_index=True)
+    sync = calendars.last_sync
+    tabs[7].caption(f"{calendars.events} events in {calendars.files} files; last sync read "
+                    f"{sync.get('files_read', 0)} changed files in {sync.get('seconds', 0) * 1000:.0f} ms")
 
 # 9. Summary Tab
 tabs[8].subheader("📋 System Summary")
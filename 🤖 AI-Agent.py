@@ -2,44 +2,33 @@
 
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import random
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
+from gcres.charts import bar_chart
+from gcres.resources import get_catalog, get_knowledge_base, get_room_table, get_sensor_snapshot, get_service
 
 # --- Multi-Agent System Components ---
-class KnowledgeBase:
-    def __init__(self):
-        self.data = {}
-
-    def update(self, key, value):
-        self.data[key] = value
-
-    def get(self, key):
-        return self.data.get(key, None)
-
 class BookingAgent:
-    def __init__(self, kb):
+    def __init__(self, kb, service):
         self.kb = kb
+        self.service = service
+
+    def find_rooms(self, preferences, k=5):
+        # Top-k rooms matching every constraint, via the engine's catalog index
+        matches = self.service.recommend(preferences, k=k)["rooms"]
+        return [(match["room"], match["score"]) for match in matches]
 
     def find_room(self, preferences):
-        rooms = self.kb.get("available_rooms")
-        sensor_data = self.kb.get("sensor_data")
-        for room in rooms:
-            if sensor_data[room]["temp"] < preferences.get("max_temp", 23):
-                return room
-        return None
+        matches = self.find_rooms(preferences, k=1)
+        return matches[0][0] if matches else None
 
 class EnvironmentAgent:
     def __init__(self, kb):
         self.kb = kb
 
     def fetch_sensor_data(self):
-        data = {
-            "Room A": {"temp": round(random.uniform(21, 23.5), 1), "occupancy": random.randint(1, 6)},
-            "Room B": {"temp": round(random.uniform(23, 25.5), 1), "occupancy": random.randint(2, 8)},
-            "Room C": {"temp": round(random.uniform(20, 22.5), 1), "occupancy": random.randint(1, 5)}
-        }
-        self.kb.update("sensor_data", data)
+        # Latest snapshot from the background ingestion thread, never blocks on sensors.
+        # Only rebuilt when new readings arrived since the last rerun of any session.
+        return get_sensor_snapshot()
 
 class NLPChatAgent:
     def __init__(self, kb, booking_agent):
@@ -60,41 +49,41 @@ st.markdown("""
 This tool uses a simple AI agent system to suggest the best room based on live IoT sensor data and user preferences.
 """)
 
-# Initialize agents and knowledge base
-kb = KnowledgeBase()
+# Initialize agents on the shared knowledge base
+get_catalog()  # Publishes available_rooms
+kb = get_knowledge_base()
 k_env = EnvironmentAgent(kb)
-k_book = BookingAgent(kb)
+k_book = BookingAgent(kb, get_service())
 k_chat = NLPChatAgent(kb, k_book)
 
-kb.update("available_rooms", ["Room A", "Room B", "Room C"])
-k_env.fetch_sensor_data()
+snapshot = k_env.fetch_sensor_data()
 
 # Input preferences
 temp_preference = st.slider("Max Room Temperature (°C)", 20, 26, 23)
+with st.expander("More preferences"):
+    col1, col2, col3 = st.columns(3)
+    need_quiet = col1.checkbox("Quiet room")
+    need_projector = col1.checkbox("Projector")
+    min_capacity = col2.number_input("Minimum capacity", min_value=0, value=0, step=1)
+    free_next_hour = col3.checkbox("Free for the next hour")
+preferences = {"max_temp": temp_preference, "quiet": need_quiet, "need_projector": need_projector,
+               "min_capacity": min_capacity or None}
+if free_next_hour:
+    preferences["start"] = datetime.now()
+    preferences["end"] = preferences["start"] + timedelta(hours=1)
 if st.button("Ask AI Agent to Book Room"):
-    preferences = {"max_temp": temp_preference}
     st.markdown(k_chat.handle_query(preferences))
+    matches = k_book.find_rooms(preferences)
+    if matches:
+        st.dataframe(pd.DataFrame(matches, columns=["Room", "Score"]), hide_index=True)
 
 # Show live sensor data
-data = kb.get("sensor_data")
-df = pd.DataFrame.from_dict(data, orient='index')
-df.reset_index(inplace=True)
-df.rename(columns={'index': 'Room'}, inplace=True)
+df = snapshot.frame(get_room_table())
 st.subheader("📡 Live IoT Sensor Data")
 st.dataframe(df)
 
 # Charts
 st.subheader("📈 Sensor Visualization")
 col1, col2 = st.columns(2)
-with col1:
-    fig1, ax1 = plt.subplots(figsize=(4, 3))
-    ax1.bar(df["Room"], df["temp"], color='skyblue')
-    ax1.set_ylabel("Temperature (°C)")
-    ax1.set_title("HVAC Temperature")
-    st.pyplot(fig1)
-with col2:
-    fig2, ax2 = plt.subplots(figsize=(4, 3))
-    ax2.bar(df["Room"], df["occupancy"], color='salmon')
-    ax2.set_ylabel("Occupancy")
-    ax2.set_title("Current Occupancy")
-    st.pyplot(fig2)
+bar_chart(col1, df["Room"], df["temp"], "Temperature (°C)", "HVAC Temperature", 'skyblue')
+bar_chart(col2, df["Room"], df["occupancy"], "Occupancy", "Current Occupancy", 'salmon')
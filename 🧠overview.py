@@ -1,9 +1,8 @@
 import streamlit as st
+from gcres.assets import svg
 
-IMAGE_URL = "https://media.githubusercontent.com/media/NVIDIA/AIQToolkit/develop/docs/source/_static/aiqtoolkit_gitdiagram.png"
-
-
-st.image(IMAGE_URL, caption="NVIDIA AgentIQ")
+# Bundled with the app: no download on render, works offline
+st.image(svg("assets/overview.svg"), caption="GCRES multi-agent system")
 
 
 